@@ -0,0 +1,110 @@
+"""
+ai_cache.py
+Two-level cache in front of AIFormFiller.generate_answer.
+
+The prompt is fully determined by the field context, field type, options
+and the user profile, so the answer is too (low temperature). Answers are
+kept in a bounded in-process LRU backed by the ``ai_answer_cache`` table;
+the key hashes the model that actually wrote the answer (the router picks
+one per request), the profile version and the normalized inputs.
+When config.ANSWERS or the profile changes the version changes, and
+``invalidate`` drops everything made with the old one.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from database import db
+
+def normalize_text(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+def cache_key(model: str, version: str, field_context: str, field_type: str,
+              options: Optional[Iterable[str]] = None) -> str:
+    """Hash of everything the prompt is built from (options keep their order, like the prompt)"""
+    parts = [model, version, normalize_text(field_context), (field_type or "").lower()]
+    parts.extend(normalize_text(str(option)) for option in options or [])
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+class AnswerCache:
+    """Bounded LRU + on-disk store for generated answers"""
+
+    def __init__(self, model: str, version: str, database=db, capacity: int = 256, max_disk_entries: int = 5000):
+        self.model = model
+        self.version = version
+        self.db = database
+        self.capacity = capacity
+        self.max_disk_entries = max_disk_entries
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()  # Speculative generation runs on a worker thread
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, field_context: str, field_type: str, options: Optional[Iterable[str]],
+             model: Optional[str] = None) -> str:
+        return cache_key(model or self.model, self.version, field_context, field_type, options)
+
+    def _put(self, key: str, answer: str):
+        with self._lock:
+            self._lru[key] = answer
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, field_context: str, field_type: str, options: Optional[Iterable[str]] = None,
+            models: Optional[Iterable[str]] = None) -> Optional[str]:
+        """Answer written by one of ``models`` (default: the cache's model), the first found wins"""
+        options = list(options or [])
+        keys = [self._key(field_context, field_type, options, model) for model in (list(models or []) or [self.model])]
+        with self._lock:
+            for key in keys:
+                answer = self._lru.get(key)
+                if answer is not None:
+                    self._lru.move_to_end(key)
+                    self.memory_hits += 1
+                    return answer
+
+        for key in keys:
+            answer = self.db.get_cached_ai_answer(key) if self.db else None
+            if answer is not None:
+                self._put(key, answer)
+                self.disk_hits += 1
+                return answer
+
+        self.misses += 1
+        return None
+
+    def put(self, field_context: str, field_type: str, options: Optional[Iterable[str]], answer: str,
+            model: Optional[str] = None):
+        """Store an answer under the model that wrote it (default: the cache's model)"""
+        if not answer:
+            return
+        model = model or self.model
+        key = self._key(field_context, field_type, options, model)
+        self._put(key, answer)
+        if self.db:
+            self.evictions += self.db.save_cached_ai_answer(key, model, self.version, answer,
+                                                            self.max_disk_entries)
+
+    def invalidate(self, version: Optional[str] = None):
+        """
+        Invalidation hook for profile/ANSWERS changes: switch to ``version``
+        and drop answers made with any other one (everything if None).
+        """
+        self._lru.clear()
+        if version is not None:
+            self.version = version
+        dropped = self.db.clear_ai_answer_cache(version) if self.db else 0
+        if dropped:
+            print(f"🧹 AI answer cache invalidated ({dropped} stored answers dropped)")
+
+    def stats(self) -> str:
+        total = self.memory_hits + self.disk_hits + self.misses
+        rate = ((self.memory_hits + self.disk_hits) / total * 100) if total else 0.0
+        return (f"{self.memory_hits} memory hits, {self.disk_hits} disk hits, {self.misses} misses "
+                f"({rate:.0f}% hit rate), {self.evictions} evicted")
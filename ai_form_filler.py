@@ -4,9 +4,97 @@ AI-powered form filling using Ollama with Phi-4 Mini
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from config import config
+from answer_memory import answer_memory, profile_version
+from ai_cache import AnswerCache
+from model_router import ModelRouter
+from ollama_health import OllamaHealth
+
+# Output budget per field type: yes/no, options and numbers need a handful of tokens
+NUM_PREDICT = {"radio": 12, "checkbox": 12, "select": 24, "number": 12, "text": 48, "textarea": 256}
+
+# Free-text answers end at the first line (text) or paragraph (textarea)
+STOP_SEQUENCES = {"text": ["\n"], "textarea": ["\n\n"]}
+
+# Free text written per job ahead of the apply loop (cover_notes.py)
+JOB_TEXT_TASKS = {
+    "cover_note": "Write a short cover note (3-4 sentences, one paragraph) for this application.",
+    "why_role": "Answer the question \"Why do you want this role?\" in 2-3 sentences, one paragraph.",
+}
+
+def answer_schema(field_type: str, options: list = None) -> Optional[Dict[str, Any]]:
+    """JSON schema for one answer, or None when the field takes free text"""
+    if options and field_type in ['select', 'radio']:
+        # Every option: a shortened enum would force a wrong pick on long lists (country codes)
+        return {"type": "string", "enum": [str(option) for option in options]}
+    if field_type in ['radio', 'checkbox']:
+        return {"type": "string", "enum": ["Yes", "No"]}
+    if field_type == 'number':
+        return {"type": "number"}
+    return None
+
+def generation_settings(field_type: str, options: list = None) -> Dict[str, Any]:
+    """Ollama ``format`` and token cap/stop sequences for one field"""
+    num_predict = NUM_PREDICT.get(field_type, 48)
+    if options and field_type in ['select', 'radio']:
+        # Room for the longest option (about 3 chars per token) plus the JSON wrapper
+        num_predict = max(num_predict, max(len(str(option)) for option in options) // 3 + 12)
+    settings: Dict[str, Any] = {"options": {"num_predict": num_predict}}
+    schema = answer_schema(field_type, options)
+    if schema:
+        settings["format"] = {"type": "object", "properties": {"answer": schema}, "required": ["answer"]}
+    else:
+        settings["options"]["stop"] = STOP_SEQUENCES.get(field_type, ["\n"])
+    return settings
+
+def format_number(value: Any) -> str:
+    """2.0 -> "2", 6.5 -> "6.5" """
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+class PromptStats:
+    """Prompt-eval token/time figures reported by Ollama, per call"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.prompt_ms = 0.0
+        self.first_token_ms = 0.0
+        self.streamed = 0  # Calls with a first-token time
+        self.reported = 0  # Calls that ran to "done" and carried eval counts
+    
+    def record(self, first_token_ms: Optional[float], done_chunk: Optional[Dict[str, Any]] = None) -> str:
+        """Add one call; returns a short description of it"""
+        self.calls += 1
+        parts = []
+        if first_token_ms is not None:
+            self.streamed += 1
+            self.first_token_ms += first_token_ms
+            parts.append(f"first token {first_token_ms:.0f} ms")
+        if done_chunk and "prompt_eval_count" in done_chunk:
+            tokens = done_chunk.get("prompt_eval_count", 0)
+            ms = done_chunk.get("prompt_eval_duration", 0) / 1e6
+            self.reported += 1
+            self.prompt_tokens += tokens
+            self.prompt_ms += ms
+            parts.append(f"prompt eval {tokens} tokens in {ms:.0f} ms")
+        return ", ".join(parts)
+    
+    def summary(self) -> str:
+        if not self.calls:
+            return "no model calls"
+        text = f"{self.calls} calls"
+        if self.streamed:
+            text += f", avg first token {self.first_token_ms / self.streamed:.0f} ms"
+        if self.reported:
+            text += (f", avg prompt eval {self.prompt_tokens / self.reported:.0f} tokens"
+                     f" / {self.prompt_ms / self.reported:.0f} ms")
+        return text
 
 class AIFormFiller:
     def __init__(self, model_name: str = "phi4-mini"):
@@ -17,8 +105,51 @@ class AIFormFiller:
             model_name: Name of the Ollama model (default: phi4)
         """
         self.model_name = model_name
-        self.ollama_url = "http://127.0.0.1:11434/api/generate"
+        # Fast models answer choices/numbers, large ones only textareas; default is model_name for all
+        self.router = ModelRouter(
+            [m.strip() for m in config.AI_FAST_MODELS.split(",") if m.strip()] or [model_name],
+            [m.strip() for m in config.AI_LARGE_MODELS.split(",") if m.strip()],
+            deadline=config.AI_FIELD_DEADLINE,
+        )
+        self.ollama_host = config.OLLAMA_HOST.rstrip("/")
+        self.ollama_url = f"{self.ollama_host}/api/generate"
+        self.keep_alive = config.OLLAMA_KEEP_ALIVE
+        # One pooled keep-alive connection instead of a new TCP handshake per field
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Cached health state; while the circuit is open no request waits on a dead server
+        self.health = OllamaHealth(
+            self._check_ollama,
+            ttl=config.OLLAMA_HEALTH_TTL,
+            failure_threshold=config.OLLAMA_BREAKER_FAILURES,
+            slow_after=config.AI_FIELD_DEADLINE,
+            cooldown=config.OLLAMA_BREAKER_COOLDOWN,
+        )
+        self.user_profile = self._build_user_profile()
+        # Identical on every request, so Ollama keeps its evaluated prefix cached
+        self.system_prompt = self._build_system_prompt()
+        self.stats = PromptStats()
+        self.profile_version = profile_version(config)
+        self.cache = AnswerCache(model_name, self.profile_version)
+        # Answers cached under an older profile are useless from here on
+        self.cache.invalidate(self.profile_version)
+    
+    def refresh_profile(self) -> bool:
+        """
+        Invalidation hook: rebuild the profile prompt and drop cached answers
+        if the profile or config.ANSWERS changed. Returns True if it changed.
+        """
+        version = profile_version(config)
+        if version == self.profile_version:
+            return False
+        self.profile_version = version
         self.user_profile = self._build_user_profile()
+        self.system_prompt = self._build_system_prompt()
+        self.cache.invalidate(version)
+        answer_memory.version = version
+        return True
         
     def _build_user_profile(self) -> str:
         """Build user profile context from config"""
@@ -41,7 +172,69 @@ COMMON ANSWERS:
 """
         return profile
     
-    def generate_answer(self, field_context: str, field_type: str, options: list = None) -> Optional[str]:
+    def _build_system_prompt(self) -> str:
+        """Profile plus the rules every answer follows; the stable prefix of every request"""
+        return f"""You fill job application form fields for the user below.
+{self.user_profile}
+RULES:
+1. Provide ONLY the answer - no explanation, no extra text
+2. For yes/no questions: answer only "Yes" or "No"
+3. For dropdowns: choose from available options
+4. For number fields: provide only the number
+5. For text fields: provide concise, relevant answer
+6. Be truthful based on the user profile
+7. If asking about criminal record, termination, or negative things: answer "No"
+8. If asking about authorization to work in India: answer "Yes"
+9. If uncertain, make reasonable assumption based on profile
+"""
+    
+    def _payload(self, prompt: str, model: Optional[str] = None, **extra) -> Dict[str, Any]:
+        """Request body shared by every call: same system prompt and options"""
+        payload = {
+            "model": model or self.model_name,
+            "system": self.system_prompt,
+            "prompt": prompt,
+            "keep_alive": self.keep_alive,  # Keep the model (and its prompt cache) resident
+            "options": {
+                "temperature": 0.3,  # Low temperature for consistent answers
+                "top_p": 0.9,
+            },
+        }
+        payload["options"].update(extra.pop("options", {}))
+        payload.update(extra)
+        return payload
+    
+    def warm_up(self) -> bool:
+        """Load each routed model and evaluate the system prompt once, before the first real question"""
+        warmed = False
+        for model in self.router.models:
+            if not self.router.stats[model].available or not self.health.allow():
+                continue
+            start = time.perf_counter()
+            reached = False
+            try:
+                response = self.session.post(
+                    self.ollama_url,
+                    json=self._payload("Reply with OK.", model=model, stream=False,
+                                       options={"temperature": 0, "num_predict": 1}),
+                    timeout=(5, 120)
+                )
+                reached = True
+                if response.status_code != 200:
+                    continue
+                line = self.stats.record(None, response.json())
+                print(f"✓ Warmed up {model} in {(time.perf_counter() - start) * 1000:.0f} ms"
+                      + (f" ({line})" if line else ""))
+                warmed = True
+            except Exception as e:
+                print(f"⚠ Could not warm up {model}: {e}")
+            finally:
+                # Loading a model is slow by nature; only an unreachable server counts against it
+                self.health.record(time.perf_counter() - start, reached, slow_after=float("inf"))
+        return warmed
+    
+    def generate_answer(self, field_context: str, field_type: str, options: list = None,
+                        timeout: Optional[float] = None, remember: bool = True) -> Optional[str]:
         """
         Generate intelligent answer for a form field using Phi-4
         
@@ -49,38 +242,47 @@ COMMON ANSWERS:
             field_context: Full context of the field (label, placeholder, nearby text)
             field_type: Type of field (text, number, dropdown, radio, etc.)
             options: Available options for dropdown/radio (if applicable)
+            timeout: Seconds to wait for the model (default 30)
+            remember: Store the answer in the answer memory (off when the caller stores what it writes)
             
         Returns:
             Generated answer or None if generation fails
         """
         
+        self.refresh_profile()
+        
+        # Questions answered before cost no model call
+        stored = answer_memory.lookup(field_context, field_type, options)
+        if stored:
+            print(f"💾 Remembered answer: '{stored.answer}'")
+            return stored.answer
+        
+        cached = self.cache.get(field_context, field_type, options, self.router.models)
+        if cached is not None:
+            print(f"⚡ Cached AI answer: '{cached}'")
+            return cached
+        
         prompt = self._build_prompt(field_context, field_type, options)
         
         try:
-            response = requests.post(
-                self.ollama_url,
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False,
-                    "temperature": 0.3,  # Low temperature for consistent answers
-                    "top_p": 0.9,
-                },
-                timeout=30
-            )
+            answer, model = self._generate(prompt, field_type, options, timeout)
+            if answer is None:
+                return None
             
-            if response.status_code == 200:
-                result = response.json()
-                answer = result.get("response", "").strip()
-                
-                # Post-process answer
-                answer = self._clean_answer(answer, field_type, options)
-                
-                print(f"🤖 AI Generated: '{answer}'")
-                return answer
+            # Schema-constrained replies are already exact (an enum value, a number); cleaning
+            # would mangle them ("Node.js" reads as "No"), so they are only validated
+            if answer_schema(field_type, options):
+                answer = self._validate_answer(answer, field_type, options)
+                if answer is None:
+                    return None
             else:
-                print(f"⚠ Ollama request failed: {response.status_code}")
-                return None
+                answer = self._clean_answer(answer, field_type, options)
+            
+            print(f"🤖 AI Generated: '{answer}'")
+            self.cache.put(field_context, field_type, options, answer, model)
+            if remember:
+                answer_memory.remember(field_context, field_type, options, answer, source="ai")
+            return answer
                 
         except requests.exceptions.RequestException as e:
             print(f"⚠ Error connecting to Ollama: {e}")
@@ -89,16 +291,260 @@ COMMON ANSWERS:
             print(f"⚠ Error generating answer: {e}")
             return None
     
+    def generate_answers(self, fields: List[Dict[str, Any]], timeout: Optional[float] = None,
+                         remember: bool = True) -> Dict[str, Optional[str]]:
+        """
+        Answer every unresolved field of a form step with one Ollama call
+        
+        Args:
+            fields: Dicts with "id", "context", "type" and optional "options"
+            timeout: Seconds the whole step may wait for the model (default 30 + 5 per field)
+            remember: Store the answers in the answer memory (off for speculative calls, whose
+                      answers may never be used)
+            
+        Returns:
+            field id -> answer (None where even the per-field fallback failed)
+        """
+        self.refresh_profile()
+        deadline = time.perf_counter() + timeout if timeout else None
+        answers: Dict[str, Optional[str]] = {}
+        pending = []
+        
+        for field in fields:
+            context, field_type, options = field["context"], field["type"], field.get("options")
+            stored = answer_memory.lookup(context, field_type, options)
+            cached = stored.answer if stored else self.cache.get(context, field_type, options, self.router.models)
+            if cached is not None:
+                answers[field["id"]] = cached
+            else:
+                pending.append(field)
+        
+        if not pending:
+            return answers
+        
+        batch, batch_model = {}, None
+        if len(pending) > 1:
+            batch, batch_model = self._generate_batch(pending, timeout)
+        
+        fallback = []
+        for field in pending:
+            context, field_type, options = field["context"], field["type"], field.get("options")
+            raw = batch.get(str(field["id"]))
+            answer = self._batch_answer(raw, field_type, options) if raw not in (None, "") else None
+            if answer is None:
+                fallback.append(field)
+                continue
+            self.cache.put(context, field_type, options, answer, batch_model)
+            if remember:
+                answer_memory.remember(context, field_type, options, answer, source="ai")
+            answers[field["id"]] = answer
+        
+        if len(pending) > 1:
+            print(f"🤖 AI answered {len(pending) - len(fallback)}/{len(pending)} fields in one call"
+                  + (f", {len(fallback)} asked individually" if fallback else ""))
+        
+        # Only the entries the batch got wrong pay for their own call, within what is left of the timeout
+        for field in fallback:
+            remaining = deadline - time.perf_counter() if deadline else None
+            if remaining is not None and remaining < 1:
+                answers[field["id"]] = None
+                continue
+            answers[field["id"]] = self.generate_answer(field["context"], field["type"], field.get("options"),
+                                                        remaining, remember)
+        
+        return answers
+    
+    def _generate_batch(self, fields: List[Dict[str, Any]],
+                        timeout: Optional[float] = None) -> Tuple[Dict[str, Any], Optional[str]]:
+        """One JSON-mode generation answering all ``fields``: (answers, model), {} on any failure"""
+        # A step with a textarea needs the model that writes prose
+        field_type = "textarea" if any(field["type"] == "textarea" for field in fields) else "select"
+        model = self.router.choose(field_type, timeout)
+        if model is None or not self.health.allow():
+            return {}, model
+        start = time.perf_counter()
+        ok = False
+        reached = False
+        try:
+            response = self.session.post(
+                self.ollama_url,
+                json=self._payload(self._build_batch_prompt(fields), model=model, stream=False,
+                                   **self._batch_settings(fields)),
+                timeout=(5, timeout or 30 + 5 * len(fields))
+            )
+            reached = True
+            if response.status_code != 200:
+                print(f"⚠ Ollama batch request failed: {response.status_code}")
+                return {}, model
+            body = response.json()
+            ok = True
+            line = self.stats.record(None, body)
+            print(f"   ⏱ batch of {len(fields)} on {model} in {(time.perf_counter() - start) * 1000:.0f} ms"
+                  + (f", {line}" if line else ""))
+            result = json.loads(body.get("response", "") or "{}")
+            if not isinstance(result, dict):
+                return {}, model
+            return {str(key): format_number(value) if isinstance(value, (int, float)) else value
+                    for key, value in result.items()}, model
+        except requests.exceptions.RequestException as e:
+            print(f"⚠ Error connecting to Ollama: {e}")
+            return {}, model
+        except Exception as e:
+            print(f"⚠ Error generating batch answers: {e}")
+            return {}, model
+        finally:
+            elapsed = time.perf_counter() - start
+            self.router.record(model, elapsed, ok)
+            # A batch may take as long as its fields together
+            self.health.record(elapsed, reached, slow_after=self.health.slow_after * len(fields))
+    
+    def _batch_answer(self, raw: Any, field_type: str, options: list = None) -> Optional[str]:
+        """
+        A batch entry made usable: choices must be one of the options (or
+        Yes/No) exactly as given, since cleaning would mangle them ("Node.js"
+        reads as "No", apostrophes go); only free text is cleaned
+        """
+        if field_type in ['select', 'radio', 'checkbox']:
+            return self._validate_answer(str(raw), field_type, options)
+        return self._validate_answer(self._clean_answer(str(raw), field_type, options), field_type, options)
+    
+    def _batch_settings(self, fields: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Schema with one property per field id (enum for options, number for
+        number inputs) and a token cap that is the sum of the per-field caps
+        """
+        properties = {}
+        num_predict = 8
+        for field in fields:
+            settings = generation_settings(field["type"], field.get("options"))
+            properties[str(field["id"])] = answer_schema(field["type"], field.get("options")) or {"type": "string"}
+            num_predict += settings["options"]["num_predict"] + 6  # Key, quotes and separators
+        return {
+            "format": {"type": "object", "properties": properties, "required": list(properties)},
+            "options": {"num_predict": num_predict},
+        }
+    
+    def _validate_answer(self, answer: str, field_type: str, options: list = None) -> Optional[str]:
+        """The answer if it is usable for the field, else None"""
+        answer = (answer or "").strip()
+        if not answer:
+            return None
+        if options and field_type in ['select', 'radio']:
+            for option in options:
+                if str(option).strip().lower() == answer.lower():
+                    return str(option)
+            return None
+        if field_type in ['radio', 'checkbox']:
+            return answer if answer in ("Yes", "No") else None
+        if field_type == 'number':
+            try:
+                float(answer.replace(",", ""))
+            except ValueError:
+                return None
+        return answer
+    
+    def _generate(self, prompt: str, field_type: str, options: list = None,
+                  timeout: Optional[float] = None, slow_after: Optional[float] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Route the question to a model and record how long it took and whether
+        it worked; ``slow_after`` overrides the breaker's slow-call limit.
+        Returns (text, model that wrote it).
+        """
+        model = self.router.choose(field_type, timeout)
+        if model is None:
+            print("⚠ No Ollama model available")
+            return None, None
+        if not self.health.allow():
+            return None, model  # Circuit open: the caller falls back to the other answer sources
+        start = time.perf_counter()
+        text = None
+        reached = True
+        try:
+            text = self._stream(prompt, model, field_type, options, timeout)
+            return text, model
+        except requests.exceptions.RequestException:
+            reached = False  # Refused, reset or timed out; an unusable reply still counts as reached
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.router.record(model, elapsed, text is not None)
+            self.health.record(elapsed, reached, slow_after)
+    
+    def _stream(self, prompt: str, model: str, field_type: str, options: list = None,
+                timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Stream the completion as NDJSON and stop reading as soon as the answer
+        is complete (first line, or an unambiguous option). Closing the stream
+        makes Ollama cancel the rest of the generation. Choice and number
+        fields are constrained to a JSON schema and a few output tokens.
+        """
+        settings = generation_settings(field_type, options)
+        structured = "format" in settings
+        start = time.perf_counter()
+        response = self.session.post(
+            self.ollama_url,
+            json=self._payload(prompt, model=model, stream=True, **settings),
+            stream=True,
+            timeout=(5, timeout or self.router.deadline)
+        )
+        
+        with response:
+            if response.status_code != 200:
+                print(f"⚠ Ollama request failed: {response.status_code}")
+                return None
+            
+            text = ""
+            first_token_ms = None
+            done_chunk = None
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    print(f"⚠ Ollama error: {chunk['error']}")
+                    return None
+                if first_token_ms is None:
+                    # Mostly prompt eval; the only figure we get when the stream is cut short
+                    first_token_ms = (time.perf_counter() - start) * 1000
+                text += chunk.get("response", "")
+                if chunk.get("done"):
+                    done_chunk = chunk
+                    break
+                if not structured and self._is_complete(text):
+                    break
+        
+        line = self.stats.record(first_token_ms, done_chunk)
+        if line:
+            print(f"   ⏱ {line}")
+        if structured:
+            return self._parse_structured(text)
+        return text.strip()
+    
+    def _parse_structured(self, text: str) -> str:
+        """The "answer" of a schema-constrained reply (raw text if it is not valid JSON)"""
+        try:
+            value = json.loads(text).get("answer", "")
+        except (ValueError, AttributeError):
+            return text.strip()
+        return format_number(value) if isinstance(value, (int, float)) else str(value).strip()
+    
+    def _is_complete(self, text: str) -> bool:
+        """
+        True once the streamed free text already holds the whole answer.
+        Choice answers never get here: their schema enum ends the reply.
+        """
+        # _clean_answer keeps only the first line
+        return "\n" in text.lstrip()
+    
     def _build_prompt(self, field_context: str, field_type: str, options: list = None) -> str:
         """Build prompt for Phi-4"""
         
         options_text = ""
         if options:
-            options_text = f"\n\nAVAILABLE OPTIONS:\n" + "\n".join(f"- {opt}" for opt in options[:10])
+            options_text = f"\n\nAVAILABLE OPTIONS:\n" + "\n".join(f"- {opt}" for opt in options)
         
-        prompt = f"""{self.user_profile}
-
-TASK: Fill a job application form field.
+        # The profile and rules live in the system prompt; only the question varies
+        prompt = f"""TASK: Fill a job application form field.
 
 FIELD CONTEXT:
 {field_context}
@@ -106,20 +552,59 @@ FIELD CONTEXT:
 FIELD TYPE: {field_type}
 {options_text}
 
-INSTRUCTIONS:
-1. Read the field context carefully
-2. Provide ONLY the answer - no explanation, no extra text
-3. For yes/no questions: answer only "Yes" or "No"
-4. For dropdowns: choose from available options
-5. For number fields: provide only the number
-6. For text fields: provide concise, relevant answer
-7. Be truthful based on the user profile
-8. If asking about criminal record, termination, or negative things: answer "No"
-9. If asking about authorization to work in India: answer "Yes"
-10. If uncertain, make reasonable assumption based on profile
-
 ANSWER (only the value, nothing else):"""
         
+        if answer_schema(field_type, options):
+            prompt = prompt.replace("ANSWER (only the value, nothing else):", 'Reply as JSON: {"answer": <value>}')
+        
+        return prompt
+    
+    def write_about_job(self, job: Dict[str, Any], kind: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Free text about one job (see JOB_TEXT_TASKS) from its title and
+        company only, since the scrapers collect no descriptions; None if
+        generation fails or the circuit is open
+        """
+        try:
+            # Prose runs far past the per-field deadline by nature; only an unreachable server counts
+            text, _ = self._generate(self._build_job_prompt(job, kind), "textarea", None, timeout or 60,
+                                  slow_after=float("inf"))
+            # Prose keeps its apostrophes, unlike _clean_answer output; the stream stops after one paragraph
+            text = " ".join((text or "").strip().strip('"').split())[:1000]
+            return text or None
+        except Exception as e:
+            print(f"⚠ Error writing {kind} for {job.get('company', 'job')}: {e}")
+            return None
+    
+    def _build_job_prompt(self, job: Dict[str, Any], kind: str) -> str:
+        return f"""TASK: {JOB_TEXT_TASKS[kind]}
+Write in the first person as the user, plain text, no greeting, no sign-off, no placeholders.
+Mention the company and match the user's skills to the job title; do not invent experience.
+
+JOB TITLE: {job.get('role') or 'Not specified'}
+COMPANY: {job.get('company') or 'Not specified'}
+
+TEXT:"""
+    
+    def _build_batch_prompt(self, fields: List[Dict[str, Any]]) -> str:
+        """Prompt asking for a JSON object mapping each field id to its answer"""
+        questions = []
+        for field in fields:
+            line = f'- id "{field["id"]}" ({field["type"]}): {field["context"]}'
+            if field.get("options"):
+                line += "\n  OPTIONS: " + " | ".join(str(opt) for opt in field["options"])
+            questions.append(line)
+        
+        prompt = f"""TASK: Fill several fields of one job application form.
+
+FIELDS:
+{chr(10).join(questions)}
+
+Reply with ONE JSON object whose keys are the field ids and whose values are the answers (strings).
+For fields with OPTIONS copy one option exactly.
+
+JSON:"""
+        
         return prompt
     
     def _clean_answer(self, answer: str, field_type: str, options: list = None) -> str:
@@ -157,21 +642,29 @@ ANSWER (only the value, nothing else):"""
         
         return answer
     
-    def is_ollama_available(self) -> bool:
-        """Check if Ollama is running and model is available"""
+    def is_ollama_available(self, force: bool = False) -> bool:
+        """Check if Ollama is running and model is available (cached for OLLAMA_HEALTH_TTL seconds)"""
+        return self.health.available(force)
+    
+    def _check_ollama(self) -> bool:
+        """Health check behind ``is_ollama_available``: /api/tags, marking the routed models Ollama has"""
+        # Re-checks after the TTL stay quiet unless Ollama was down before
+        announce = self.health.status is not True
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
+            response = self.session.get(f"{self.ollama_host}/api/tags", timeout=(2, 5))
             if response.status_code == 200:
                 models = response.json().get("models", [])
                 model_names = [m.get("name", "") for m in models]
                 
-                # Check if phi4 or phi4:latest is available
-                available = any(self.model_name in name for name in model_names)
+                # Routed models Ollama does not have are skipped
+                self.router.set_available(model_names)
+                missing = [m for m in self.router.models if not self.router.stats[m].available]
+                available = len(missing) < len(self.router.models)
                 
-                if available:
-                    print("✓ Ollama is running and Phi-4 model is available")
-                else:
-                    print(f"⚠ Ollama is running but {self.model_name} model not found")
+                if available and announce:
+                    print(f"✓ Ollama is running; models: {', '.join(m for m in self.router.models if m not in missing)}")
+                if missing and announce:
+                    print(f"⚠ Ollama is running but {', '.join(missing)} not found")
                     print(f"Available models: {', '.join(model_names)}")
                     
                 return available
@@ -209,6 +702,15 @@ ANSWER (only the value, nothing else):"""
             }
         ]
         
+        print("\nBatch (one call):")
+        answers = self.generate_answers([
+            {"id": str(i), "context": test["context"], "type": test["type"], "options": test["options"]}
+            for i, test in enumerate(test_cases, 1)
+        ])
+        for i, test in enumerate(test_cases, 1):
+            print(f"  {test['context']} -> {answers.get(str(i))}")
+        print("-" * 60)
+        
         for i, test in enumerate(test_cases, 1):
             print(f"\nTest {i}:")
             print(f"Question: {test['context']}")
@@ -219,6 +721,11 @@ ANSWER (only the value, nothing else):"""
             )
             print(f"Answer: {answer}")
             print("-" * 60)
+        
+        print(f"\nAI answer cache: {self.cache.stats()}")
+        print(f"Prompt stats: {self.stats.summary()}")
+        print(f"Models: {self.router.summary()}")
+        print(f"Ollama: {self.health.summary()}")
 
 
 # Global instance
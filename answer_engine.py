@@ -0,0 +1,402 @@
+"""
+answer_engine.py
+Tiered resolution of screening-question answers.
+
+Fields the form heuristics could not answer go through ordered tiers,
+cheapest first:
+
+1. ``memory``  - an answer stored for the exact same question
+2. ``rules``   - the compiled question rules mapped to config.ANSWERS
+3. ``similar`` - char n-gram TF-IDF nearest neighbour over the
+                 COMMON_ANSWERS keys and every past answered question
+4. ``llm``     - one batched Ollama call for whatever is left
+
+Each tier has a confidence threshold and a latency budget. An answer
+below its tier's threshold (but above FALLBACK_MIN) is kept only as a
+fallback for when no later tier does better. The engine records which
+tier answered each field.
+
+``speculate`` starts the LLM tier early: right after a step's snapshot,
+questions the cheap tiers cannot answer are sent to the model on a
+background thread while the heuristics decide and write their fields, and
+``resolve`` only waits for those answers when it needs them.
+"""
+
+import math
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from answer_memory import answer_memory, normalize_label
+from config import config
+from option_matcher import pick
+from question_rules import get_classifier
+from tfidf import SparseTfidf, char_ngrams
+
+TIERS = ("memory", "rules", "similar", "llm")
+
+# Minimum confidence for a tier's answer to be final
+THRESHOLDS = {"memory": 0.0, "rules": 0.7, "similar": 0.6, "llm": 0.0}
+
+# Below its threshold, an answer is still kept as a fallback down to this confidence
+FALLBACK_MIN = 0.5
+
+# Per-field latency budget of the cheap tiers (ms); the LLM budget is per step (config.ANSWER_LLM_BUDGET)
+BUDGETS_MS = {"memory": 5.0, "rules": 5.0, "similar": 20.0}
+
+def match_option(answer: str, options: Optional[Iterable[str]]) -> Optional[str]:
+    """The option an answer stands for (exact, then synonyms/ranges/fuzzy), or None"""
+    wanted = normalize_label(answer)
+    if not wanted:
+        return None
+    options = [str(option) for option in options or []]
+    for option in options:
+        if normalize_label(option) == wanted:
+            return option
+    return pick(answer, options)
+
+class Question:
+    """One field (or radio group) that needs an answer"""
+
+    __slots__ = ("id", "label", "field_type", "options")
+
+    def __init__(self, id: str, label: str, field_type: str, options: Optional[List[str]] = None):
+        self.id = id
+        self.label = label
+        self.field_type = field_type
+        self.options = options
+
+    def accept(self, answer: Optional[str]) -> Optional[str]:
+        """Answer fitted to the field (an exact option for choices), or None if it does not fit"""
+        if answer is None or str(answer).strip() == "":
+            return None
+        answer = str(answer).strip()
+        if self.options and self.field_type in ("select", "radio"):
+            return match_option(answer, self.options)
+        if self.field_type == "checkbox":
+            return answer.capitalize() if answer.lower() in ("yes", "no") else None
+        if self.field_type == "number":
+            try:
+                float(answer.replace(",", ""))
+            except ValueError:
+                return None
+        return answer
+
+class Resolution:
+    """Which tier answered a question, how sure it was and how long it took"""
+
+    __slots__ = ("answer", "tier", "confidence", "ms")
+
+    def __init__(self, answer: Optional[str], tier: Optional[str], confidence: float = 0.0, ms: float = 0.0):
+        self.answer = answer
+        self.tier = tier
+        self.confidence = confidence
+        self.ms = ms
+
+    @property
+    def source(self) -> str:
+        """Answer-memory source for this tier"""
+        return "ai" if self.tier == "llm" else "rule"
+
+    def __repr__(self):
+        return f"Resolution({self.answer!r}, tier={self.tier}, confidence={self.confidence:.2f}, {self.ms:.2f} ms)"
+
+class Speculation:
+    """LLM answers being generated in the background for a step"""
+
+    __slots__ = ("questions", "cheap", "future", "started", "finished", "waited_at")
+
+    def __init__(self, questions: List[Question], cheap: Dict[str, "Resolution"]):
+        self.questions = {question.id: question.label for question in questions}
+        # What the cheap tiers found before the LLM ran
+        self.cheap = cheap
+        self.future = None
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.waited_at: Optional[float] = None
+
+    def covers(self, question: Question) -> bool:
+        return self.questions.get(question.id) == question.label
+
+    def wait(self, timeout: Optional[float]) -> Dict[str, Optional[str]]:
+        """The answers, or {} if they are not ready within ``timeout`` seconds or failed"""
+        if self.waited_at is None:
+            self.waited_at = time.perf_counter()
+        try:
+            return self.future.result(timeout=timeout) or {}
+        except Exception as e:
+            print(f"⚠ Speculative AI answers not used: {e or type(e).__name__}")
+            return {}
+
+    def close(self, timeout: Optional[float]):
+        """Keep the call from outliving its step: cancel it if it has not started, else wait for it"""
+        if self.future is None or self.future.done():
+            return
+        if not self.future.cancel():
+            self.wait(timeout)
+
+    @property
+    def ms(self) -> float:
+        """Time the background generation took (so far)"""
+        return ((self.finished or time.perf_counter()) - self.started) * 1000
+
+    @property
+    def overlap_ms(self) -> float:
+        """Part of it that ran before anyone waited for it, i.e. off the critical path"""
+        end = min(self.finished or time.perf_counter(), self.waited_at or time.perf_counter())
+        return max(0.0, end - self.started) * 1000
+
+class SimilarityIndex:
+    """Char n-gram TF-IDF over known questions; cosine nearest neighbour"""
+
+    def __init__(self, rows: List[tuple]):
+        # rows: (question text, field type or None for "any", answer)
+        self.rows = rows
+        self.vectorizer = SparseTfidf(analyzer=char_ngrams)
+        self.matrix = self.vectorizer.fit_transform([row[0] for row in rows]) if rows else None
+        self.max_idf = float(self.vectorizer.idf.max()) if rows else 1.0
+
+    def _query_vector(self, text: str) -> np.ndarray:
+        """
+        TF-IDF vector of ``text``, normalized over all of its n-grams. N-grams
+        the index has never seen count towards the norm at the highest idf,
+        so a question sharing a few grams with a short known one does not
+        look like a near match.
+        """
+        vocabulary, idf = self.vectorizer.vocabulary, self.vectorizer.idf
+        vector = np.zeros(len(vocabulary))
+        unseen = 0.0
+        for gram, count in Counter(char_ngrams(text)).items():
+            weight = 1.0 + math.log(count)
+            term_id = vocabulary.get(gram)
+            if term_id is None:
+                unseen += (weight * self.max_idf) ** 2
+            else:
+                vector[term_id] = weight * idf[term_id]
+        norm = math.sqrt(float(vector @ vector) + unseen)
+        return vector / norm if norm else vector
+
+    def nearest(self, question: Question, k: int = 5) -> Optional[tuple]:
+        """(answer, score) of the most similar known question whose answer fits, or None"""
+        if self.matrix is None:
+            return None
+        scores = self.matrix.dot(self._query_vector(question.label))
+        top = scores.argsort()[::-1][:k]
+        for index in top:
+            score = float(scores[index])
+            if score <= 0:
+                break
+            _, field_type, answer = self.rows[index]
+            if field_type and field_type != question.field_type:
+                continue
+            fitted = question.accept(answer)
+            if fitted is not None:
+                return fitted, score
+        return None
+
+class AnswerEngine:
+    """Resolves questions tier by tier and reports which tier answered"""
+
+    def __init__(self, config, memory=answer_memory, use_llm: Optional[bool] = None):
+        self.config = config
+        self.memory = memory
+        self.classifier = get_classifier()
+        self.use_llm = getattr(config, "ANSWER_LLM", True) if use_llm is None else use_llm
+        self.llm_budget_ms = float(getattr(config, "ANSWER_LLM_BUDGET", 25.0)) * 1000
+        self._index: Optional[SimilarityIndex] = None
+        self._index_generation = -1
+        self._llm = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.tier_counts: Counter = Counter()
+        self.over_budget: Counter = Counter()
+        self.speculated: Counter = Counter()  # asked / used
+
+    # Tiers
+
+    def _from_memory(self, question: Question):
+        stored = self.memory.lookup(question.label, question.field_type, question.options)
+        if stored is None:
+            return None
+        return question.accept(stored.answer), 1.0 if stored.passed else 0.9
+
+    def _from_rules(self, question: Question):
+        rule = self.classifier.classify(question.label, question.field_type)
+        if rule is None or not rule.answer:
+            return None
+        answer = question.accept(self.config.ANSWERS.get(rule.answer))
+        if answer is None:
+            return None
+        # Specific rules (high priority) are trusted, generic ones ("do you ...") much less
+        return answer, min(1.0, 0.5 + rule.priority / 200)
+
+    def _from_similar(self, question: Question):
+        return self.index.nearest(question)
+
+    @property
+    def index(self) -> SimilarityIndex:
+        """Similarity index, rebuilt whenever the answer memory has new answers"""
+        if self._index is None or self._index_generation != self.memory.generation:
+            rows = [(key.replace("_", " "), None, str(value)) for key, value in self.config.ANSWERS.items()]
+            rows.extend(self.memory.db.get_answered_questions())
+            self._index = SimilarityIndex(rows)
+            self._index_generation = self.memory.generation
+        return self._index
+
+    @property
+    def llm(self):
+        """
+        The AI filler, or None when disabled or Ollama is unhealthy. Uses the
+        filler's cached health state, so this costs no request within the
+        TTL and none at all while its circuit breaker is open.
+        """
+        if not self.use_llm:
+            return None
+        if self._llm is None:
+            from ai_form_filler import ai_filler
+            self._llm = ai_filler
+        return self._llm if self._llm.is_ollama_available() else None
+
+    # Pipeline
+
+    def _resolve_cheap(self, question: Question, count: bool = True) -> Resolution:
+        """Best answer of the memory, rules and similarity tiers"""
+        best = Resolution(None, None)
+        spent = 0.0
+        for tier, lookup in (("memory", self._from_memory), ("rules", self._from_rules),
+                             ("similar", self._from_similar)):
+            start = time.perf_counter()
+            found = lookup(question)
+            elapsed = (time.perf_counter() - start) * 1000
+            spent += elapsed
+            if count and elapsed > BUDGETS_MS[tier]:
+                self.over_budget[tier] += 1
+            if not found or found[0] is None:
+                continue
+            answer, confidence = found
+            if confidence >= FALLBACK_MIN and confidence > best.confidence:
+                best = Resolution(answer, tier, confidence)
+            if confidence >= THRESHOLDS[tier]:
+                break
+        best.ms = spent
+        return best
+
+    @staticmethod
+    def _settled(resolution: Resolution) -> bool:
+        return resolution.tier is not None and resolution.confidence >= THRESHOLDS[resolution.tier]
+
+    def speculate(self, questions: List[Question]) -> Optional[Speculation]:
+        """
+        Start generating LLM answers in the background for the questions the
+        cheap tiers cannot answer. Returns None when there are none or the
+        LLM is off/unhealthy. Pass the result to ``resolve``.
+        """
+        cheap = {question.id: self._resolve_cheap(question, False) for question in questions}
+        pending = [question for question in questions if not self._settled(cheap[question.id])]
+        llm = self.llm if pending else None
+        if not llm:
+            return None
+
+        speculation = Speculation(pending, cheap)
+        fields = [{"id": q.id, "context": q.label, "type": q.field_type, "options": q.options} for q in pending]
+
+        def generate():
+            try:
+                # Nothing is remembered until an answer is actually written (BaseAutofill._remember_answers)
+                return llm.generate_answers(fields, timeout=self.llm_budget_ms / 1000, remember=False)
+            finally:
+                speculation.finished = time.perf_counter()
+
+        if self._executor is None:
+            # One worker: Ollama works through requests one at a time anyway
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculate")
+        speculation.future = self._executor.submit(generate)
+        self.speculated["asked"] += len(pending)
+        print(f"🔮 Generating {len(pending)} AI answers in the background")
+        return speculation
+
+    def close(self, speculation: Optional[Speculation]):
+        """
+        Settle a speculation on every path, used or not, so the single worker
+        and Ollama are free for the next step (waits at most the step budget)
+        """
+        if speculation is not None:
+            speculation.close(max(0.0, self.llm_budget_ms / 1000 - (time.perf_counter() - speculation.started)))
+
+    def resolve(self, questions: List[Question], speculation: Optional[Speculation] = None) -> Dict[str, Resolution]:
+        """
+        Answer every question; the LLM tier runs once for all that the cheap
+        tiers left, reusing the answers of ``speculation`` where it covered them
+        """
+        results: Dict[str, Resolution] = {}
+        pending: List[Question] = []
+
+        for question in questions:
+            if speculation and speculation.covers(question):
+                results[question.id] = speculation.cheap[question.id]
+            else:
+                results[question.id] = self._resolve_cheap(question)
+            if not self._settled(results[question.id]):
+                pending.append(question)
+
+        if pending:
+            self._resolve_llm(pending, results, speculation)
+
+        for question in questions:
+            resolution = results[question.id]
+            self.tier_counts[resolution.tier or "unanswered"] += 1
+            print(f"   [{resolution.tier or '-':7} {resolution.confidence:.2f} {resolution.ms:7.2f} ms] "
+                  f"{question.label[:60]} -> {resolution.answer!r}")
+        return results
+
+    def _resolve_llm(self, pending: List[Question], results: Dict[str, Resolution],
+                     speculation: Optional[Speculation] = None):
+        start = time.perf_counter()
+        answers: Dict[str, Optional[str]] = {}
+        covered = [q for q in pending if speculation and speculation.covers(q)]
+        if covered:
+            # Whatever is left of the step budget since the background call started
+            remaining = self.llm_budget_ms / 1000 - (start - speculation.started)
+            ready = speculation.wait(max(0.0, remaining))
+            for question in covered:
+                answers[question.id] = ready.get(question.id)
+            used = sum(answers[q.id] is not None for q in covered)
+            self.speculated["used"] += used
+            print(f"🔮 {used}/{len(covered)} speculative AI answers used "
+                  f"({speculation.ms:.0f} ms generating, {speculation.overlap_ms:.0f} ms of it off the critical path)")
+
+        rest = [q for q in pending if q.id not in answers]
+        llm = self.llm if rest else None
+        if llm:
+            answers.update(llm.generate_answers(
+                [{"id": q.id, "context": q.label, "type": q.field_type, "options": q.options} for q in rest],
+                timeout=max(1.0, self.llm_budget_ms / 1000 - (time.perf_counter() - start)),
+                remember=False
+            ))
+        if not covered and not llm:
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        if elapsed > self.llm_budget_ms:
+            self.over_budget["llm"] += 1
+
+        for question in pending:
+            answer = question.accept(answers.get(question.id))
+            if answer is None:
+                continue  # Keep the low-confidence fallback, if any
+            results[question.id] = Resolution(answer, "llm", 0.7, results[question.id].ms + elapsed / len(pending))
+
+    def stats(self) -> str:
+        parts = [f"{tier} {self.tier_counts[tier]}" for tier in TIERS + ("unanswered",) if self.tier_counts[tier]]
+        text = ", ".join(parts) or "no questions"
+        if self.over_budget:
+            text += " (over budget: " + ", ".join(f"{t} x{n}" for t, n in self.over_budget.items()) + ")"
+        if self.speculated:
+            text += f"; speculative AI {self.speculated['used']}/{self.speculated['asked']} used"
+        if self._llm is not None:
+            text += f"; Ollama {self._llm.health.summary()}"
+        return text
+
+# Global instance
+answer_engine = AnswerEngine(config)
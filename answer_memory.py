@@ -0,0 +1,169 @@
+"""
+answer_memory.py
+Persistent memory of screening-question answers.
+
+Companies keep asking the same questions. Every answer we put into a form
+is stored in the ``question_answers`` table under a hash of the normalized
+question label, the field type and the options offered, together with
+where it came from (``rule``, ``ai`` or ``manual``) and whether the form
+step then passed validation. Lookups go through an in-process LRU first,
+then one primary-key query, so a repeated question costs no heuristics
+and no model call.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+
+from database import db
+
+SOURCES = ("rule", "ai", "manual")
+
+# Source of placeholder defaults ("N/A", the first option, a stock number): written to the
+# form so the step can go on, never stored, so they cannot outrank real answers later
+FALLBACK = "fallback"
+# Source of text written for one job (cover_notes.py); another company must not get it back
+JOB_TEXT = "job"
+_NOT_STORED = (FALLBACK, JOB_TEXT)
+
+# Option texts that are placeholders rather than real choices
+_PLACEHOLDER_OPTIONS = {"", "select", "select an option", "please select", "choose", "choose an option", "--"}
+
+_NOISE_RE = re.compile(r"\b(required|optional)\b|[^a-z0-9+#.\s]")
+
+def normalize_label(label: str) -> str:
+    """Lowercase, drop punctuation/asterisks and 'required', collapse whitespace"""
+    text = _NOISE_RE.sub(" ", (label or "").lower())
+    return " ".join(word.strip(".") for word in text.split() if word.strip("."))
+
+def options_signature(options: Optional[Iterable[str]]) -> str:
+    """Order-independent signature of the real options of a select/radio group"""
+    if not options:
+        return ""
+    texts = sorted({normalize_label(o) for o in options} - _PLACEHOLDER_OPTIONS)
+    return "|".join(texts)
+
+def question_key(label: str, field_type: str, options: Optional[Iterable[str]] = None) -> str:
+    raw = "\x1f".join((normalize_label(label), field_type or "", options_signature(options)))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def profile_version(config=None) -> str:
+    """Short hash of everything answers are derived from (profile fields + ANSWERS)"""
+    if config is None:
+        from config import config
+    profile = {
+        key: getattr(config, key, None)
+        for key in ("FULL_NAME", "EMAIL", "PHONE", "LOCATION", "YEARS_EXPERIENCE", "CURRENT_SALARY",
+                    "EXPECTED_SALARY", "NOTICE_PERIOD", "EDUCATION", "SKILLS")
+    }
+    profile["ANSWERS"] = getattr(config, "ANSWERS", {})
+    raw = json.dumps(profile, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+class StoredAnswer:
+    """One remembered answer"""
+
+    __slots__ = ("key", "answer", "source", "profile_version", "passed")
+
+    def __init__(self, key: str, answer: str, source: str, profile_version: str, passed: Optional[bool]):
+        self.key = key
+        self.answer = answer
+        self.source = source
+        self.profile_version = profile_version
+        self.passed = passed
+
+    def __repr__(self):
+        return f"StoredAnswer({self.answer!r}, source={self.source}, passed={self.passed})"
+
+class AnswerMemory:
+    """LRU in front of the question_answers table"""
+
+    def __init__(self, database=db, capacity: int = 512, version: Optional[str] = None):
+        self.db = database
+        self.capacity = capacity
+        self.version = version or profile_version()
+        self._lru: "OrderedDict[str, Optional[StoredAnswer]]" = OrderedDict()
+        # Speculative AI answers are looked up and stored from a worker thread
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0  # Bumped on every write, so indexes over past answers know to rebuild
+
+    def _cache(self, key: str, value: Optional[StoredAnswer]):
+        with self._lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            if len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+
+    def get(self, key: str) -> Optional[StoredAnswer]:
+        """Stored answer by key (misses are cached too)"""
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                return self._lru[key]
+
+        row = self.db.get_question_answer(key)
+        stored = None
+        if row:
+            answer, source, version, passed = row
+            stored = StoredAnswer(key, answer, source, version, None if passed is None else bool(passed))
+        self._cache(key, stored)
+        return stored
+
+    def lookup(self, label: str, field_type: str, options: Optional[Iterable[str]] = None) -> Optional[StoredAnswer]:
+        """
+        Answer to reuse for this question, or None. Answers that failed
+        validation are skipped, and rule/AI answers made with a different
+        profile are ignored so edits to config take effect.
+        """
+        stored = self.get(question_key(label, field_type, options))
+        usable = (
+            stored is not None
+            and stored.answer
+            and stored.passed is not False
+            and (stored.source == "manual" or stored.profile_version == self.version)
+        )
+        if usable:
+            self.hits += 1
+            return stored
+        self.misses += 1
+        return None
+
+    def remember(self, label: str, field_type: str, options: Optional[Iterable[str]], answer: str,
+                 source: str = "rule") -> Optional[str]:
+        """Store the answer used for a question; returns its key (None if it is not stored)"""
+        if source in _NOT_STORED or not normalize_label(label) or answer is None or str(answer) == "":
+            return None
+        options = list(options or [])
+        key = question_key(label, field_type, options)
+        previous = self.get(key)
+        if self.db.save_question_answer(key, normalize_label(label), field_type, options_signature(options),
+                                        str(answer), source, self.version):
+            passed = previous.passed if previous and previous.answer == str(answer) else None
+            self._cache(key, StoredAnswer(key, str(answer), source, self.version, passed))
+            self.generation += 1
+        return key
+
+    def record_result(self, keys: List[str], passed: bool):
+        """Mark the answers used on a form step as having passed (or failed) validation"""
+        keys = [k for k in keys if k]
+        if not keys:
+            return
+        self.db.set_question_answers_passed(keys, passed)
+        self.generation += 1
+        for key in keys:
+            stored = self._lru.get(key)
+            if stored is not None:
+                stored.passed = passed
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"{self.hits} hits / {self.misses} misses ({rate:.0f}% reused)"
+
+# Global instance
+answer_memory = AnswerMemory()
@@ -1,5 +1,17 @@
-from .linkedin_apply import LinkedInApply
-from .utils.job_filtering import get_new_jobs_only
+import importlib
 
-# Export main classes and functions
-__all__ = ['LinkedInApply', 'get_new_jobs_only']
\ No newline at end of file
+# Export main classes and functions (imported lazily so that loading one
+# helper does not pull in the whole LinkedIn apply stack)
+_EXPORTS = {
+    'LinkedInApply': '.linkedin_apply',
+    'get_new_jobs_only': '.utils.job_filtering',
+}
+
+__all__ = ['LinkedInApply', 'get_new_jobs_only']
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
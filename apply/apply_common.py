@@ -5,6 +5,7 @@ Enhanced version with better LinkedIn Easy Apply support for CTC fields and expe
 from playwright.sync_api import Page
 import time
 import re
+from question_rules import get_classifier
 
 def autofill_standard_form(page: Page):
     """
@@ -419,8 +420,10 @@ def fill_all_dropdowns(page: Page):
                 except:
                     context = ""
 
+                category = get_classifier().category(context, "select")
+
                 # 2. NOTICE PERIOD
-                if any(k in context for k in ["notice", "availability"]):
+                if category == "notice_period":
                     try:
                         select.select_option(label="30 days")
                         print("✓ Selected notice period = 30 days")
@@ -429,7 +432,7 @@ def fill_all_dropdowns(page: Page):
                     continue
 
                 # 3. EXPERIENCE
-                if any(k in context for k in ["experience", "years"]):
+                if category == "experience_years":
                     try:
                         select.select_option(label="2")
                         print("✓ Selected experience = 2 years")
@@ -438,7 +441,7 @@ def fill_all_dropdowns(page: Page):
                     continue
 
                 # 4. WORK AUTHORIZATION / VISA
-                if any(k in context for k in ["authorization", "work permit", "visa"]):
+                if category == "work_auth":
                     try:
                         select.select_option(label="Yes")
                         print("✓ Selected work authorization = Yes")
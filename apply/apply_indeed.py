@@ -6,6 +6,9 @@ Enhanced Indeed auto-apply with robust form handling and error recovery.
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
 from apply.apply_common import fill_contact_fields, fill_standard_form_fields
 from database import db
+from page_probe import probe_page
+from question_rules import get_classifier
+from option_matcher import best_option
 import time
 import random
 import re
@@ -67,76 +70,9 @@ def get_field_label_and_context(page: Page, field) -> str:
     except Exception as e:
         return ""
 
-def analyze_field_type(context: str, field_name: str) -> str:
-    """Determine what type of information a field is asking for"""
-    context_lower = context.lower()
-    name_lower = field_name.lower()
-    combined = f"{context_lower} {name_lower}"
-    
-    # Work authorization
-    if any(term in combined for term in [
-        'authorized', 'authorization', 'eligible', 'eligibility',
-        'sponsorship', 'visa', 'work permit', 'legally authorized',
-        'require sponsorship', 'need sponsorship'
-    ]):
-        return 'work_auth'
-    
-    # Years of experience
-    if any(term in combined for term in [
-        'years of experience', 'years experience', 'how many years',
-        'experience in years', 'total experience', 'relevant experience'
-    ]):
-        return 'experience_years'
-    
-    # Notice period
-    if any(term in combined for term in [
-        'notice period', 'notice', 'availability', 'available to start',
-        'when can you start', 'start date', 'joining'
-    ]):
-        return 'notice_period'
-    
-    # Salary - current
-    if any(term in combined for term in [
-        'current salary', 'current ctc', 'current compensation',
-        'present salary', 'existing salary'
-    ]):
-        return 'current_salary'
-    
-    # Salary - expected
-    if any(term in combined for term in [
-        'expected salary', 'expected ctc', 'desired salary',
-        'salary expectation', 'target salary', 'compensation expectation'
-    ]):
-        return 'expected_salary'
-    
-    # Location/Address
-    if any(term in combined for term in [
-        'location', 'city', 'address', 'where are you based',
-        'current location', 'home address'
-    ]):
-        return 'location'
-    
-    # Education level
-    if any(term in combined for term in [
-        'education', 'degree', 'qualification', 'highest education',
-        'educational background'
-    ]):
-        return 'education'
-    
-    # Generic yes/no questions
-    if any(term in combined for term in [
-        'do you', 'are you', 'have you', 'can you', 'will you',
-        'would you', 'did you'
-    ]):
-        # Check for negative questions (where "no" is appropriate)
-        if any(term in combined for term in [
-            'criminal', 'felony', 'convicted', 'terminated', 'fired',
-            'dismissed', 'lawsuit', 'sued'
-        ]):
-            return 'negative_question'
-        return 'positive_question'
-    
-    return 'unknown'
+def analyze_field_type(context: str, field_name: str, field_kind: str = None) -> str:
+    """Determine what type of information a field is asking for (see question_rules.json)"""
+    return get_classifier().category(f"{context} {field_name}", field_kind)
 
 def fill_field_intelligently(page: Page, field, field_type: str, context: str) -> bool:
     """Fill a field based on its detected type"""
@@ -172,7 +108,7 @@ def fill_field_intelligently(page: Page, field, field_type: str, context: str) -
         elif field_type == 'experience_years':
             years = getattr(config, 'YEARS_EXPERIENCE', '2')
             if tag_name == 'select':
-                return select_dropdown_option(field, [years, f'{years} years', f'{years}+'])
+                return select_dropdown_option(field, [f'{years} years', years])
             else:
                 field.fill(str(years))
                 return True
@@ -180,7 +116,7 @@ def fill_field_intelligently(page: Page, field, field_type: str, context: str) -
         elif field_type == 'notice_period':
             notice = getattr(config, 'NOTICE_PERIOD', '30')
             if tag_name == 'select':
-                return select_dropdown_option(field, [notice, f'{notice} days', '1 month'])
+                return select_dropdown_option(field, [f'{notice} days', notice])
             else:
                 field.fill(str(notice))
                 return True
@@ -226,84 +162,46 @@ def fill_field_intelligently(page: Page, field, field_type: str, context: str) -
         return False
 
 def select_dropdown_option(field, preferred_values: list) -> bool:
-    """Select option from dropdown that matches preferred values"""
+    """Select option from dropdown that best matches preferred values (one read of all options)"""
     try:
-        options = field.query_selector_all("option")
-        
-        # First pass: exact matches
-        for option in options:
-            value = (option.get_attribute('value') or '').lower()
-            text = option.inner_text().lower()
-            
-            for pref in preferred_values:
-                pref_lower = str(pref).lower()
-                if pref_lower == value or pref_lower == text:
-                    field.select_option(value=option.get_attribute('value'))
-                    return True
-        
-        # Second pass: partial matches
-        for option in options:
-            value = (option.get_attribute('value') or '').lower()
-            text = option.inner_text().lower()
-            
-            for pref in preferred_values:
-                pref_lower = str(pref).lower()
-                if pref_lower in value or pref_lower in text:
-                    field.select_option(value=option.get_attribute('value'))
-                    return True
-        
-        return False
+        options = field.evaluate(
+            "el => Array.from(el.options).filter(o => o.value).map(o => [o.value, (o.text || '').trim()])"
+        )
+        found = best_option(preferred_values, [text or value for value, text in options])
+        if found is None:
+            return False
+        field.select_option(value=options[found[0]][0])
+        return True
     except Exception as e:
         print(f"⚠ Error selecting dropdown: {e}")
         return False
 
+_RADIO_GROUP_JS = """
+(name) => Array.from(document.querySelectorAll('input[type="radio"]'))
+    .filter(r => r.name === name)
+    .map(r => {
+        const label = (r.id && document.querySelector(`label[for="${CSS.escape(r.id)}"]`)) || r.closest('label');
+        return {value: r.value || '', label: label ? (label.innerText || '').trim() : '', checked: r.checked};
+    })
+"""
+
 def select_radio_in_group(page: Page, field, preferred_values: list) -> bool:
-    """Select radio button in group matching preferred values"""
+    """Select radio button in group matching preferred values (one read of all labels)"""
     try:
         field_name = field.get_attribute('name')
         if not field_name:
             return False
         
-        radio_buttons = page.query_selector_all(f'input[type="radio"][name="{field_name}"]')
-        
-        # First pass: exact matches
-        for radio in radio_buttons:
-            value = (radio.get_attribute('value') or '').lower()
-            radio_id = radio.get_attribute('id') or ''
-            
-            # Get label text
-            label_text = ''
-            if radio_id:
-                label = page.query_selector(f"label[for='{radio_id}']")
-                if label:
-                    label_text = label.inner_text().lower()
-            
-            for pref in preferred_values:
-                pref_lower = str(pref).lower()
-                if pref_lower == value or pref_lower == label_text:
-                    if not radio.is_checked():
-                        radio.check()
-                        return True
-        
-        # Second pass: partial matches
-        for radio in radio_buttons:
-            value = (radio.get_attribute('value') or '').lower()
-            radio_id = radio.get_attribute('id') or ''
-            
-            label_text = ''
-            if radio_id:
-                label = page.query_selector(f"label[for='{radio_id}']")
-                if label:
-                    label_text = label.inner_text().lower()
-            
-            for pref in preferred_values:
-                pref_lower = str(pref).lower()
-                if pref_lower in value or pref_lower in label_text:
-                    if not radio.is_checked():
-                        radio.check()
-                        return True
+        radios = page.evaluate(_RADIO_GROUP_JS, field_name)
+        found = best_option(preferred_values, [radio['label'] or radio['value'] for radio in radios])
+        if found is None:
+            return False
         
-        return False
+        index = found[0]
+        if radios[index]['checked']:
+            return False
+        page.locator(f'input[type="radio"][name="{field_name}"]').nth(index).check()
+        return True
     except Exception as e:
         print(f"⚠ Error selecting radio: {e}")
         return False
@@ -455,14 +353,16 @@ def detect_page_type(page: Page) -> str:
         elif 'confirmation' in url or 'success' in url:
             return 'success'
         
-        # Check page content
-        content = page.content().lower()
+        # Check visible page text
+        state = probe_page(page, phrases=[
+            'resume', 'contact information', 'screening', 'question', 'eligibility'
+        ])
         
-        if 'resume' in content[:5000]:
+        if state.has_phrase('resume'):
             return 'resume'
-        elif 'contact information' in content[:5000]:
+        elif state.has_phrase('contact information'):
             return 'contact'
-        elif any(term in content[:5000] for term in ['screening', 'question', 'eligibility']):
+        elif any(state.has_phrase(term) for term in ['screening', 'question', 'eligibility']):
             return 'questions'
         
         return 'unknown'
@@ -1,5 +1,12 @@
 import time
+from typing import Dict, List, Optional, Tuple
 from .field_detection import FieldDetector
+from .field_repair import STRATEGIES, coerce_value, invalid_fields
+from .field_snapshot import FieldSnapshot, MODAL_SELECTOR, take_snapshot
+from question_rules import get_classifier
+from answer_memory import FALLBACK, JOB_TEXT, answer_memory
+from answer_engine import Question, answer_engine
+from cover_notes import cover_notes
 from .field_handlers import FieldHandler
 from .form_fillers import FormFiller
 
@@ -11,17 +18,79 @@ class BaseAutofill:
         self.field_detector = FieldDetector()
         self.field_handler = FieldHandler(config)
         self.form_filler = FormFiller(config, self.field_handler)
+        self.classifier = get_classifier()
+        self.memory = answer_memory
+        self.engine = answer_engine
+        self.cover_notes = cover_notes
+        self.job: Optional[Dict] = None  # Job being applied to, set by the applier
+        self.step_answer_keys: List[str] = []
     
     def autofill_standard_form(self, page):
         """Enhanced autofill for LinkedIn Easy Apply"""
         try:
             print("Starting form autofill...")
+            timings: List[Tuple[str, float]] = []
+            mark = time.perf_counter()
             
-            # Handle LinkedIn-specific fields
-            self._fill_linkedin_specific_fields(page)
+            def lap(name):
+                nonlocal mark
+                now = time.perf_counter()
+                timings.append((name, (now - mark) * 1000))
+                mark = now
             
-            # Handle standard form fields
-            self._fill_standard_fields(page)
+            # One evaluate for the whole step; every pass below works on this snapshot
+            fields = [f for f in take_snapshot(page, MODAL_SELECTOR) if f.visible]
+            # Field types from LinkedIn's component markup; text heuristics only where there is none
+            structural = self.field_detector.classify(fields)
+            lap("snapshot")
+            self.step_answer_keys = []
+            
+            # Model answers for the required questions the markup does not already place start
+            # generating now, while the heuristic passes and their writes run; always awaited or cancelled
+            speculation = self.engine.speculate(
+                [q for q, targets in self._unresolved_questions(fields).values() if not targets[0].purpose])
+            lap("speculate")
+            try:
+                # Passes only decide values; writes are queued in the plan
+                self.field_handler.begin_plan()
+                
+                # Answers remembered from earlier applications go first
+                self._fill_from_memory(page, fields)
+                lap("memory")
+                
+                # Handle LinkedIn-specific fields
+                self._fill_linkedin_specific_fields(page, fields)
+                
+                # Handle standard form fields
+                self._fill_standard_fields(page, fields)
+                lap("heuristics")
+                
+                # One DOM write call for what the passes decided, while the model is still answering
+                results = self.field_handler.apply_plan(page)
+                self._remember_answers(fields, results)
+                lap("write")
+                
+                # Whatever the heuristics left goes through the tiered answer engine,
+                # the only place the speculation is waited on
+                self.field_handler.begin_plan()
+                self._fill_unresolved(page, fields, speculation)
+                lap("answers")
+                
+                # Placeholders, last, for what nothing could answer
+                self._fill_fallbacks(page, fields)
+                
+                if len(self.field_handler.plan):
+                    results = self.field_handler.apply_plan(page)
+                    self._remember_answers(fields, results)
+                    lap("write answers")
+            finally:
+                self.engine.close(speculation)
+            
+            line = ", ".join(f"{name} {ms:.0f} ms" for name, ms in timings)
+            line += f" | {structural}/{len(fields)} fields typed from markup"
+            if speculation:
+                line += f" | AI {speculation.ms:.0f} ms in background, {speculation.overlap_ms:.0f} ms overlapped"
+            print(f"⏱ Step: {line}")
             
             # Small delay for validation
             time.sleep(0.5)
@@ -31,162 +100,341 @@ class BaseAutofill:
         except Exception as e:
             print(f"Error in autofill: {e}")
     
-    def _fill_linkedin_specific_fields(self, page):
-        """Handle LinkedIn-specific field patterns"""
+    def _question(self, field: FieldSnapshot, fields: List[FieldSnapshot]) -> Tuple[str, str, Optional[List[str]]]:
+        """(question label, field type, options) used as the answer-memory key"""
+        kind = field.kind
+        if field.type == 'radio':
+            # The whole group shares one key: the first radio's question
+            group = [r for r in fields if r.type == 'radio' and r.name == field.name] or [field]
+            return group[0].question, kind, [r.label or r.value for r in group]
+        if field.tag == 'select':
+            return field.question, kind, [text for _, text in field.options]
+        return field.question, kind, None
+    
+    def _fill_from_memory(self, page, fields: List[FieldSnapshot]):
+        """Plan answers for questions seen (and validated) on earlier applications"""
+        reused = 0
+        radio_groups: Dict[str, List[FieldSnapshot]] = {}
+        
+        for field in fields:
+            if field.type == 'radio':
+                if field.name:
+                    radio_groups.setdefault(field.name, []).append(field)
+                continue
+            if field.is_filled:
+                continue
+            
+            stored = self.memory.lookup(*self._question(field, fields))
+            if stored is None:
+                continue
+            
+            if field.tag == 'select':
+                option_value = field.find_option(stored.answer)
+                if option_value is not None:
+                    reused += self.field_handler.select(page, field, option_value, stored.source)
+            elif field.type == 'checkbox':
+                if stored.answer.lower() == 'yes':
+                    reused += self.field_handler.check(page, field, stored.source)
+            else:
+                reused += self.field_handler.fill(page, field, stored.answer, stored.source)
+        
+        for radios in radio_groups.values():
+            if any(radio.checked for radio in radios):
+                continue
+            stored = self.memory.lookup(*self._question(radios[0], fields))
+            if stored is None:
+                continue
+            for radio in radios:
+                if (radio.label or radio.value).strip().lower() == stored.answer.strip().lower():
+                    reused += self.field_handler.check(page, radio, stored.source)
+                    break
+        
+        if reused:
+            print(f"💾 Reused {reused} remembered answers")
+    
+    def _remember_answers(self, fields: List[FieldSnapshot], results: Dict[str, bool]):
+        """Store every answer that made it into the form; their keys join the step's"""
+        plan = self.field_handler.plan
+        
+        for field_id, ok in results.items():
+            if not ok:
+                continue
+            field = plan.fields[field_id]
+            op = plan.ops[field_id]
+            if op['action'] == 'select':
+                answer = field.option_text(op['value'])
+            elif op['action'] == 'check':
+                answer = (field.label or field.value) if field.type == 'radio' else 'Yes'
+            else:
+                answer = op['value']
+            
+            label, kind, options = self._question(field, fields)
+            key = self.memory.remember(label, kind, options, answer, plan.sources.get(field_id, 'rule'))
+            if key and key not in self.step_answer_keys:
+                self.step_answer_keys.append(key)
+    
+    def _unresolved_questions(self, fields: List[FieldSnapshot]) -> Dict[str, Tuple[Question, List[FieldSnapshot]]]:
+        """Required fields (radio groups as one) that are still empty, with the fields they fill"""
+        questions: Dict[str, Tuple[Question, List[FieldSnapshot]]] = {}
+        for field in fields:
+            if field.type in ('file', 'hidden', 'submit', 'button') or not field.required:
+                continue
+            if field.type == 'radio':
+                group = [r for r in fields if r.type == 'radio' and r.name == field.name]
+                if field.name in questions or any(r.checked for r in group):
+                    continue
+                key, targets = field.name, group
+            elif field.is_filled:
+                continue
+            else:
+                key, targets = field.id, [field]
+            label, kind, options = self._question(field, fields)
+            if label:
+                questions[key] = (Question(key, label, kind, options), targets)
+        return questions
+    
+    def _fill_unresolved(self, page, fields: List[FieldSnapshot], speculation=None):
+        """Resolve required fields no pass could answer (similar past questions, then the LLM)"""
+        # Planned values are written back into the snapshot, so this sees what the passes above left
+        questions = self._unresolved_questions(fields)
+        
+        if not questions:
+            return
+        
+        print(f"🔎 Resolving {len(questions)} unanswered fields")
+        resolved = self.engine.resolve([question for question, _ in questions.values()], speculation)
+        for key, (question, targets) in questions.items():
+            resolution = resolved.get(key)
+            if resolution is None or resolution.answer is None:
+                continue
+            self._plan_answer(page, targets, resolution.answer, resolution.source)
+    
+    def _plan_answer(self, page, targets: List[FieldSnapshot], answer: str, source: str) -> bool:
+        """Plan an answer for a field (or a radio group) in the way its type takes it"""
+        field = targets[0]
+        if field.type == 'radio':
+            for radio in targets:
+                if (radio.label or radio.value).strip().lower() == answer.strip().lower():
+                    return self.field_handler.check(page, radio, source)
+            return False
+        if field.tag == 'select':
+            option_value = field.find_option(answer)
+            return option_value is not None and self.field_handler.select(page, field, option_value, source)
+        if field.type == 'checkbox':
+            return answer.lower() == 'yes' and self.field_handler.check(page, field, source)
+        return self.field_handler.fill(page, field, answer, source)
+    
+    def repair_invalid_fields(self, page, attempts: Dict[str, int]) -> int:
+        """
+        Re-fill only the fields the step's validation rejected. Each field
+        gets one strategy per attempt (a fix read off its error message,
+        then the answer engine told about the error); ``attempts`` counts
+        them per field across calls. Returns how many fields were re-written,
+        0 once nothing is left to try.
+        """
         try:
-            modal_selector = "div.jobs-easy-apply-modal, div[role='dialog']"
-            all_inputs = page.query_selector_all(
-                f"{modal_selector} input, {modal_selector} textarea, {modal_selector} select"
-            )
+            fields = [f for f in take_snapshot(page, MODAL_SELECTOR) if f.visible]
+            self.field_detector.classify(fields)
+            invalid = invalid_fields(page, fields)
+            if not invalid:
+                print("⚠ Step did not validate but no field is flagged")
+                return 0
             
-            for field in all_inputs:
-                if not field.is_visible():
+            self.field_handler.begin_plan()
+            by_id = {field.id: field for field in fields}
+            questions: Dict[str, Tuple[Question, List[FieldSnapshot]]] = {}
+            for field_id, message in invalid.items():
+                field = by_id.get(field_id)
+                attempt = attempts.get(field_id, 0)
+                if field is None or attempt >= len(STRATEGIES):
                     continue
+                attempts[field_id] = attempt + 1
+                strategy = STRATEGIES[attempt]
+                print(f"🩹 {field.question[:60]!r}: {message} (repair {attempt + 1}/{len(STRATEGIES)}, {strategy})")
                 
-                try:
-                    # Analyze field
-                    tag_name, field_type = self.field_detector.analyze_field_type(field)
-                    
-                    # Skip if already filled
-                    if self._is_field_already_filled(field, tag_name, field_type):
-                        continue
-                    
-                    # Get context and handle field
-                    context_text = self.field_detector.get_field_context(page, field).lower()
-                    self._handle_field_by_context(field, context_text, tag_name)
-                    
-                except Exception as e:
-                    print(f"Error processing field: {e}")
+                value = None
+                if strategy == 'coerce' and not field.is_choice and field.tag != 'select':
+                    value = coerce_value(field, message, self.config)
+                if value is not None and value != field.value:
+                    self.field_handler.fill(page, field, value)
                     continue
-                    
+                
+                # The engine is told what the form objected to, so it does not repeat the rejected answer
+                targets = [r for r in fields if r.type == 'radio' and r.name == field.name] if field.type == 'radio' else [field]
+                label, kind, options = self._question(field, fields)
+                if message != 'required':
+                    label = f"{label} ({message})"
+                questions[field_id] = (Question(field_id, label, kind, options), targets)
+            
+            if questions:
+                resolved = self.engine.resolve([question for question, _ in questions.values()])
+                for key, (question, targets) in questions.items():
+                    resolution = resolved.get(key)
+                    if resolution is None or resolution.answer is None or resolution.answer == targets[0].value:
+                        continue
+                    self._plan_answer(page, targets, resolution.answer, resolution.source)
+            
+            if not len(self.field_handler.plan):
+                print(f"⚠ No repair left for {len(invalid)} invalid fields")
+                return 0
+            results = self.field_handler.apply_plan(page)
+            self._remember_answers(fields, results)
+            return sum(1 for ok in results.values() if ok)
         except Exception as e:
-            print(f"Error in LinkedIn specific fields: {e}")
+            print(f"Error repairing fields: {e}")
+            return 0
+    
+    def record_step_result(self, passed: bool):
+        """
+        Called by the modal navigator once it knows whether the step
+        validated. A failed step keeps its answers: the repair pass adds the
+        fields it re-fills, and the step's next result covers them all.
+        """
+        self.memory.record_result(self.step_answer_keys, passed)
+        if passed:
+            self.step_answer_keys = []
     
-    def _fill_standard_fields(self, page):
+    def _fill_linkedin_specific_fields(self, page, fields: List[FieldSnapshot]):
+        """Handle LinkedIn-specific field patterns"""
+        for field in fields:
+            # Radio/checkbox groups are handled by the form filler
+            if field.is_choice:
+                continue
+            
+            # Skip if already filled
+            if self._is_field_already_filled(field):
+                continue
+            
+            try:
+                self._handle_field_by_context(page, field, field.context.lower())
+            except Exception as e:
+                print(f"Error processing field: {e}")
+                continue
+    
+    def _fill_standard_fields(self, page, fields: List[FieldSnapshot]):
         """Fill standard form fields"""
-        modal_selector = "div.jobs-easy-apply-modal, div[role='dialog']"
-        
         # Fill text fields
-        self.form_filler.fill_text_fields(page, modal_selector)
+        self.form_filler.fill_text_fields(page, fields)
         
         # Fill dropdowns
-        self.form_filler.fill_dropdowns(page, modal_selector, self.field_detector)
+        self.form_filler.fill_dropdowns(page, fields)
         
         # Fill radio buttons and checkboxes
-        self.form_filler.fill_radio_checkboxes(page, modal_selector, self.field_detector)
+        self.form_filler.fill_radio_checkboxes(page, fields)
         
         # Fill number inputs and textareas
-        self._fill_number_inputs(page, modal_selector)
-        self._fill_textareas(page, modal_selector)
+        self._fill_number_inputs(page, fields)
+        self._fill_textareas(page, fields)
     
-    def _is_field_already_filled(self, field, tag_name: str, field_type: str) -> bool:
+    def _is_field_already_filled(self, field: FieldSnapshot) -> bool:
         """Check if field is already filled"""
-        try:
-            if tag_name == 'input' and field_type not in ['checkbox', 'radio']:
-                current_value = field.input_value()
-                return bool(current_value and current_value.strip())
-            elif tag_name == 'select':
-                current_value = field.evaluate("el => el.value")
-                return bool(current_value and current_value != "")
-            return False
-        except:
-            return False
+        if field.tag == 'input' and not field.is_choice:
+            return field.is_filled
+        elif field.tag == 'select':
+            return field.is_filled
+        return False
     
-    def _handle_field_by_context(self, field, context_text: str, tag_name: str):
+    def _handle_field_by_context(self, page, field: FieldSnapshot, context_text: str):
         """Handle field based on its context"""
-        # CTC fields
-        ctc_keywords = {
-            'current': ['current ctc', 'current compensation', 'current salary', 'current annual'],
-            'expected': ['expected ctc', 'expected salary', 'desired compensation', 'expected annual']
-        }
-        
-        for ctc_type, keywords in ctc_keywords.items():
-            if any(keyword in context_text for keyword in keywords):
-                self.field_handler.handle_ctc_field(field, context_text, ctc_type == 'current')
-                return
-        
-        # Experience fields
-        experience_keywords = ['years of experience', 'total experience', 
-                              'professional experience', 'work experience']
+        rule = self.classifier.classify(context_text, field.kind)
+        if rule is None:
+            return
         
-        if any(keyword in context_text for keyword in experience_keywords):
-            self.field_handler.handle_experience_field(field, context_text)
+        # Dropdowns other than notice period are left to the dropdown pass
+        if field.tag == 'select' and rule.category != 'notice_period':
             return
         
-        # Technology experience
-        tech_keywords = ['python', 'javascript', 'react', 'node', 'sql', 
-                        'mongodb', '.net', 'java', 'aws', 'docker', 'typescript']
+        # CTC fields
+        if rule.category in ('current_salary', 'expected_salary'):
+            self.field_handler.handle_ctc_field(page, field, context_text, rule.category == 'current_salary')
         
-        if any(tech in context_text for tech in tech_keywords):
-            self.field_handler.handle_experience_field(field, context_text)
-            return
+        # Experience fields (total or per technology)
+        elif rule.category == 'experience_years':
+            topic = rule.name.replace('experience_', '') if rule.name.startswith('experience_') else ''
+            self.field_handler.handle_experience_field(page, field, rule.answer, topic)
         
         # Notice period
-        if any(keyword in context_text for keyword in ['notice period', 'availability', 'joining']):
-            self.field_handler.handle_notice_period_field(field)
-            return
+        elif rule.category == 'notice_period':
+            self.field_handler.handle_notice_period_field(page, field)
     
-    def _fill_number_inputs(self, page, modal_selector: str):
+    def _fill_number_inputs(self, page, fields: List[FieldSnapshot]):
         """Fill number input fields"""
-        number_inputs = page.query_selector_all(f"{modal_selector} input[type='number']")
-        
-        for field in number_inputs:
-            if not field.is_visible():
+        for field in fields:
+            # LinkedIn's numeric questions are text inputs; the markup marks them as numbers
+            if field.tag != 'input' or field.kind != 'number' or field.is_filled:
                 continue
             
-            try:
-                if field.input_value() and field.input_value().strip():
-                    continue
-                
-                context = self.field_detector.get_field_context(page, field).lower()
-                
-                # Determine value based on context
-                if any(keyword in context for keyword in ['ctc', 'salary', 'compensation']):
-                    if 'current' in context:
-                        value = self.config.ANSWERS.get("current_ctc", "6.0")
-                    else:
-                        value = self.config.ANSWERS.get("expected_ctc", "7.0")
-                elif any(keyword in context for keyword in ['experience', 'years']):
-                    value = self.config.ANSWERS.get("total_experience_years", "2")
-                elif 'notice' in context:
-                    value = "30"
-                else:
-                    value = "2"  # Default
-                
-                field.fill(str(value))
-                time.sleep(0.3)
+            rule = self.classifier.classify(field.context, 'number')
+            category = rule.category if rule else None
+            
+            # Determine value based on context
+            if category == 'current_salary':
+                value = self.config.ANSWERS.get("current_ctc", "6.0")
+            elif category == 'expected_salary':
+                value = self.config.ANSWERS.get("expected_ctc", "7.0")
+            elif category == 'experience_years':
+                value = self.config.ANSWERS.get(rule.answer) or self.config.ANSWERS.get("total_experience_years", "2")
+            elif category == 'notice_period':
+                value = "30"
+            else:
+                continue  # Left to the answer engine
+            
+            if self.field_handler.fill(page, field, value):
                 print(f"✓ Filled number input: {value}")
-                
-            except Exception as e:
-                print(f"Error filling number input: {e}")
-                continue
     
-    def _fill_textareas(self, page, modal_selector: str):
+    def _fill_textareas(self, page, fields: List[FieldSnapshot]):
         """Fill textarea fields"""
-        textareas = page.query_selector_all(f"{modal_selector} textarea")
-        
-        for textarea in textareas:
-            if not textarea.is_visible():
+        for textarea in fields:
+            if textarea.tag != 'textarea' or textarea.is_filled:
                 continue
             
-            try:
-                if textarea.input_value() and textarea.input_value().strip():
-                    continue
-                
-                context = self.field_detector.get_field_context(page, textarea).lower()
-                
-                # Provide appropriate text
-                if any(keyword in context for keyword in ['cover letter', 'introduction', 'why you']):
+            category = self.classifier.category(textarea.context, 'textarea')
+            
+            # Provide appropriate text (cover notes are written per job in the background)
+            if category == 'cover_letter':
+                kind = 'why_role' if 'why' in textarea.context.lower() else 'cover_note'
+                text, source = self.cover_notes.lookup(self.job, kind), JOB_TEXT
+            elif category == 'additional_info':
+                text, source = "Thank you for considering my application.", 'rule'
+            else:
+                text = None
+            if not text:
+                continue  # Left to the answer engine
+            
+            if self.field_handler.fill(page, textarea, text, source):
+                print(f"✓ Filled textarea")
+    
+    def _fill_fallbacks(self, page, fields: List[FieldSnapshot]):
+        """
+        Last tier, after the answer engine: placeholder answers for the
+        dropdowns, radio groups, numbers and textareas still empty. They
+        are never remembered (FALLBACK source).
+        """
+        radio_groups: Dict[str, List[FieldSnapshot]] = {}
+        for field in fields:
+            if field.type == 'radio':
+                if field.name:
+                    radio_groups.setdefault(field.name, []).append(field)
+                continue
+            if field.is_filled:
+                continue
+            
+            if field.tag == 'select':
+                # First non-empty option
+                if len(field.options) > 1 and self.field_handler.select(page, field, field.options[1][0], FALLBACK):
+                    print("✓ Selected default dropdown option")
+            elif field.tag == 'textarea':
+                if self.classifier.category(field.context, 'textarea') == 'cover_letter':
                     text = "I am interested in this position and believe my skills and experience make me a strong candidate."
-                elif 'additional' in context or 'comments' in context:
-                    text = "Thank you for considering my application."
                 else:
                     text = "N/A"
-                
-                textarea.fill(text)
-                time.sleep(0.3)
-                print(f"✓ Filled textarea")
-                
-            except Exception as e:
-                print(f"Error filling textarea: {e}")
-                continue
\ No newline at end of file
+                if self.field_handler.fill(page, field, text, FALLBACK):
+                    print("✓ Filled textarea with a placeholder")
+            elif field.tag == 'input' and field.kind == 'number':
+                if self.field_handler.fill(page, field, "2", FALLBACK):
+                    print("✓ Filled number input with default: 2")
+        
+        for radios in radio_groups.values():
+            if not any(radio.checked for radio in radios):
+                if self.field_handler.check(page, radios[0], FALLBACK):
+                    print("✓ Selected first radio button")
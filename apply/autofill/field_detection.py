@@ -1,68 +1,61 @@
-from playwright.sync_api import Page
+from typing import List, Optional
+from .field_snapshot import FieldSnapshot
+
+# LinkedIn form component -> rule field type
+COMPONENT_KINDS = {
+    "single-line-text": "text",
+    "multiline-text": "textarea",
+    "text-entity-list": "select",
+    "radio-button": "radio",
+    "checkbox": "checkbox",
+    "single-typeahead-entity": "text",
+    "date-picker": "text",
+    "document-upload": "file",
+}
+
+# Last part of the easyApplyFormElement id -> (rule field type, None to keep the component's; purpose).
+# Numeric questions are plain text inputs, so only the markup tells them apart.
+ELEMENT_KINDS = {
+    "numeric": ("number", ""),
+    "phoneNumber-nationalNumber": (None, "phone"),
+    "phoneNumber-country": (None, "phone_country"),
+    "email": (None, "email"),
+    "emailAddress": (None, "email"),
+    "firstName": (None, "first_name"),
+    "lastName": (None, "last_name"),
+    "city-HOME-CITY": (None, "city"),
+}
 
 class FieldDetector:
-    """Detects and extracts context from form fields"""
-    
-    @staticmethod
-    def get_field_context(page: Page, field) -> str:
-        """Get surrounding context text for a field"""
-        try:
-            context_parts = []
-            
-            # Get attributes
-            for attr in ['placeholder', 'aria-label', 'aria-describedby']:
-                value = field.get_attribute(attr)
-                if value:
-                    context_parts.append(value)
-            
-            # Get associated label via id
-            field_id = field.get_attribute('id')
-            if field_id:
-                label = page.query_selector(f"label[for='{field_id}']")
-                if label:
-                    context_parts.append(label.inner_text())
-            
-            # Get parent label and nearby text using JavaScript
-            try:
-                nearby_text = field.evaluate("""
-                    el => {
-                        let text = '';
-                        
-                        // Get parent label text
-                        const parentLabel = el.closest('label');
-                        if (parentLabel) text += parentLabel.innerText || '';
-                        
-                        // Get previous sibling text
-                        if (el.previousElementSibling) {
-                            text += ' ' + (el.previousElementSibling.innerText || '');
-                        }
-                        
-                        // Get parent text excluding children
-                        if (el.parentElement) {
-                            const parentClone = el.parentElement.cloneNode(true);
-                            const fieldClone = parentClone.querySelector(`[id="${el.id}"]`);
-                            if (fieldClone) fieldClone.remove();
-                            text += ' ' + (parentClone.innerText || '');
-                        }
-                        
-                        return text.trim();
-                    }
-                """)
-                if nearby_text:
-                    context_parts.append(nearby_text)
-            except:
-                pass
-            
-            return ' '.join(context_parts).strip()
-        except:
-            return ""
+    """Classifies snapshot fields from LinkedIn's form-component markup"""
 
     @staticmethod
-    def analyze_field_type(field):
-        """Analyze field type and tag"""
-        try:
-            field_type = field.get_attribute('type') or ''
-            tag_name = field.evaluate("el => el.tagName.toLowerCase()")
-            return tag_name, field_type.lower()
-        except:
-            return 'unknown', 'unknown'
\ No newline at end of file
+    def structural_kind(field: FieldSnapshot) -> Optional[tuple]:
+        """(field type, purpose) read from the component markup, or None without it"""
+        if not field.component and not field.element_kind:
+            return None
+        kind = COMPONENT_KINDS.get(field.component)
+        element_kind, purpose = ELEMENT_KINDS.get(field.element_kind, (None, ""))
+        kind = element_kind or kind
+        if kind is None and not purpose:
+            return None
+        # The element itself has the last word (an email select, a radio inside a list component)
+        if field.tag in ("select", "textarea"):
+            kind = field.tag
+        elif field.type in ("radio", "checkbox", "file"):
+            kind = field.type
+        return kind or field.kind, purpose
+
+    def classify(self, fields: List[FieldSnapshot]) -> int:
+        """
+        Set ``kind`` and ``purpose`` of each field from its markup; fields
+        outside LinkedIn's components keep the kind derived from tag/type
+        and are left to the text heuristics. Returns how many had markup.
+        """
+        structural = 0
+        for field in fields:
+            found = self.structural_kind(field)
+            if found is not None:
+                field.kind, field.purpose = found
+                structural += 1
+        return structural
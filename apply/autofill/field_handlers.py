@@ -1,74 +1,68 @@
-import time
 from typing import Dict
+from .field_snapshot import FieldSnapshot
+from .fill_plan import FillPlan
 
 class FieldHandler:
     """Handles different types of form fields"""
     
     def __init__(self, config):
         self.config = config
+        self.plan = FillPlan()
     
-    def handle_ctc_field(self, field, context_text: str, is_current: bool = True):
+    def begin_plan(self) -> FillPlan:
+        """Start collecting writes for a new step"""
+        self.plan = FillPlan()
+        return self.plan
+    
+    def apply_plan(self, page) -> Dict[str, bool]:
+        """Apply the collected writes in one call; returns field id -> success"""
+        return self.plan.execute(page)
+    
+    def fill(self, page, field: FieldSnapshot, value: str, source: str = 'rule') -> bool:
+        """Plan a value for a text/number/textarea field"""
+        self.plan.add(field, 'typeahead' if field.is_typeahead else 'fill', value, source)
+        field.value = str(value)
+        return True
+    
+    def select(self, page, field: FieldSnapshot, option_value: str, source: str = 'rule') -> bool:
+        """Plan a dropdown option by its value attribute"""
+        self.plan.add(field, 'select', option_value, source)
+        field.value = option_value
+        return True
+    
+    def check(self, page, field: FieldSnapshot, source: str = 'rule') -> bool:
+        """Plan checking a radio button or checkbox"""
+        self.plan.add(field, 'check', source=source)
+        field.checked = True
+        return True
+    
+    def handle_ctc_field(self, page, field: FieldSnapshot, context_text: str, is_current: bool = True):
         """Handle CTC/Salary fields"""
-        try:
-            if is_current:
-                value = self._get_current_ctc_value(context_text)
-            else:
-                value = self._get_expected_ctc_value(context_text)
-            
-            field.fill(str(value))
-            time.sleep(0.3)
+        if is_current:
+            value = self._get_current_ctc_value(context_text)
+        else:
+            value = self._get_expected_ctc_value(context_text)
+        
+        if self.fill(page, field, value):
             print(f"✓ Filled {'current' if is_current else 'expected'} CTC: {value}")
-        except Exception as e:
-            print(f"Error filling CTC field: {e}")
     
-    def handle_experience_field(self, field, context_text: str):
-        """Handle experience years fields"""
-        try:
-            # Technology-specific experience
-            tech_mappings = {
-                'python': 'experience_python',
-                'javascript': 'experience_javascript',
-                'react': 'experience_react',
-                'node': 'experience_nodejs',
-                'sql': 'experience_sql',
-                'mongodb': 'experience_mongodb',
-                '.net': 'experience_dotnet',
-                'aws': 'experience_aws',
-                'docker': 'experience_docker',
-                'typescript': 'experience_typescript',
-            }
-            
-            for tech, answer_key in tech_mappings.items():
-                if tech in context_text:
-                    value = self.config.ANSWERS.get(answer_key, "2")
-                    field.fill(str(value))
-                    time.sleep(0.3)
-                    print(f"✓ Filled {tech} experience: {value}")
-                    return
-            
-            # Default to total experience
-            value = self.config.ANSWERS.get("total_experience_years", "2")
-            field.fill(str(value))
-            time.sleep(0.3)
-            print(f"✓ Filled experience: {value}")
-        except Exception as e:
-            print(f"Error filling experience field: {e}")
+    def handle_experience_field(self, page, field: FieldSnapshot, answer_key: str, topic: str = ""):
+        """Handle experience years fields (answer key comes from the question rules)"""
+        value = self.config.ANSWERS.get(answer_key) or self.config.ANSWERS.get("total_experience_years", "2")
+        if self.fill(page, field, value):
+            print(f"✓ Filled {topic + ' ' if topic else ''}experience: {value}")
     
-    def handle_notice_period_field(self, field):
+    def handle_notice_period_field(self, page, field: FieldSnapshot):
         """Handle notice period fields"""
-        try:
-            value = self.config.ANSWERS.get("notice_period", "30 days")
-            tag_name = field.evaluate("el => el.tagName.toLowerCase()")
-            
-            if tag_name == 'select':
-                self._select_notice_period_option(field, value)
-            else:
-                field.fill(value)
-            
-            time.sleep(0.3)
+        value = self.config.ANSWERS.get("notice_period", "30 days")
+        
+        if field.tag == 'select':
+            done = self._select_notice_period_option(page, field)
+        else:
+            done = self.fill(page, field, value)
+        
+        if done:
             print(f"✓ Filled notice period: {value}")
-        except Exception as e:
-            print(f"Error filling notice period: {e}")
     
     def _get_current_ctc_value(self, context_text: str) -> str:
         """Get current CTC value based on context"""
@@ -82,19 +76,12 @@ class FieldHandler:
             return self.config.ANSWERS.get("expected_ctc", "7.0")
         return self.config.ANSWERS.get("expected_salary", "700000")
     
-    def _select_notice_period_option(self, select_field, value: str):
+    def _select_notice_period_option(self, page, field: FieldSnapshot) -> bool:
         """Select notice period in dropdown"""
-        options = ["30 days", "1 month", "Immediate", "15 days"]
-        
-        for option in options:
-            try:
-                select_field.select_option(label=option)
-                return
-            except:
-                continue
+        for option in ["30 days", "1 month", "Immediate", "15 days"]:
+            option_value = field.find_option(option)
+            if option_value is not None:
+                return self.select(page, field, option_value)
         
-        # Fallback to first available option
-        try:
-            select_field.select_option(index=1)
-        except:
-            pass
\ No newline at end of file
+        # No known option: left to the answer engine and the fallback tier
+        return False
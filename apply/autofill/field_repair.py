@@ -0,0 +1,98 @@
+import re
+from playwright.sync_api import Page
+from typing import Dict, List, Optional
+from .field_snapshot import HANDLE_ATTRIBUTE, MODAL_SELECTOR, FieldSnapshot
+
+# Repair strategies, one per attempt: a fix derived from the error message, then the answer engine
+STRATEGIES = ("coerce", "ask")
+
+# Every visible inline error -> the field it belongs to (by its snapshot handle)
+_INVALID_FIELDS_JS = """
+({rootSelector, handleAttr}) => {
+    const root = document.querySelector(rootSelector) || document;
+    const visible = (el) => !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+    const FIELDS = 'input:not([type="hidden"]), select, textarea';
+    const found = [];
+    root.querySelectorAll('.artdeco-inline-feedback--error').forEach(err => {
+        const message = (err.innerText || '').replace(/\\s+/g, ' ').trim();
+        if (!visible(err) || !message) return;
+        // Inputs point at their feedback with aria-describedby; else take the question's container
+        let field = null;
+        for (let node = err, depth = 0; node && node !== root && depth < 4 && !field; node = node.parentElement, depth++) {
+            if (node.id) field = root.querySelector(`[aria-describedby~="${CSS.escape(node.id)}"]`);
+        }
+        if (!field) {
+            const box = err.closest('[data-test-form-element], .jobs-easy-apply-form-element, .fb-dash-form-element, fieldset');
+            field = box && box.querySelector(FIELDS);
+        }
+        const handle = field && field.getAttribute(handleAttr);
+        if (handle) found.push({id: handle, message: message});
+    });
+    return found;
+}
+"""
+
+_NUMBER = r"-?\d+(?:\.\d+)?"
+
+def invalid_fields(page: Page, fields: List[FieldSnapshot]) -> Dict[str, str]:
+    """
+    Field id -> validation message for every field the step rejected:
+    those with an inline error plus required fields that are still empty
+    """
+    try:
+        raw = page.evaluate(_INVALID_FIELDS_JS, {"rootSelector": MODAL_SELECTOR, "handleAttr": HANDLE_ATTRIBUTE}) or []
+    except Exception as e:
+        print(f"Could not map validation errors to fields: {e}")
+        raw = []
+    invalid = {item["id"]: item["message"] for item in raw}
+
+    for field in fields:
+        if not field.required or field.id in invalid or field.type in ("file", "hidden"):
+            continue
+        if field.type == "radio":
+            group = [r for r in fields if r.type == "radio" and r.name == field.name]
+            if any(r.checked or r.id in invalid for r in group):
+                continue
+        elif field.is_filled:
+            continue
+        invalid[field.id] = "required"
+    return invalid
+
+def coerce_value(field: FieldSnapshot, message: str, config) -> Optional[str]:
+    """
+    A corrected value read off the validation message ("Enter a whole
+    number between 0 and 99", "Enter a valid phone number", a length limit),
+    or None when the message gives nothing to go on
+    """
+    text = message.lower()
+    current = field.value or ""
+
+    if field.purpose == "phone" or "phone" in text:
+        digits = re.sub(r"\D", "", config.PHONE or current)
+        # National number only; the country code has its own dropdown
+        return digits[-10:] or None
+    if field.purpose == "email" or "email" in text:
+        return config.EMAIL or None
+
+    if field.kind == "number" or any(word in text for word in ("number", "decimal", "numeric")):
+        found = re.search(_NUMBER, current.replace(",", ""))
+        value = float(found.group()) if found else float(config.ANSWERS.get("total_experience_years", "2"))
+        bounds = [float(n) for n in re.findall(_NUMBER, text)]
+        if "between" in text and len(bounds) >= 2:
+            value = min(max(value, bounds[0]), bounds[1])
+        elif bounds and any(word in text for word in ("larger", "greater", "more than", "at least")):
+            value = max(value, bounds[0] + (0 if "at least" in text else 1))
+        elif bounds and any(word in text for word in ("less", "smaller", "at most", "maximum")):
+            value = min(value, bounds[0])
+        whole = "whole" in text or "integer" in text or value.is_integer()
+        return str(int(round(value))) if whole else f"{value:g}"
+
+    if "character" in text and current:
+        limit = re.search(r"\d+", text)
+        return current[:int(limit.group())].rstrip() if limit else None
+
+    if field.is_typeahead:
+        # Broader suggestions: just the first word of the place
+        place = (current or config.LOCATION).split(",")[0].split()
+        return place[0] if place else None
+    return None
@@ -0,0 +1,224 @@
+from playwright.sync_api import Page
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from option_matcher import best_option
+from question_rules import field_kind
+
+MODAL_SELECTOR = "div.jobs-easy-apply-modal, div[role='dialog']"
+
+# Attribute used as a stable handle; ids survive re-snapshots of the same step
+HANDLE_ATTRIBUTE = "data-jb-field"
+
+_SNAPSHOT_JS = """
+({rootSelector, handleAttr}) => {
+    const clean = (s) => (s || '').replace(/\\s+/g, ' ').trim();
+    const textOf = (node) => node ? clean(node.innerText || node.textContent) : '';
+
+    const roots = Array.from(document.querySelectorAll(rootSelector));
+    const seen = new Set();
+    const elements = [];
+    for (const root of (roots.length ? roots : [document])) {
+        for (const el of root.querySelectorAll('input, textarea, select')) {
+            if (!seen.has(el)) { seen.add(el); elements.push(el); }
+        }
+    }
+
+    const isVisible = (el) => {
+        if (el.type === 'hidden') return false;
+        const style = getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') return false;
+        return el.getClientRects().length > 0;
+    };
+
+    // Text of the parent without the field itself (no cloneNode needed)
+    const parentText = (el) => {
+        const parent = el.parentElement;
+        if (!parent) return '';
+        const parts = [];
+        for (const child of parent.childNodes) {
+            if (child === el) continue;
+            parts.push(child.nodeType === Node.TEXT_NODE ? child.textContent : (child.innerText || child.textContent || ''));
+        }
+        return clean(parts.join(' '));
+    };
+
+    // LinkedIn wraps every question in a typed form component ("data-test-<type>-form-component",
+    // ids like "<type>-form-component-formElement-urn-li-jobs-applyformcommon-easyApplyFormElement-<job>-<question>-<kind>")
+    const COMPONENT_RE = /(single-line-text|multiline-text|text-entity-list|radio-button|checkbox|single-typeahead-entity|date-picker|document-upload)-form-component/;
+    const ELEMENT_RE = /easyApplyFormElement[-:(]+\\d+[-,](\\d+)[-,]([A-Za-z][\\w-]*)/;
+    const structureOf = (el) => {
+        let component = '', match = null;
+        for (let node = el, depth = 0; node && node.getAttributeNames && depth < 8; node = node.parentElement, depth++) {
+            const marks = [node.id, typeof node.className === 'string' ? node.className : '',
+                           ...node.getAttributeNames().filter(a => a.startsWith('data-test'))].join(' ');
+            if (!match) match = (node.id || '').match(ELEMENT_RE);
+            if (!component) {
+                const found = marks.match(COMPONENT_RE);
+                if (found) component = found[1];
+            }
+            if (component && match) break;
+        }
+        return {component: component, question_id: match ? match[1] : '', element_kind: match ? match[2] : ''};
+    };
+
+    const idText = (ids) => clean((ids || '').split(/\\s+/)
+        .map(id => id && document.getElementById(id)).filter(Boolean).map(textOf).join(' '));
+
+    window.__jbFieldSeq = window.__jbFieldSeq || 0;
+
+    return elements.map(el => {
+        let handle = el.getAttribute(handleAttr);
+        if (!handle) {
+            handle = String(++window.__jbFieldSeq);
+            el.setAttribute(handleAttr, handle);
+        }
+
+        const tag = el.tagName.toLowerCase();
+        const type = (el.getAttribute('type') || '').toLowerCase();
+        const labels = el.labels ? Array.from(el.labels).map(textOf).filter(Boolean) : [];
+        const label = labels[0] || clean(el.getAttribute('aria-label')) || clean(el.getAttribute('placeholder'));
+
+        const fieldset = el.closest('fieldset');
+        const legend = fieldset ? textOf(fieldset.querySelector('legend')) : '';
+        const parentLabel = el.closest('label');
+
+        const context = clean([
+            legend,
+            el.getAttribute('placeholder'),
+            el.getAttribute('aria-label'),
+            idText(el.getAttribute('aria-describedby')),
+            labels.join(' '),
+            parentLabel ? textOf(parentLabel) : '',
+            el.previousElementSibling ? textOf(el.previousElementSibling) : '',
+            parentText(el),
+        ].filter(Boolean).join(' '));
+
+        // What is being asked: the group legend for radios/checkboxes, else the label
+        const choice = type === 'radio' || type === 'checkbox';
+        const question = choice ? (legend || context.slice(0, 200)) : (label || context.slice(0, 200));
+
+        return {
+            ...structureOf(el),
+            id: handle,
+            tag: tag,
+            type: type,
+            name: el.getAttribute('name') || '',
+            html_id: el.id || '',
+            placeholder: el.getAttribute('placeholder') || '',
+            label: label,
+            question: question,
+            context: context,
+            options: tag === 'select' ? Array.from(el.options).map(o => [o.value, clean(o.text)]) : [],
+            value: el.value || '',
+            checked: !!el.checked,
+            required: !!el.required || el.getAttribute('aria-required') === 'true',
+            visible: isVisible(el),
+            // Autocomplete inputs only take a value picked from their suggestion list
+            combobox: el.getAttribute('role') === 'combobox' || el.getAttribute('aria-autocomplete') === 'list'
+        };
+    });
+}
+"""
+
+class FieldSnapshot:
+    """One form field as seen by a single snapshot evaluate"""
+
+    __slots__ = ("id", "tag", "type", "name", "html_id", "placeholder", "label", "question", "context",
+                 "options", "value", "checked", "required", "visible", "component", "question_id",
+                 "element_kind", "combobox", "kind", "purpose")
+
+    def __init__(self, id: str, tag: str, type: str = "", name: str = "", html_id: str = "",
+                 placeholder: str = "", label: str = "", question: str = "", context: str = "",
+                 options: Optional[List[Tuple[str, str]]] = None, value: str = "",
+                 checked: bool = False, required: bool = False, visible: bool = True,
+                 component: str = "", question_id: str = "", element_kind: str = "", combobox: bool = False):
+        self.id = id
+        self.tag = tag
+        self.type = type
+        self.name = name
+        self.html_id = html_id
+        self.placeholder = placeholder
+        self.label = label
+        self.question = question or label
+        self.context = context
+        self.options = [tuple(o) for o in (options or [])]
+        self.value = value
+        self.checked = checked
+        self.required = required
+        self.visible = visible
+        # LinkedIn form-component markup, if any (see field_detection.FieldDetector)
+        self.component = component
+        self.question_id = question_id
+        self.element_kind = element_kind
+        self.combobox = combobox
+        # Rule field type and, for contact fields, what is asked; set by FieldDetector.classify
+        self.kind = field_kind(tag, type)
+        self.purpose = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FieldSnapshot":
+        return cls(**{key: data[key] for key in cls.__slots__ if key in data})
+
+    @property
+    def selector(self) -> str:
+        return f"[{HANDLE_ATTRIBUTE}='{self.id}']"
+
+    def locator(self, page: Page):
+        return page.locator(self.selector)
+
+    @property
+    def is_choice(self) -> bool:
+        return self.type in ("radio", "checkbox")
+
+    @property
+    def is_typeahead(self) -> bool:
+        """Filled by typing and picking a suggestion (see typeahead.fill_typeahead)"""
+        return self.component == "single-typeahead-entity" or (self.combobox and self.tag == "input")
+
+    @property
+    def is_filled(self) -> bool:
+        """Same rule the old per-element checks used"""
+        if self.is_choice:
+            return self.checked
+        return bool(self.value and self.value.strip())
+
+    @property
+    def option_texts(self) -> List[str]:
+        return [text.lower() for _, text in self.options]
+
+    def option_text(self, value: str) -> Optional[str]:
+        """Text of the option with the given value"""
+        for option_value, text in self.options:
+            if option_value == value:
+                return text
+        return None
+
+    def find_option(self, label: str) -> Optional[str]:
+        """Value of the option whose text equals ``label`` (case-insensitive)"""
+        wanted = label.strip().lower()
+        for value, text in self.options:
+            if text.lower() == wanted:
+                return value
+        return None
+
+    def match_option(self, answers: Union[str, Iterable[str]], min_score: float = 0.6) -> Optional[str]:
+        """Value of the option that best fits the answers (synonyms, numeric ranges, fuzzy text)"""
+        # Placeholders ("Select an option") have an empty value and never count
+        choices = [(value, text) for value, text in self.options if value]
+        found = best_option(answers, [text for _, text in choices], min_score)
+        return choices[found[0]][0] if found else None
+
+    def __repr__(self):
+        return f"FieldSnapshot({self.id}, {self.tag}/{self.type}, {self.label[:40]!r}, value={self.value!r})"
+
+def take_snapshot(page: Page, root_selector: str = MODAL_SELECTOR) -> List[FieldSnapshot]:
+    """
+    Snapshot every input/textarea/select under ``root_selector`` with one
+    ``page.evaluate``: attributes, resolved label/context, options and
+    current value. Each element is tagged with a stable handle id.
+    """
+    try:
+        raw = page.evaluate(_SNAPSHOT_JS, {"rootSelector": root_selector, "handleAttr": HANDLE_ATTRIBUTE})
+    except Exception as e:
+        print(f"Error taking form snapshot: {e}")
+        return []
+    return [FieldSnapshot.from_dict(item) for item in raw or []]
@@ -0,0 +1,127 @@
+import time
+from playwright.sync_api import Page
+from typing import Dict
+from .field_snapshot import HANDLE_ATTRIBUTE, FieldSnapshot
+from .typeahead import fill_typeahead
+
+_APPLY_PLAN_JS = """
+({ops, handleAttr}) => {
+    const fire = (el, type) => el.dispatchEvent(new Event(type, {bubbles: true}));
+    const blur = (el) => {
+        el.dispatchEvent(new FocusEvent('blur'));
+        el.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+    };
+    // Native setters so framework value trackers (React/Ember) see the change
+    const setNative = (el, value) => {
+        const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+                    : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+                    : HTMLInputElement.prototype;
+        const setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+        setter.call(el, value);
+    };
+
+    return ops.map(op => {
+        const el = document.querySelector(`[${handleAttr}="${op.id}"]`);
+        if (!el) return {id: op.id, ok: false, error: 'element not found'};
+        try {
+            if (el.disabled || el.readOnly) return {id: op.id, ok: false, error: 'field is disabled'};
+            el.focus();
+            if (op.action === 'check') {
+                // A real click runs the page's own handlers and fires input/change
+                if (!el.checked) el.click();
+                if (!el.checked) { el.checked = true; fire(el, 'input'); fire(el, 'change'); }
+                blur(el);
+                return {id: op.id, ok: el.checked};
+            }
+            if (op.action === 'select' &&
+                !Array.from(el.options || []).some(o => o.value === op.value)) {
+                return {id: op.id, ok: false, error: 'option not found'};
+            }
+            setNative(el, op.value);
+            fire(el, 'input');
+            fire(el, 'change');
+            blur(el);
+            return {id: op.id, ok: el.value === op.value, error: el.value === op.value ? '' : 'value not kept'};
+        } catch (e) {
+            return {id: op.id, ok: false, error: String(e)};
+        }
+    });
+}
+"""
+
+class FillPlan:
+    """Field writes decided for one step, applied together in one page call"""
+
+    def __init__(self):
+        self.ops: Dict[str, Dict] = {}
+        self.fields: Dict[str, FieldSnapshot] = {}
+        self.sources: Dict[str, str] = {}
+
+    def __len__(self):
+        return len(self.ops)
+
+    def add(self, field: FieldSnapshot, action: str, value: str = "", source: str = "rule"):
+        """Queue a write; a later decision for the same field replaces the earlier one"""
+        self.ops.pop(field.id, None)
+        self.ops[field.id] = {"id": field.id, "action": action, "value": str(value)}
+        self.fields[field.id] = field
+        self.sources[field.id] = source
+
+    def execute(self, page: Page) -> Dict[str, bool]:
+        """
+        Apply every queued write with one ``page.evaluate`` and return the
+        per-field result. Fields the batch could not set are retried one by
+        one through Playwright (slow path). Typeaheads are typed afterwards,
+        one at a time, since each needs its suggestion list picked from.
+        """
+        if not self.ops:
+            return {}
+
+        ops = [op for op in self.ops.values() if op["action"] != "typeahead"]
+        typeaheads = [op for op in self.ops.values() if op["action"] == "typeahead"]
+        raw = []
+        if ops:
+            try:
+                raw = page.evaluate(_APPLY_PLAN_JS, {"ops": ops, "handleAttr": HANDLE_ATTRIBUTE}) or []
+            except Exception as e:
+                print(f"Batch fill failed, falling back to per-field writes: {e}")
+
+        results = {item["id"]: bool(item.get("ok")) for item in raw}
+        errors = {item["id"]: item.get("error") for item in raw if not item.get("ok")}
+
+        failed = [op for op in ops if not results.get(op["id"])]
+        for op in failed:
+            field = self.fields[op["id"]]
+            reason = errors.get(op["id"]) or "not applied"
+            print(f"  ↻ Retrying {field.label or field.name or field.id} ({reason})")
+            results[op["id"]] = self._write_slow(page, field, op)
+
+        for op in typeaheads:
+            field = self.fields[op["id"]]
+            committed = fill_typeahead(page, field, op["value"])
+            results[op["id"]] = committed is not None
+            # The snapshot holds what the page actually kept ("Amritsar, Punjab, India")
+            field.value = committed or ""
+
+        ok = sum(1 for value in results.values() if value)
+        print(f"✓ Applied {ok}/{len(self.ops)} field writes in one call"
+              + (f" ({len(failed)} retried individually)" if failed else "")
+              + (f" + {len(typeaheads)} typeahead(s)" if typeaheads else ""))
+        return results
+
+    @staticmethod
+    def _write_slow(page: Page, field: FieldSnapshot, op: Dict) -> bool:
+        """Per-field Playwright write, used only for fields the batch missed"""
+        try:
+            locator = field.locator(page)
+            if op["action"] == "check":
+                locator.check()
+            elif op["action"] == "select":
+                locator.select_option(value=op["value"])
+            else:
+                locator.fill(op["value"])
+            time.sleep(0.3)
+            return True
+        except Exception as e:
+            print(f"  ✗ Could not set {field.label or field.name or field.id}: {e}")
+            return False
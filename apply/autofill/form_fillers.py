@@ -1,5 +1,6 @@
-import time
-from typing import List
+from typing import Dict, List
+from .field_snapshot import FieldSnapshot
+from question_rules import get_classifier
 
 class FormFiller:
     """Fills different types of form fields"""
@@ -7,224 +8,162 @@ class FormFiller:
     def __init__(self, config, field_handler):
         self.config = config
         self.field_handler = field_handler
+        self.classifier = get_classifier()
     
-    def fill_text_fields(self, page, modal_selector: str):
+    def fill_text_fields(self, page, fields: List[FieldSnapshot]):
         """Fill standard text fields (name, email, phone, location)"""
         field_mappings = {
             'name': {
-                'selectors': [
-                    f"{modal_selector} input[name*='name' i]",
-                    f"{modal_selector} input[id*='name' i]",
-                    f"{modal_selector} input[placeholder*='name' i]",
-                ],
+                'match': lambda f: self._attr_contains(f, 'name', placeholder=True),
                 'value': self.config.FULL_NAME,
                 'exclude_keywords': ['company', 'organization']
             },
             'email': {
-                'selectors': [
-                    f"{modal_selector} input[type='email']",
-                    f"{modal_selector} input[name*='email' i]",
-                    f"{modal_selector} input[id*='email' i]",
-                ],
+                'match': lambda f: f.type == 'email' or self._attr_contains(f, 'email'),
                 'value': self.config.EMAIL
             },
             'phone': {
-                'selectors': [
-                    f"{modal_selector} input[type='tel']",
-                    f"{modal_selector} input[name*='phone' i]",
-                    f"{modal_selector} input[id*='phone' i]",
-                ],
+                'match': lambda f: f.type == 'tel' or self._attr_contains(f, 'phone'),
                 'value': self.config.PHONE
             },
             'location': {
-                'selectors': [
-                    f"{modal_selector} input[name*='location' i]",
-                    f"{modal_selector} input[id*='location' i]",
-                    f"{modal_selector} input[placeholder*='location' i]",
-                    f"{modal_selector} input[name*='city' i]",
-                ],
+                'match': lambda f: (self._attr_contains(f, 'location', placeholder=True)
+                                    or 'city' in f.name.lower()),
                 'value': self.config.LOCATION
             }
         }
         
+        # Fields whose markup says what they ask need no matching
+        first_name, _, last_name = self.config.FULL_NAME.partition(' ')
+        by_purpose = {
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': self.config.EMAIL,
+            'phone': self.config.PHONE,
+            'city': self.config.LOCATION,
+        }
+        for field in fields:
+            value = by_purpose.get(field.purpose)
+            if field.tag == 'input' and value and not field.is_filled:
+                if self.field_handler.fill(page, field, value):
+                    print(f"✓ Filled {field.purpose.replace('_', ' ')}")
+        
+        # Text heuristics for the rest
+        inputs = [f for f in fields if f.tag == 'input' and not f.is_choice and not f.purpose and f.kind != 'number']
         for field_type, mapping in field_mappings.items():
-            self._fill_field_by_selectors(page, mapping['selectors'], 
-                                         mapping['value'], 
-                                         mapping.get('exclude_keywords', []))
+            self._fill_first_match(page, inputs, field_type, mapping['match'],
+                                   mapping['value'], mapping.get('exclude_keywords', []))
     
-    def fill_dropdowns(self, page, modal_selector: str, field_detector):
+    def fill_dropdowns(self, page, fields: List[FieldSnapshot]):
         """Fill all dropdown/select fields"""
-        selects = page.query_selector_all(f"{modal_selector} select")
-        
-        for select in selects:
-            if not select.is_visible():
+        for select in fields:
+            if select.tag != 'select' or select.is_filled:
                 continue
             
-            try:
-                # Skip already-filled selects
-                current_value = select.evaluate("el => el.value")
-                if current_value and current_value != "":
+            # Phone country code / contact email selects, known from the markup
+            if select.purpose in ('phone_country', 'email'):
+                wanted = self.config.EMAIL if select.purpose == 'email' else self.config.LOCATION.split(',')[-1]
+                option_value = select.match_option(wanted.strip()) if wanted.strip() else None
+                if option_value is not None and self.field_handler.select(page, select, option_value):
+                    print(f"✓ Selected {select.purpose.replace('_', ' ')}")
                     continue
-                
-                # Get context and options
-                context = field_detector.get_field_context(page, select).lower()
-                options = select.query_selector_all("option")
-                option_texts = [o.inner_text().strip().lower() for o in options]
-                
-                # Handle based on context
-                if self._handle_special_dropdowns(select, context, option_texts):
-                    continue
-                
-                # Default: pick first non-empty option
-                if len(options) > 1:
-                    try:
-                        select.select_option(index=1)
-                        print("✓ Selected default dropdown option")
-                    except:
-                        pass
-                
-                time.sleep(0.3)
-                
-            except Exception as e:
-                print(f"Error filling dropdown: {e}")
-                continue
+            
+            context = select.context.lower()
+            
+            # Handle based on context; the rest go to the answer engine, then the fallback tier
+            self._handle_special_dropdowns(page, select, context, select.option_texts)
     
-    def fill_radio_checkboxes(self, page, modal_selector: str, field_detector):
+    def fill_radio_checkboxes(self, page, fields: List[FieldSnapshot]):
         """Fill radio buttons and checkboxes"""
-        self._fill_radio_buttons(page, modal_selector, field_detector)
-        self._fill_checkboxes(page, modal_selector, field_detector)
+        self._fill_radio_buttons(page, fields)
+        self._fill_checkboxes(page, fields)
+    
+    @staticmethod
+    def _attr_contains(field: FieldSnapshot, keyword: str, placeholder: bool = False) -> bool:
+        """Equivalent of [name*=kw i], [id*=kw i] (and optionally [placeholder*=kw i])"""
+        attrs = [field.name, field.html_id] + ([field.placeholder] if placeholder else [])
+        return any(keyword in attr.lower() for attr in attrs)
     
-    def _fill_field_by_selectors(self, page, selectors: List[str], value: str, 
-                                exclude_keywords: List[str] = []):
-        """Fill field by trying multiple selectors"""
-        for selector in selectors:
-            try:
-                fields = page.query_selector_all(selector)
-                for field in fields:
-                    if field.is_visible() and not field.input_value():
-                        # Check if field should be excluded
-                        context = field.evaluate("""
-                            el => {
-                                let text = '';
-                                if (el.labels) {
-                                    for (let label of el.labels) {
-                                        text += label.textContent + ' ';
-                                    }
-                                }
-                                return text.toLowerCase();
-                            }
-                        """) or ""
-                        
-                        should_exclude = any(keyword in context for keyword in exclude_keywords)
-                        if not should_exclude:
-                            field.fill(value)
-                            time.sleep(0.3)
-                            print(f"✓ Filled {selector.split('[')[0]}")
-                            return
-            except:
+    def _fill_first_match(self, page, inputs: List[FieldSnapshot], field_type: str, match,
+                          value: str, exclude_keywords: List[str] = []):
+        """Fill the first empty input the mapping matches"""
+        for field in inputs:
+            if field.is_filled or not match(field):
+                continue
+            
+            # Check if field should be excluded (label text only)
+            label_text = field.label.lower()
+            if any(keyword in label_text for keyword in exclude_keywords):
                 continue
+            
+            if self.field_handler.fill(page, field, value):
+                print(f"✓ Filled {field_type}")
+            return
+    
+    def _select_label(self, page, select: FieldSnapshot, label) -> bool:
+        """Select the option that best fits ``label`` (or a list of acceptable answers)"""
+        option_value = select.match_option(label)
+        if option_value is None:
+            return False
+        return self.field_handler.select(page, select, option_value)
     
-    def _handle_special_dropdowns(self, select, context: str, option_texts: List[str]) -> bool:
+    def _handle_special_dropdowns(self, page, select: FieldSnapshot, context: str, option_texts: List[str]) -> bool:
         """Handle special dropdown cases"""
         # Yes/No handling
         if any(opt in option_texts for opt in ["yes", "no"]):
-            try:
-                select.select_option(label="Yes")
+            if self._select_label(page, select, "Yes"):
                 print("✓ Selected 'Yes' for Yes/No dropdown")
                 return True
-            except:
-                pass
         
-        # Notice period
-        if any(k in context for k in ["notice", "availability"]):
-            try:
-                select.select_option(label="30 days")
-                print("✓ Selected notice period = 30 days")
+        category = self.classifier.category(context, 'select')
+        
+        # Notice period ("1 month", "0-30 days", ... are matched by range)
+        if category == 'notice_period':
+            notice = self.config.ANSWERS.get("notice_period", "30 days")
+            if self._select_label(page, select, notice):
+                print(f"✓ Selected notice period = {notice}")
                 return True
-            except:
-                pass
         
-        # Experience
-        if any(k in context for k in ["experience", "years"]):
-            try:
-                select.select_option(label="2")
-                print("✓ Selected experience = 2 years")
+        # Experience ("1-3 years", "2+ years", ...)
+        if category == 'experience_years':
+            years = self.config.ANSWERS.get("total_experience_years", "2")
+            if self._select_label(page, select, [f"{years} years", years]):
+                print(f"✓ Selected experience = {years} years")
                 return True
-            except:
-                pass
         
         # Work authorization
-        if any(k in context for k in ["authorization", "work permit", "visa"]):
-            try:
-                select.select_option(label="Yes")
+        if category == 'work_auth':
+            if self._select_label(page, select, "Yes"):
                 print("✓ Selected work authorization = Yes")
                 return True
-            except:
-                pass
         
         return False
     
-    def _fill_radio_buttons(self, page, modal_selector: str, field_detector):
+    def _fill_radio_buttons(self, page, fields: List[FieldSnapshot]):
         """Fill radio button groups"""
-        radio_groups = {}
-        radios = page.query_selector_all(f"{modal_selector} input[type='radio']")
-        
-        for radio in radios:
-            if not radio.is_visible():
-                continue
-            
-            name = radio.get_attribute('name')
-            if not name:
-                continue
-            
-            if name not in radio_groups:
-                radio_groups[name] = []
-            radio_groups[name].append(radio)
+        radio_groups: Dict[str, List[FieldSnapshot]] = {}
+        for radio in fields:
+            if radio.type == 'radio' and radio.name:
+                radio_groups.setdefault(radio.name, []).append(radio)
         
         # Process each radio group
         for group_name, radios in radio_groups.items():
-            try:
-                if any(radio.is_checked() for radio in radios):
-                    continue
-                
-                # Try to select "Yes" if available
-                for radio in radios:
-                    radio_context = field_detector.get_field_context(page, radio).lower()
-                    if 'yes' in radio_context:
-                        radio.check()
-                        time.sleep(0.2)
-                        print(f"✓ Selected Yes radio button")
-                        break
-                else:
-                    # Default: select first option
-                    radios[0].check()
-                    time.sleep(0.2)
-                    print(f"✓ Selected radio button")
-                    
-            except Exception as e:
-                print(f"Error with radio group: {e}")
+            if any(radio.checked for radio in radios):
                 continue
+            
+            # Try to select "Yes" if available (else the answer engine decides)
+            for radio in radios:
+                if 'yes' in (radio.label or radio.context).lower():
+                    if self.field_handler.check(page, radio):
+                        print(f"✓ Selected Yes radio button")
+                    break
     
-    def _fill_checkboxes(self, page, modal_selector: str, field_detector):
+    def _fill_checkboxes(self, page, fields: List[FieldSnapshot]):
         """Fill checkboxes (consent/agreement)"""
-        checkboxes = page.query_selector_all(f"{modal_selector} input[type='checkbox']")
-        
-        for checkbox in checkboxes:
-            if not checkbox.is_visible():
+        for checkbox in fields:
+            if checkbox.type != 'checkbox' or checkbox.checked:
                 continue
             
-            try:
-                if checkbox.is_checked():
-                    continue
-                
-                context = field_detector.get_field_context(page, checkbox).lower()
-                consent_keywords = ['agree', 'consent', 'terms', 'privacy', 'understand']
-                
-                if any(keyword in context for keyword in consent_keywords):
-                    checkbox.check()
-                    time.sleep(0.2)
+            if self.classifier.category(checkbox.context, 'checkbox') == 'consent':
+                if self.field_handler.check(page, checkbox):
                     print(f"✓ Checked agreement checkbox")
-                    
-            except Exception as e:
-                print(f"Error with checkbox: {e}")
-                continue
\ No newline at end of file
@@ -0,0 +1,104 @@
+from playwright.sync_api import Page
+from typing import Optional
+from option_matcher import best_option
+from .field_snapshot import HANDLE_ATTRIBUTE, FieldSnapshot
+
+OPTION_ATTRIBUTE = "data-jb-option"
+
+# Resolves with the suggestion texts once the listbox has options and has stopped changing
+# for `settle` ms (or after `timeout` ms with whatever is there); no fixed sleeps
+_SUGGESTIONS_JS = """
+({handleAttr, id, optionAttr, timeout, settle}) => new Promise(resolve => {
+    const input = document.querySelector(`[${handleAttr}="${id}"]`);
+    if (!input) { resolve([]); return; }
+
+    const listbox = () => {
+        const ids = [input.getAttribute('aria-controls'), input.getAttribute('aria-owns')]
+            .filter(Boolean).join(' ').split(/\\s+/).filter(Boolean);
+        for (const listId of ids) {
+            const list = document.getElementById(listId);
+            if (list) return list;
+        }
+        // LinkedIn renders the dropdown inside the typeahead component
+        const scope = input.closest('[data-test-single-typeahead-entity-form-component], .basic-typeahead, .search-basic-typeahead')
+            || input.parentElement;
+        return (scope && scope.querySelector('[role="listbox"]')) || document.querySelector('[role="listbox"]');
+    };
+    const options = () => {
+        const list = listbox();
+        return list ? Array.from(list.querySelectorAll('[role="option"]')).filter(o => o.getClientRects().length) : [];
+    };
+
+    let observer = null, quiet = null, deadline = null;
+    const finish = () => {
+        observer.disconnect();
+        clearTimeout(quiet);
+        clearTimeout(deadline);
+        document.querySelectorAll(`[${optionAttr}]`).forEach(o => o.removeAttribute(optionAttr));
+        const found = options();
+        found.forEach((o, i) => o.setAttribute(optionAttr, String(i)));
+        resolve(found.map(o => (o.innerText || o.textContent || '').replace(/\\s+/g, ' ').trim()));
+    };
+    const changed = () => {
+        if (!options().length) return;
+        clearTimeout(quiet);
+        quiet = setTimeout(finish, settle);
+    };
+
+    observer = new MutationObserver(changed);
+    observer.observe(document.body, {childList: true, subtree: true, characterData: true,
+                                     attributes: true, attributeFilter: ['aria-expanded', 'class', 'style', 'hidden']});
+    deadline = setTimeout(finish, timeout);
+    changed();
+})
+"""
+
+# Truthy (the committed value) once the dropdown has closed and the input shows the picked option
+_COMMITTED_JS = """
+({handleAttr, id, expected}) => {
+    const el = document.querySelector(`[${handleAttr}="${id}"]`);
+    if (!el) return false;
+    const norm = (s) => (s || '').toLowerCase().replace(/[^a-z0-9]+/g, ' ').trim();
+    const value = norm(el.value);
+    const want = norm(expected);
+    if (!value || el.getAttribute('aria-expanded') === 'true') return false;
+    return (want.startsWith(value) || value.startsWith(want.split(' ')[0])) ? el.value : false;
+}
+"""
+
+def fill_typeahead(page: Page, field: FieldSnapshot, value: str, timeout_ms: int = 5000,
+                   settle_ms: int = 150) -> Optional[str]:
+    """
+    Type the start of ``value`` into a typeahead, wait for its suggestions,
+    pick the best match and confirm the input committed it. Returns the
+    committed text, or None if no suggestion fits or it did not stick.
+    """
+    label = field.label or field.name or field.id
+    # "Amritsar, Punjab, India" -> type "Amritsar", match the suggestions against the whole value
+    query = value.split(',')[0].strip() or value
+    try:
+        locator = field.locator(page)
+        locator.fill("")
+        locator.press_sequentially(query, delay=40)
+
+        suggestions = page.evaluate(_SUGGESTIONS_JS, {
+            "handleAttr": HANDLE_ATTRIBUTE, "id": field.id, "optionAttr": OPTION_ATTRIBUTE,
+            "timeout": timeout_ms, "settle": settle_ms,
+        }) or []
+        found = best_option([value, query], suggestions, min_score=0.5)
+        if found is None:
+            print(f"  ✗ No suggestion for '{query}' in {label} ({len(suggestions)} shown)")
+            return None
+
+        choice = suggestions[found[0]]
+        page.locator(f"[{OPTION_ATTRIBUTE}='{found[0]}']").first.click(timeout=3000)
+
+        committed = page.wait_for_function(
+            _COMMITTED_JS, arg={"handleAttr": HANDLE_ATTRIBUTE, "id": field.id, "expected": choice},
+            timeout=2000
+        ).json_value()
+        print(f"✓ Picked '{committed}' in {label}")
+        return committed
+    except Exception as e:
+        print(f"  ✗ Typeahead {label} not committed: {str(e).splitlines()[0][:80]}")
+        return None
@@ -7,6 +7,7 @@ from .utils.job_filtering import get_new_jobs_only, is_job_already_applied
 from .autofill.base_autofill import BaseAutofill
 from .navigation.modal_navigation import ModalNavigator
 from database import db
+from page_probe import probe_page
 
 class LinkedInApply:
     """Main LinkedIn application orchestrator"""
@@ -85,6 +86,7 @@ class LinkedInApply:
             return self._handle_no_modal(page, job)
         
         print("Easy Apply modal detected, filling form...")
+        self.autofill.job = job
         
         # Handle the multi-step modal
         return self.modal_navigator.handle_application_modal(page)
@@ -183,8 +185,8 @@ class LinkedInApply:
         print("No Easy Apply button found")
         
         # Check if already applied
-        page_text = page.content().lower()
-        if "applied" in page_text or "already applied" in page_text:
+        state = probe_page(page, phrases=["applied"])
+        if state.has_phrase("applied"):
             print("Already applied to this job")
             db.add_job(
                 job.get("link"),
@@ -207,8 +209,8 @@ class LinkedInApply:
         print("Easy Apply modal did not appear")
         
         # Check if already applied
-        page_text = page.content().lower()
-        if "application sent" in page_text or "already applied" in page_text:
+        state = probe_page(page, phrases=["application sent", "already applied"])
+        if state.phrases:
             print("Already applied to this job")
             db.add_job(
                 job.get("link"),
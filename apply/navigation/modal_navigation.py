@@ -1,7 +1,8 @@
 import time
-from typing import Optional
+from typing import Dict, Optional
 from playwright.sync_api import Page
 import random
+from page_probe import probe_page
 
 class ModalNavigator:
     """Handles navigation within the LinkedIn Easy Apply modal"""
@@ -40,34 +41,47 @@ class ModalNavigator:
     
     def handle_application_modal(self, page: Page, max_steps: int = 10) -> bool:
         """Handle the multi-step Easy Apply modal"""
+        # Repair attempts per field id for this application; a field that used them all is given up on
+        repair_attempts: Dict[str, int] = {}
+        repairing = False
+        
         for step in range(max_steps):
-            print(f"\n--- Step {step + 1} ---")
-            
-            # Add human-like delay
-            time.sleep(random.uniform(1.5, 2.5))
-            
-            # Scroll to top of modal
-            self._scroll_modal_top(page)
-            
-            # Fill form fields
-            print("Filling form fields...")
-            self.autofill.autofill_standard_form(page)
-            
-            time.sleep(random.uniform(1, 2))
+            if repairing:
+                # The step did not validate: re-fill only the flagged fields, no full pass, no long delays
+                print(f"\n--- Step {step + 1} (repair) ---")
+                if not self.autofill.repair_invalid_fields(page, repair_attempts):
+                    print("⚠ Step still invalid and nothing left to repair")
+                    return False
+                time.sleep(random.uniform(0.3, 0.6))
+            else:
+                print(f"\n--- Step {step + 1} ---")
+                
+                # Add human-like delay
+                time.sleep(random.uniform(1.5, 2.5))
+                
+                # Scroll to top of modal
+                self._scroll_modal_top(page)
+                
+                # Fill form fields
+                print("Filling form fields...")
+                self.autofill.autofill_standard_form(page)
+                
+                time.sleep(random.uniform(1, 2))
             
             # Find and handle action buttons
             button_type, button = self._find_action_button(page)
             
             if not button:
-                if self._check_for_errors(page):
-                    break
+                repairing = self._check_for_errors(page)
                 continue
             
             # Handle the button based on type
             if button_type == 'submit':
                 return self._handle_submission(page, button)
             else:
-                self._click_button(button, button_type)
+                repairing = False
+                if self._click_button(button, button_type):
+                    repairing = self._record_step_result(page) is False
                 continue
         
         print("⚠ Reached max steps or couldn't complete application")
@@ -106,6 +120,7 @@ class ModalNavigator:
         # Check for success
         if self._is_application_successful(page):
             print("✓ Application submitted successfully!")
+            self.autofill.record_step_result(True)
             return True
         
         print("⚠ Submit clicked but couldn't confirm success")
@@ -133,22 +148,31 @@ class ModalNavigator:
                     print(f"Failed to click {button_type}: {e}")
                     return False
     
+    def _record_step_result(self, page: Page) -> Optional[bool]:
+        """
+        Tell the answer memory whether the step we just submitted passed
+        validation; returns that, or None if the page could not be probed
+        """
+        time.sleep(random.uniform(0.8, 1.2))
+        state = probe_page(page, modal_selectors=["div.jobs-easy-apply-modal", "div[role='dialog']"])
+        if not state.ok:
+            return None
+        passed = state.error_count == 0
+        self.autofill.record_step_result(passed)
+        return passed
+    
     def _is_application_successful(self, page: Page) -> bool:
         """Check if application was successful"""
-        page_text = page.content().lower()
-        
-        # Check for success indicators in page text
-        is_success = any(indicator in page_text for indicator in self.SUCCESS_INDICATORS)
-        
-        # Also check if modal closed
-        try:
-            modal_still_visible = page.is_visible("div.jobs-easy-apply-modal")
-            if not modal_still_visible:
-                is_success = True
-        except:
-            pass
+        state = probe_page(
+            page,
+            modal_selectors=["div.jobs-easy-apply-modal"],
+            success_phrases=self.SUCCESS_INDICATORS
+        )
+        if not state.ok:
+            return False
         
-        return is_success
+        # Success text on the page, or the modal closed
+        return state.success_found or not state.modal_present
     
     def _check_for_errors(self, page: Page) -> bool:
         """Check for error messages in modal"""
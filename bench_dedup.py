@@ -0,0 +1,69 @@
+"""
+bench_dedup.py
+Check MinHash estimates against the exact Jaccard similarity of the shingle
+sets, on random pairs of synthetic postings (many share company, title words
+and city, like cross-site reposts do).
+
+Exits non-zero when the estimates drift: mean error above 0.05 or the 99th
+percentile above 0.12 (128 permutations give a standard error of at most
+~0.045, so a few pairs in a thousand land just past 0.1 by chance).
+
+Usage: python bench_dedup.py [pairs]
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from dedup import NUM_PERM, estimated_similarity, minhash_signature, shingles
+
+TITLE_WORDS = [
+    "senior", "junior", "lead", "software", "backend", "frontend", "full", "stack", "developer",
+    "engineer", "react", "node.js", "python", "java", "devops", "data", "mern", "qa", "cloud",
+]
+COMPANIES = ["Acme", "Globex Software", "Initech Solutions", "Umbrella Tech", "Hooli"]
+CITIES = ["Bengaluru", "Pune", "Mumbai", "Gurugram", "Noida", "Hyderabad", "Remote"]
+
+def make_pair(rng: random.Random):
+    """Two postings that share a random part of their title/company/city"""
+    title = rng.choices(TITLE_WORDS, k=rng.randint(2, 5))
+    other = list(title)
+    for _ in range(rng.randint(0, 3)):
+        other[rng.randrange(len(other))] = rng.choice(TITLE_WORDS)
+    company = rng.choice(COMPANIES)
+    a = {"role": " ".join(title), "company": company, "location": rng.choice(CITIES)}
+    b = {"role": " ".join(other), "company": company if rng.random() < 0.8 else rng.choice(COMPANIES),
+         "location": a["location"] if rng.random() < 0.6 else rng.choice(CITIES)}
+    return a, b
+
+def jaccard(a, b) -> float:
+    set_a, set_b = set(shingles(a)), set(shingles(b))
+    return len(set_a & set_b) / len(set_a | set_b)
+
+def main(pairs: int = 2000) -> int:
+    rng = random.Random(7)
+    errors = []
+    false_duplicates = 0
+    start = time.perf_counter()
+    for _ in range(pairs):
+        a, b = make_pair(rng)
+        exact = jaccard(a, b)
+        estimate = estimated_similarity(minhash_signature(shingles(a)), minhash_signature(shingles(b)))
+        errors.append(abs(estimate - exact))
+        if estimate >= 0.8 and exact < 0.7:
+            false_duplicates += 1
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    errors = np.array(errors)
+    mean, p99, worst = errors.mean(), np.percentile(errors, 99), errors.max()
+    print(f"{pairs} pairs, {NUM_PERM} permutations: |estimate - jaccard| mean {mean:.3f}  "
+          f"p99 {p99:.3f}  max {worst:.3f}  false duplicates {false_duplicates}  ({elapsed_ms:.0f} ms)")
+
+    ok = mean <= 0.05 and p99 <= 0.12
+    print("✓ Estimates within tolerance" if ok else "✗ MinHash estimates drift from the exact Jaccard")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
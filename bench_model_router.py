@@ -0,0 +1,158 @@
+"""
+bench_model_router.py
+Benchmark AI question routing against a local stub of the Ollama API that
+emulates models with different latencies (and one flaky model).
+
+Compares every question pinned to one large model with the latency-aware
+router (fast pool for choices/numbers/short text, large pool for textareas).
+
+Usage: python bench_model_router.py [questions] [deadline_seconds]
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PORT = 11599
+os.environ.setdefault("OLLAMA_HOST", f"http://127.0.0.1:{PORT}")
+
+from ai_cache import AnswerCache
+from ai_form_filler import AIFormFiller
+from answer_memory import AnswerMemory
+from database import Database
+from model_router import ModelRouter
+import ai_form_filler
+
+# name -> (seconds to first token, seconds per output token, failure rate)
+MODELS = {
+    "fast-1b": (0.06, 0.012, 0.0),
+    "flaky-1b": (0.04, 0.010, 0.4),
+    "mid-4b": (0.20, 0.030, 0.0),
+    "large-14b": (0.70, 0.060, 0.0),
+}
+
+QUESTIONS = [
+    ("Are you legally authorized to work in India?", "radio", ["Yes", "No"]),
+    ("Will you require visa sponsorship?", "radio", ["Yes", "No"]),
+    ("What is your notice period?", "select", ["Immediate", "15 days", "30 days", "60 days", "90 days"]),
+    ("Highest level of education", "select", ["High school", "Bachelor's", "Master's", "PhD"]),
+    ("How many years of experience do you have with Kafka?", "number", None),
+    ("Expected CTC (LPA)", "number", None),
+    ("Current city", "text", None),
+    ("Current company", "text", None),
+    ("I agree to the privacy policy", "checkbox", None),
+    ("Why do you want to join us?", "textarea", None),
+]
+
+class StubOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    rng = random.Random(7)
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, body, status=200):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._send_json({"models": [{"name": f"{name}:latest"} for name in MODELS]})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        first_token, per_token, failure_rate = MODELS.get(request["model"].split(":")[0], (1.0, 0.1, 0.0))
+        jitter = self.rng.uniform(0.8, 1.6)
+        if self.rng.random() < failure_rate:
+            time.sleep(first_token * jitter)
+            self._send_json({"error": "model runner crashed"}, status=500)
+            return
+
+        fmt = request.get("format")
+        if isinstance(fmt, dict) and "answer" in fmt.get("properties", {}):
+            schema = fmt["properties"]["answer"]
+            value = schema["enum"][0] if "enum" in schema else (2 if schema.get("type") == "number" else "x")
+            tokens = ['{"answer": ', json.dumps(value), "}"]
+        elif isinstance(fmt, dict):
+            tokens = [json.dumps({key: "Yes" for key in fmt.get("properties", {})})]
+        else:
+            tokens = ["I", " am", " keen", " to", " contribute", " to", " your", " team", ".", "\n"] + [" more"] * 20
+        tokens = tokens[:request.get("options", {}).get("num_predict", 256)]
+
+        time.sleep(first_token * jitter)
+        if not request.get("stream", True):
+            time.sleep(per_token * len(tokens))
+            self._send_json({"response": "".join(tokens), "done": True})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens + [None]:
+                line = json.dumps({"response": token or "", "done": token is None}).encode() + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+                if token is not None:
+                    time.sleep(per_token)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client cancelled the generation
+
+def make_filler(router: ModelRouter) -> AIFormFiller:
+    # Fresh in-memory stores so nothing is answered from cache
+    ai_form_filler.answer_memory = AnswerMemory(Database(":memory:"))
+    filler = AIFormFiller()
+    filler.cache = AnswerCache(filler.model_name, filler.profile_version, database=None, capacity=0)
+    filler.router = router
+    return filler
+
+def run(label: str, router: ModelRouter, questions, deadline: float):
+    filler = make_filler(router)
+    latencies = []
+    for i, (context, field_type, options) in enumerate(questions):
+        start = time.perf_counter()
+        filler.generate_answer(f"{context} #{i}", field_type, options, timeout=deadline)
+        latencies.append(time.perf_counter() - start)
+    ms = sorted(latency * 1000 for latency in latencies)
+    misses = sum(latency > deadline for latency in latencies)
+    return label, sum(ms) / len(ms), ms[len(ms) // 2], ms[int(len(ms) * 0.95) - 1], misses, router.summary()
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    deadline = float(sys.argv[2]) if len(sys.argv) > 2 else 1.5
+
+    server = ThreadingHTTPServer(("127.0.0.1", PORT), StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    rng = random.Random(11)
+    questions = [rng.choice(QUESTIONS) for _ in range(count)]
+
+    import builtins
+    quiet_print = builtins.print
+    results = []
+    for label, router in (
+        ("pinned large-14b", ModelRouter(["large-14b"], deadline=deadline)),
+        ("routed", ModelRouter(["flaky-1b", "fast-1b", "mid-4b"], ["large-14b"], deadline=deadline)),
+    ):
+        builtins.print = lambda *args, **kwargs: None  # The filler logs every answer
+        try:
+            results.append(run(label, router, questions, deadline))
+        finally:
+            builtins.print = quiet_print
+
+    server.shutdown()
+    print("="*60)
+    print(f"Model router benchmark: {count} questions, {deadline:.1f} s per-field deadline")
+    print("="*60)
+    for label, mean, p50, p95, misses, summary in results:
+        print(f"{label:18} mean {mean:6.0f} ms  p50 {p50:6.0f} ms  p95 {p95:6.0f} ms  over deadline {misses}")
+        print(f"{'':18} {summary}")
@@ -0,0 +1,177 @@
+"""
+bench_question_rules.py
+Microbenchmark of the compiled question classifier against the old
+keyword scans, over screening-question labels seen on LinkedIn/Indeed forms.
+
+Usage: python bench_question_rules.py [repeats]
+"""
+
+import json
+import random
+import sys
+import time
+
+from question_rules import RULES_PATH, QuestionClassifier
+
+LABELS = [
+    ("How many years of work experience do you have with Python?", "number"),
+    ("How many years of work experience do you have with React.js?", "number"),
+    ("How many years of work experience do you have with Node.js?", "number"),
+    ("How many years of work experience do you have with JavaScript?", "number"),
+    ("How many years of work experience do you have with TypeScript?", "number"),
+    ("How many years of work experience do you have with MongoDB?", "number"),
+    ("How many years of work experience do you have with Amazon Web Services (AWS)?", "number"),
+    ("How many years of work experience do you have with Docker?", "number"),
+    ("How many years of work experience do you have with SQL?", "number"),
+    ("How many years of work experience do you have with PostgreSQL?", "number"),
+    ("How many years of work experience do you have with Express.js?", "number"),
+    ("How many years of work experience do you have with Next.js?", "number"),
+    ("How many years of work experience do you have with ASP.NET?", "number"),
+    ("How many years of work experience do you have with Java?", "number"),
+    ("How many years of work experience do you have with REST APIs?", "number"),
+    ("Years of experience in MERN stack development", "text"),
+    ("Total years of professional experience", "text"),
+    ("What is your total experience?", "text"),
+    ("Relevant experience (in years)", "select"),
+    ("What is your current CTC (in LPA)?", "text"),
+    ("Current CTC in lakhs", "number"),
+    ("Current annual compensation (INR)", "number"),
+    ("What is your expected CTC?", "text"),
+    ("Expected salary (per annum)", "number"),
+    ("Desired compensation", "text"),
+    ("What is your salary expectation for this role?", "text"),
+    ("What is your notice period?", "select"),
+    ("Notice period (in days)", "number"),
+    ("When can you start?", "text"),
+    ("Earliest start date", "text"),
+    ("Are you an immediate joiner?", "radio"),
+    ("Can you join immediately?", "radio"),
+    ("Are you legally authorized to work in India?", "radio"),
+    ("Will you now or in the future require sponsorship for employment visa status?", "radio"),
+    ("Do you have a valid work permit?", "select"),
+    ("Are you willing to relocate to Bengaluru?", "radio"),
+    ("Are you comfortable commuting to this job's location?", "radio"),
+    ("Are you comfortable working in a hybrid setting?", "radio"),
+    ("Have you completed the following level of education: Bachelor's Degree?", "radio"),
+    ("Highest level of education", "select"),
+    ("What is your highest qualification?", "select"),
+    ("City", "text"),
+    ("Location (city)", "text"),
+    ("Current location", "text"),
+    ("Email address", "text"),
+    ("Mobile phone number", "text"),
+    ("Phone country code", "select"),
+    ("First name", "text"),
+    ("Last name", "text"),
+    ("LinkedIn Profile", "text"),
+    ("Website, blog, or portfolio", "text"),
+    ("Cover letter", "textarea"),
+    ("Why do you want to join our company?", "textarea"),
+    ("Tell us about yourself", "textarea"),
+    ("Additional information", "textarea"),
+    ("Any comments for the hiring team?", "textarea"),
+    ("I agree to the terms and conditions", "checkbox"),
+    ("I consent to the processing of my personal data per the privacy policy", "checkbox"),
+    ("I understand that this is a contract role", "checkbox"),
+    ("Have you ever been convicted of a felony?", "radio"),
+    ("Have you ever been terminated from a job?", "radio"),
+    ("Have you previously worked with us before?", "radio"),
+    ("Do you have experience with Agile methodologies?", "radio"),
+    ("Are you comfortable working in a startup environment?", "radio"),
+    ("Do you have experience managing a team?", "radio"),
+    ("Are you open to night shifts?", "radio"),
+    ("Are you willing to undergo a background check?", "radio"),
+    ("Are you 18 years of age or older?", "radio"),
+    ("What is your gender?", "select"),
+    ("How did you hear about this job?", "select"),
+]
+
+def legacy_classify(context: str, field_name: str = "") -> str:
+    """The previous Indeed classification (linear keyword scans), kept as the baseline"""
+    combined = f"{context.lower()} {field_name.lower()}"
+    if any(t in combined for t in ['authorized', 'authorization', 'eligible', 'eligibility', 'sponsorship',
+                                   'visa', 'work permit', 'legally authorized', 'require sponsorship',
+                                   'need sponsorship']):
+        return 'work_auth'
+    if any(t in combined for t in ['years of experience', 'years experience', 'how many years',
+                                   'experience in years', 'total experience', 'relevant experience']):
+        return 'experience_years'
+    if any(t in combined for t in ['notice period', 'notice', 'availability', 'available to start',
+                                   'when can you start', 'start date', 'joining']):
+        return 'notice_period'
+    if any(t in combined for t in ['current salary', 'current ctc', 'current compensation',
+                                   'present salary', 'existing salary']):
+        return 'current_salary'
+    if any(t in combined for t in ['expected salary', 'expected ctc', 'desired salary', 'salary expectation',
+                                   'target salary', 'compensation expectation']):
+        return 'expected_salary'
+    if any(t in combined for t in ['location', 'city', 'address', 'where are you based', 'current location',
+                                   'home address']):
+        return 'location'
+    if any(t in combined for t in ['education', 'degree', 'qualification', 'highest education',
+                                   'educational background']):
+        return 'education'
+    if any(t in combined for t in ['do you', 'are you', 'have you', 'can you', 'will you', 'would you',
+                                   'did you']):
+        if any(t in combined for t in ['criminal', 'felony', 'convicted', 'terminated', 'fired', 'dismissed',
+                                       'lawsuit', 'sued']):
+            return 'negative_question'
+        return 'positive_question'
+    # The LinkedIn passes then re-scanned the same text for CTC/tech/consent/textarea keywords
+    for keywords in (['current ctc', 'current compensation', 'current salary', 'current annual'],
+                     ['expected ctc', 'expected salary', 'desired compensation', 'expected annual'],
+                     ['python', 'javascript', 'react', 'node', 'sql', 'mongodb', '.net', 'java', 'aws',
+                      'docker', 'typescript'],
+                     ['agree', 'consent', 'terms', 'privacy', 'understand'],
+                     ['cover letter', 'introduction', 'why you'], ['additional', 'comments']):
+        if any(k in combined for k in keywords):
+            return 'matched'
+    return 'unknown'
+
+def timed(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for label, kind in LABELS:
+            fn(label, kind)
+    return (time.perf_counter() - start) * 1e6 / (repeats * len(LABELS))
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    start = time.perf_counter()
+    classifier = QuestionClassifier.from_file()
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    print("="*60)
+    print("Question classifier benchmark")
+    print("="*60)
+    print(f"{len(classifier.rules)} rules, {len(classifier.automaton.goto)} automaton states, "
+          f"compiled in {compile_ms:.1f} ms")
+    print(f"Corpus: {len(LABELS)} labels x {repeats} repeats")
+
+    compiled_us = timed(classifier.classify, repeats)
+    legacy_us = timed(lambda label, kind: legacy_classify(label), repeats)
+    print(f"compiled automaton : {compiled_us:6.2f} us/label")
+    print(f"legacy keyword scan: {legacy_us:6.2f} us/label")
+
+    # Cost as the table grows: the automaton walks the words once, keyword scans grow with the table
+    rng = random.Random(7)
+    vocabulary = [f"skill{i}" for i in range(5000)]
+    with open(RULES_PATH, encoding="utf-8") as f:
+        rows = json.load(f)["rules"]
+    extra_rows = [{"name": f"extra_{i}", "category": "extra", "priority": 10,
+                   "patterns": [" ".join(rng.sample(vocabulary, 2)) for _ in range(5)]} for i in range(400)]
+    extra_keywords = [p for row in extra_rows for p in row["patterns"]]
+    big = QuestionClassifier.from_rows(rows + extra_rows)
+    big_us = timed(big.classify, max(repeats // 4, 1))
+    big_legacy_us = timed(lambda label, kind: legacy_classify(label) == 'unknown'
+                          and any(k in label.lower() for k in extra_keywords), max(repeats // 4, 1))
+    print(f"\nWith {len(extra_keywords)} extra patterns ({len(big.rules)} rules):")
+    print(f"compiled automaton : {big_us:6.2f} us/label")
+    print(f"legacy keyword scan: {big_legacy_us:6.2f} us/label")
+
+    unknown = [label for label, kind in LABELS if classifier.classify(label, kind) is None]
+    print(f"\nClassified {len(LABELS) - len(unknown)}/{len(LABELS)} labels")
+    for label, kind in LABELS:
+        rule = classifier.classify(label, kind)
+        print(f"  {(rule.name if rule else '-'):24} {kind:8} {label}")
@@ -0,0 +1,71 @@
+"""
+bench_ranking.py
+Benchmark JobRanker on synthetic job lists (10k and 100k postings).
+
+Usage: python bench_ranking.py [sizes...]
+"""
+
+import random
+import sys
+import time
+
+from ranking import JobRanker
+
+TITLE_WORDS = [
+    "senior", "junior", "lead", "staff", "principal", "associate", "software", "backend",
+    "frontend", "full", "stack", "developer", "engineer", "react", "reactjs", "node.js",
+    "nodejs", "python", "java", "golang", "devops", "data", "analyst", "sales", "manager",
+    "mern", "mobile", "android", "ios", "qa", "automation", "cloud", "aws", "typescript",
+]
+DESCRIPTION_WORDS = TITLE_WORDS + [
+    "experience", "years", "build", "scalable", "services", "apis", "rest", "graphql",
+    "mongodb", "postgresql", "docker", "kubernetes", "agile", "startup", "product",
+    "customers", "ownership", "communication", "testing", "ci", "cd", "microservices",
+]
+
+def make_jobs(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        {
+            "role": " ".join(rng.choices(TITLE_WORDS, k=rng.randint(2, 5))),
+            "company": f"Company {i % 997}",
+            "description": " ".join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(20, 60))),
+            "link": f"https://example.com/jobs/{i}",
+        }
+        for i in range(n)
+    ]
+
+def bench(n: int):
+    jobs = make_jobs(n)
+    ranker = JobRanker(
+        skills="Nodejs, JavaScript, React, MongoDB, Express",
+        keywords="reactjs developer,nodejs developer,mern stack developer",
+    )
+
+    # Tokenizing + building the sparse matrix (Python tokenizer, NumPy counting)
+    start = time.perf_counter()
+    matrix, query = ranker.vectorize(jobs)
+    vectorize_ms = (time.perf_counter() - start) * 1000
+
+    # Scoring every job against the profile (pure NumPy)
+    start = time.perf_counter()
+    scores = matrix.dot(query)
+    score_ms = (time.perf_counter() - start) * 1000
+
+    # End to end, as used by the pipeline
+    start = time.perf_counter()
+    top = ranker.rank(jobs, top_n=10)
+    rank_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{n:>7} jobs: vectorize {vectorize_ms:8.1f} ms  score {score_ms:7.2f} ms  "
+          f"rank(top 10) {rank_ms:8.1f} ms  nnz={matrix.data.size}  "
+          f"best={top[0]['relevance']:.3f} '{top[0]['role']}'")
+    return scores
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print("="*60)
+    print("JobRanker benchmark")
+    print("="*60)
+    for size in sizes:
+        bench(size)
@@ -0,0 +1,128 @@
+"""
+bootstrap.py
+Concurrent start-up for a run.
+
+The browser has to be launched and driven from the main thread (Playwright
+sync API), but nothing else start-up does needs it: the Ollama warm-up,
+the resume/profile vectors for ranking and the answer-similarity index
+load on a small thread pool meanwhile. Login pages of all enabled sites
+are then probed in parallel tabs instead of one after another. Every part
+is timed and ``report`` prints the breakdown.
+"""
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+class Bootstrap:
+    """Runs start-up work concurrently and keeps its timings"""
+
+    def __init__(self, config, max_workers: int = 3):
+        self.config = config
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bootstrap")
+        self.futures: Dict[str, Future] = {}
+        self.timings: List[Tuple[str, str, float]] = []  # (name, where, seconds)
+        self.started = time.perf_counter()
+
+    def _timed(self, name: str, where: str, fn: Callable, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.timings.append((name, where, time.perf_counter() - start))
+
+    def submit(self, name: str, fn: Callable, *args) -> Future:
+        future = self.executor.submit(self._timed, name, "background", fn, *args)
+        self.futures[name] = future
+        return future
+
+    def run(self, name: str, fn: Callable, *args):
+        """Run on the calling (main) thread, timed"""
+        return self._timed(name, "main", fn, *args)
+
+    def result(self, name: str, default=None, timeout: Optional[float] = None):
+        """Result of a background task, or ``default`` if it failed"""
+        future = self.futures.get(name)
+        if future is None:
+            return default
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            print(f"⚠ Start-up task '{name}' failed: {e}")
+            return default
+
+    # Background tasks
+
+    def start_background(self):
+        """Kick off everything that does not need the browser"""
+        from ranking import JobRanker
+        self.submit("ranker profile", JobRanker.from_config, self.config)
+        self.submit("answer index", self._load_indexes)
+        if getattr(self.config, "ANSWER_LLM", False):
+            self.submit("ollama warm-up", self._warm_up_ai)
+
+    @staticmethod
+    def _load_indexes():
+        """Build the answer-similarity index from the answer memory so the first job does not"""
+        from answer_engine import answer_engine
+        return len(answer_engine.index.rows)
+
+    @staticmethod
+    def _warm_up_ai() -> bool:
+        """Health check, then load the model(s) with keep_alive and evaluate the system prompt"""
+        from answer_engine import answer_engine
+        llm = answer_engine.llm
+        return bool(llm and llm.warm_up())
+
+    # Browser work (main thread)
+
+    def probe_logins(self, browser, sites, settle: float = 3.0) -> Dict[str, bool]:
+        """
+        Open every site's login page in its own tab at once, give them one
+        shared settle time, then run each site's login check.
+        Returns site name -> logged in.
+        """
+        return self.run(f"login probes ({len(sites)} tabs)", self._probe_logins, browser, sites, settle)
+
+    @staticmethod
+    def _probe_logins(browser, sites, settle: float) -> Dict[str, bool]:
+        tabs = []
+        for site in sites:
+            try:
+                tab = browser.new_page()
+                # Returns once the navigation commits; the pages keep loading side by side
+                tab.goto(site.login_url, timeout=45000, wait_until="commit")
+                tabs.append((site, tab))
+            except Exception as e:
+                print(f"⚠ Could not open {site.name} login page: {e}")
+
+        for site, tab in tabs:
+            try:
+                tab.wait_for_load_state("domcontentloaded", timeout=45000)
+            except Exception:
+                pass
+        time.sleep(settle)
+
+        results = {}
+        for site, tab in tabs:
+            try:
+                results[site.name] = bool(site.login_check(tab))
+            except Exception as e:
+                print(f"⚠ Login probe failed for {site.name}: {e}")
+                results[site.name] = False
+            finally:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+        return results
+
+    def report(self):
+        """Print the start-up timing breakdown"""
+        wall = time.perf_counter() - self.started
+        serial = sum(seconds for _, _, seconds in self.timings)
+        print("\nStart-up timing:")
+        for name, where, seconds in sorted(self.timings, key=lambda t: -t[2]):
+            print(f"  {name:28} {seconds:6.2f} s  ({where})")
+        print(f"  {'total':28} {wall:6.2f} s  (vs {serial:.2f} s one after another)")
+        self.executor.shutdown(wait=False)
@@ -15,7 +15,16 @@ class Config:
     RESUME_PATH = os.getenv("RESUME_PATH", "")
     JOB_KEYWORDS = os.getenv("JOB_KEYWORDS", "")  # comma separated
     LOCATION = os.getenv("LOCATION", "")
+    # Comma separated site plugins to run (see sites.py); sites without an applier
+    # (indeed, naukri, glassdoor) only collect jobs, recorded with status "found"
+    SITES = os.getenv("SITES", "linkedin,indeed,naukri,glassdoor")
     USER_DATA_DIR = os.getenv("USER_DATA_DIR", "data/playwright_profiles")
+    # Scrape-time filters, comma separated (see scrapers/job_filter.py for the syntax)
+    TITLE_INCLUDE = os.getenv("TITLE_INCLUDE", "")
+    TITLE_EXCLUDE = os.getenv("TITLE_EXCLUDE", "")
+    COMPANY_BLOCKLIST = os.getenv("COMPANY_BLOCKLIST", "")
+    LOCATION_INCLUDE = os.getenv("LOCATION_INCLUDE", "")
+    LOCATION_EXCLUDE = os.getenv("LOCATION_EXCLUDE", "")
     FULL_NAME = "Your Full Name"
     LOCATION = "Amritsar, Punjab, India"
     # Optional proxy (e.g. "http://1.2.3.4:3128") to route traffic through
@@ -34,4 +43,25 @@ class Config:
     NOTICE_PERIOD = os.getenv("NOTICE_PERIOD", "30")
     EDUCATION = os.getenv("EDUCATION", "Bachelor's in Computer Science")
     SKILLS = os.getenv("SKILLS", "Nodejs, JavaScript, React")
+    # Scrape RANK_POOL_FACTOR x --max jobs per site, then apply to the most relevant --max
+    RANK_POOL_FACTOR = int(os.getenv("RANK_POOL_FACTOR", "3"))
+    # Estimated Jaccard similarity at which postings on different sites count as the same job
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+    # Local Ollama server used by ai_form_filler.py, and how long it keeps the model loaded
+    OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://127.0.0.1:11434")
+    OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    # Ask the model for questions the rules and past answers cannot answer, within this many seconds per step
+    ANSWER_LLM = os.getenv("ANSWER_LLM", "true").lower() in ("1", "true", "yes")
+    ANSWER_LLM_BUDGET = float(os.getenv("ANSWER_LLM_BUDGET", "25"))
+    # Comma separated Ollama models: fast ones for choices/numbers, large ones for free-text textareas
+    AI_FAST_MODELS = os.getenv("AI_FAST_MODELS", "")
+    AI_LARGE_MODELS = os.getenv("AI_LARGE_MODELS", "")
+    # Seconds one AI answer may take; the router avoids models whose p95 is slower
+    AI_FIELD_DEADLINE = float(os.getenv("AI_FIELD_DEADLINE", "10"))
+    # Ollama health: re-check after TTL seconds; stop calling it for COOLDOWN seconds after FAILURES failed/slow calls
+    OLLAMA_HEALTH_TTL = float(os.getenv("OLLAMA_HEALTH_TTL", "30"))
+    OLLAMA_BREAKER_FAILURES = int(os.getenv("OLLAMA_BREAKER_FAILURES", "3"))
+    OLLAMA_BREAKER_COOLDOWN = float(os.getenv("OLLAMA_BREAKER_COOLDOWN", "60"))
+    # Write a cover note and a "why this role" answer per queued job in the background (needs ANSWER_LLM)
+    COVER_NOTES = os.getenv("COVER_NOTES", "true").lower() in ("1", "true", "yes")
 config = Config()
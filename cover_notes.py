@@ -0,0 +1,92 @@
+"""
+cover_notes.py
+Background stage that writes free text for queued jobs.
+
+Generating a cover note in the middle of a modal step would add seconds
+to every application. Instead, as soon as a site's jobs are ranked, a
+worker thread writes a cover note and a "why this role" answer for each
+of them and stores them in the ``job_texts`` table keyed by job link.
+The scrapers collect no job descriptions, so the texts are written from
+the title and company only. The textarea pass only reads that table; a
+job whose texts are not ready yet is left to the answer engine and, last,
+the canned sentence. Only jobs a site can apply to are queued.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+from answer_memory import answer_memory
+from config import config
+from database import db
+
+KINDS = ("cover_note", "why_role")
+
+class CoverNotes:
+    """Writes and serves per-job cover notes off the critical path"""
+
+    def __init__(self, config, database=db):
+        self.config = config
+        self.db = database
+        self.enabled = getattr(config, "COVER_NOTES", True) and getattr(config, "ANSWER_LLM", True)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.queued = 0
+        self.written = 0
+        self.hits = 0
+        self.misses = 0
+
+    def queue(self, jobs: Iterable[Dict]):
+        """Write the texts of ``jobs`` in the background, in order (jobs that already have them are skipped)"""
+        if not self.enabled:
+            return
+        for job in jobs:
+            link = job.get("link")
+            if not link:
+                continue
+            missing = [kind for kind in KINDS if kind not in self.db.get_job_texts(link, answer_memory.version)]
+            if not missing:
+                continue
+            if self._executor is None:
+                # One writer: it shares Ollama with the form answers
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cover-notes")
+            self._executor.submit(self._write, dict(job), missing)
+            self.queued += 1
+
+    def _write(self, job: Dict, kinds):
+        # The health state is cached, so a down server costs nothing per job
+        from answer_engine import answer_engine
+        llm = answer_engine.llm
+        if llm is None:
+            return
+        written = 0
+        for kind in kinds:
+            text = llm.write_about_job(job, kind)
+            if text and self.db.save_job_text(job["link"], kind, text, llm.model_name, answer_memory.version):
+                written += 1
+        self.written += written
+        if written:
+            print(f"📝 Cover note ready for {job.get('role', 'N/A')} @ {job.get('company', 'N/A')}")
+
+    def lookup(self, job: Optional[Dict], kind: str) -> Optional[str]:
+        """Stored text of ``kind`` for the job being applied to, or None"""
+        if not job or not job.get("link"):
+            return None
+        text = self.db.get_job_texts(job["link"], answer_memory.version).get(kind)
+        if text:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return text
+
+    def shutdown(self):
+        """Drop texts still waiting to be written (the run is over)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> str:
+        if not self.queued and not self.hits and not self.misses:
+            return "none requested"
+        return f"{self.written} written for {self.queued} jobs, {self.hits} used, {self.misses} not ready"
+
+# Global instance
+cover_notes = CoverNotes(config)
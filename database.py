@@ -28,18 +28,85 @@ class Database:
                 timestamp TEXT
             )
             """)
+            # Older databases were created before the notes column existed
+            columns = [row[1] for row in cur.execute("PRAGMA table_info(applied_jobs)")]
+            if "notes" not in columns:
+                cur.execute("ALTER TABLE applied_jobs ADD COLUMN notes TEXT")
+            # MinHash signatures and LSH buckets for cross-site near-duplicate detection
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS job_minhash (
+                job_key TEXT PRIMARY KEY,
+                role TEXT,
+                company TEXT,
+                signature BLOB,
+                timestamp TEXT
+            )
+            """)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS job_lsh_buckets (
+                bucket INTEGER,
+                job_key TEXT
+            )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_job_lsh_bucket ON job_lsh_buckets (bucket)")
+            # Screening-question answers keyed by normalized label hash + field type + options
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS question_answers (
+                question_key TEXT PRIMARY KEY,
+                label TEXT,
+                field_type TEXT,
+                options_sig TEXT,
+                answer TEXT,
+                source TEXT,
+                profile_version TEXT,
+                passed INTEGER,
+                uses INTEGER DEFAULT 1,
+                timestamp TEXT
+            )
+            """)
+            # On-disk level of the AI answer cache (ai_cache.AnswerCache)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS ai_answer_cache (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT,
+                profile_version TEXT,
+                answer TEXT,
+                hits INTEGER DEFAULT 0,
+                created TEXT,
+                last_used TEXT
+            )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_ai_answer_cache_used ON ai_answer_cache (last_used)")
+            # Cover notes / "why this role" answers written ahead of the apply loop (cover_notes.py)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS job_texts (
+                job_link TEXT,
+                kind TEXT,
+                text TEXT,
+                model TEXT,
+                profile_version TEXT,
+                timestamp TEXT,
+                PRIMARY KEY (job_link, kind)
+            )
+            """)
             self.conn.commit()
 
-    def add_job(self, job_link, company, role, status="applied"):
+    def add_job(self, job_link, company, role, status="applied", notes=None):
+        """Record a job; a row that is only "found" (no applier yet) takes the new status"""
         with _LOCK:
             cur = self.conn.cursor()
             try:
                 cur.execute(
-                    "INSERT INTO applied_jobs (job_link, company, role, status, timestamp) VALUES (?, ?, ?, ?, ?)",
-                    (job_link, company, role, status, datetime.utcnow().isoformat())
+                    """
+                    INSERT INTO applied_jobs (job_link, company, role, status, timestamp, notes) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(job_link) DO UPDATE SET
+                        status = excluded.status, timestamp = excluded.timestamp, notes = excluded.notes
+                    WHERE applied_jobs.status = 'found'
+                    """,
+                    (job_link, company, role, status, datetime.utcnow().isoformat(), notes)
                 )
                 self.conn.commit()
-                return True
+                return cur.rowcount > 0
             except sqlite3.IntegrityError:
                 return False  # duplicate
 
@@ -87,4 +154,201 @@ class Database:
             print(f"Error checking if job applied: {e}")
             return False
 
-db = Database()
\ No newline at end of file
+    def add_minhash(self, job_key, role, company, signature, buckets):
+        """Store a job's MinHash signature (bytes) and its LSH bucket ids"""
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                cur.execute(
+                    "INSERT OR IGNORE INTO job_minhash (job_key, role, company, signature, timestamp) VALUES (?, ?, ?, ?, ?)",
+                    (job_key, role, company, signature, datetime.utcnow().isoformat())
+                )
+                if cur.rowcount:
+                    cur.executemany(
+                        "INSERT INTO job_lsh_buckets (bucket, job_key) VALUES (?, ?)",
+                        [(bucket, job_key) for bucket in buckets]
+                    )
+                self.conn.commit()
+                return cur.rowcount > 0
+        except Exception as e:
+            print(f"Error storing job signature: {e}")
+            return False
+
+    def find_minhash_candidates(self, buckets):
+        """Return (job_key, role, company, signature) rows sharing any LSH bucket"""
+        if not buckets:
+            return []
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                placeholders = ",".join("?" * len(buckets))
+                cur.execute(f"""
+                    SELECT job_key, role, company, signature FROM job_minhash
+                    WHERE job_key IN (
+                        SELECT DISTINCT job_key FROM job_lsh_buckets WHERE bucket IN ({placeholders})
+                    )
+                """, list(buckets))
+                return cur.fetchall()
+        except Exception as e:
+            print(f"Error looking up job signatures: {e}")
+            return []
+
+    def get_question_answer(self, question_key):
+        """Return (answer, source, profile_version, passed) for a question, or None"""
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                cur.execute(
+                    "SELECT answer, source, profile_version, passed FROM question_answers WHERE question_key = ?",
+                    (question_key,)
+                )
+                return cur.fetchone()
+        except Exception as e:
+            print(f"Error reading question answer: {e}")
+            return None
+
+    def save_question_answer(self, question_key, label, field_type, options_sig, answer, source, profile_version):
+        """Insert or replace the answer for a question; validation state is reset"""
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                cur.execute("""
+                    INSERT INTO question_answers
+                        (question_key, label, field_type, options_sig, answer, source, profile_version, passed, uses, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, NULL, 1, ?)
+                    ON CONFLICT(question_key) DO UPDATE SET
+                        answer = excluded.answer,
+                        source = excluded.source,
+                        profile_version = excluded.profile_version,
+                        passed = CASE WHEN question_answers.answer = excluded.answer
+                                      THEN question_answers.passed ELSE NULL END,
+                        uses = question_answers.uses + 1,
+                        timestamp = excluded.timestamp
+                """, (question_key, label, field_type, options_sig, answer, source, profile_version,
+                      datetime.utcnow().isoformat()))
+                self.conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error saving question answer: {e}")
+            return False
+
+    def get_answered_questions(self, limit=5000):
+        """Return (label, field_type, answer) of stored answers that have not failed validation"""
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                cur.execute("""
+                    SELECT label, field_type, answer FROM question_answers
+                    WHERE (passed IS NULL OR passed = 1) AND answer != ''
+                    ORDER BY uses DESC LIMIT ?
+                """, (limit,))
+                return cur.fetchall()
+        except Exception as e:
+            print(f"Error reading answered questions: {e}")
+            return []
+
+    def set_question_answers_passed(self, question_keys, passed):
+        """Record whether the form step these answers were used on passed validation"""
+        if not question_keys:
+            return
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                cur.executemany(
+                    "UPDATE question_answers SET passed = ? WHERE question_key = ?",
+                    [(1 if passed else 0, key) for key in question_keys]
+                )
+                self.conn.commit()
+        except Exception as e:
+            print(f"Error updating question answers: {e}")
+
+    def get_cached_ai_answer(self, cache_key):
+        """Return the cached AI answer for a key (and mark it used), or None"""
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                cur.execute("SELECT answer FROM ai_answer_cache WHERE cache_key = ?", (cache_key,))
+                row = cur.fetchone()
+                if row:
+                    cur.execute(
+                        "UPDATE ai_answer_cache SET hits = hits + 1, last_used = ? WHERE cache_key = ?",
+                        (datetime.utcnow().isoformat(), cache_key)
+                    )
+                    self.conn.commit()
+                return row[0] if row else None
+        except Exception as e:
+            print(f"Error reading AI answer cache: {e}")
+            return None
+
+    def save_cached_ai_answer(self, cache_key, model, profile_version, answer, max_entries=None):
+        """Store an AI answer; keeps only the ``max_entries`` most recently used rows"""
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                now = datetime.utcnow().isoformat()
+                cur.execute("""
+                    INSERT OR REPLACE INTO ai_answer_cache
+                        (cache_key, model, profile_version, answer, hits, created, last_used)
+                    VALUES (?, ?, ?, ?, 0, ?, ?)
+                """, (cache_key, model, profile_version, answer, now, now))
+                evicted = 0
+                if max_entries:
+                    cur.execute("""
+                        DELETE FROM ai_answer_cache WHERE cache_key IN (
+                            SELECT cache_key FROM ai_answer_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                        )
+                    """, (max_entries,))
+                    evicted = cur.rowcount
+                self.conn.commit()
+                return evicted
+        except Exception as e:
+            print(f"Error writing AI answer cache: {e}")
+            return 0
+
+    def clear_ai_answer_cache(self, keep_profile_version=None):
+        """Drop cached AI answers (all, or those made with another profile version)"""
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                if keep_profile_version is None:
+                    cur.execute("DELETE FROM ai_answer_cache")
+                else:
+                    cur.execute("DELETE FROM ai_answer_cache WHERE profile_version != ?", (keep_profile_version,))
+                self.conn.commit()
+                return cur.rowcount
+        except Exception as e:
+            print(f"Error clearing AI answer cache: {e}")
+            return 0
+
+    def get_job_texts(self, job_link, profile_version=None):
+        """Pre-generated texts of a job as {kind: text} (only those made with ``profile_version`` if given)"""
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                if profile_version is None:
+                    cur.execute("SELECT kind, text FROM job_texts WHERE job_link = ?", (job_link,))
+                else:
+                    cur.execute(
+                        "SELECT kind, text FROM job_texts WHERE job_link = ? AND profile_version = ?",
+                        (job_link, profile_version)
+                    )
+                return dict(cur.fetchall())
+        except Exception as e:
+            print(f"Error reading job texts: {e}")
+            return {}
+
+    def save_job_text(self, job_link, kind, text, model, profile_version):
+        try:
+            with _LOCK:
+                cur = self.conn.cursor()
+                cur.execute("""
+                    INSERT OR REPLACE INTO job_texts (job_link, kind, text, model, profile_version, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (job_link, kind, text, model, profile_version, datetime.utcnow().isoformat()))
+                self.conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error saving job text: {e}")
+            return False
+
+db = Database()
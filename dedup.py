@@ -0,0 +1,184 @@
+"""
+dedup.py
+Cross-site near-duplicate job detection with MinHash + LSH.
+
+The same role at the same company is often posted on several sites under
+different URLs. Each job is reduced to a MinHash signature over character
+shingles of its normalized title, company and location (plus description
+when available). Signatures are split into LSH bands; jobs sharing a band
+bucket are candidates, and a candidate counts as a duplicate when the
+estimated Jaccard similarity reaches the threshold.
+
+Buckets and signatures are persisted in SQLite (``job_minhash`` and
+``job_lsh_buckets``), so a lookup is one indexed query no matter how many
+postings have been seen across runs.
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from database import db
+
+NUM_PERM = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 4
+
+# One 64-bit seed per permutation, derived from a fixed string: signatures must be stable across runs
+_SEEDS = np.array([int.from_bytes(hashlib.blake2b(f"minhash-{i}".encode(), digest_size=8).digest(), "little")
+                   for i in range(NUM_PERM)], dtype=np.uint64)
+
+_COMPANY_SUFFIXES = re.compile(
+    r"\b(pvt|private|ltd|limited|llp|llc|inc|corp|corporation|co|company|"
+    r"technologies|technology|tech|solutions|services|software|india|global)\b"
+)
+_TITLE_ABBREVIATIONS = {"sr": "senior", "jr": "junior", "engg": "engineer", "dev": "developer"}
+_TITLE_NOISE = re.compile(r"\b(urgent|hiring|immediate joiner[s]?|wfh|work from home|remote|hybrid|new)\b")
+
+def _normalize(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9+#]+", (text or "").lower()))
+
+def normalized_fields(job: Dict) -> Tuple[str, str, str]:
+    """Title, company and location with site-specific noise removed"""
+    title = " ".join(_TITLE_ABBREVIATIONS.get(w, w) for w in _normalize(job.get("role")).split())
+    title = _TITLE_NOISE.sub(" ", title)
+    company = _COMPANY_SUFFIXES.sub(" ", _normalize(job.get("company")))
+    # "Bengaluru, Karnataka, India" vs "Bengaluru" -> compare on the city only
+    location = _normalize((job.get("location") or "").split(",")[0])
+    return " ".join(title.split()), " ".join(company.split()), location
+
+def shingles(job: Dict) -> List[str]:
+    """Character shingles of each field, prefixed so fields never mix"""
+    title, company, location = normalized_fields(job)
+    parts = [("t", title), ("c", company), ("l", location)]
+    description = _normalize(job.get("description"))
+    if description:
+        parts.append(("d", description[:2000]))
+
+    result = []
+    for prefix, text in parts:
+        if not text:
+            continue
+        if len(text) <= SHINGLE_SIZE:
+            result.append(f"{prefix}:{text}")
+            continue
+        result.extend(f"{prefix}:{text[i:i + SHINGLE_SIZE]}" for i in range(len(text) - SHINGLE_SIZE + 1))
+    return result
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: a full-avalanche 64-bit mix (uint64 arithmetic wraps)"""
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+def minhash_signature(tokens: List[str]) -> Optional[np.ndarray]:
+    """MinHash signature (NUM_PERM uint64 values) of a shingle set"""
+    if not tokens:
+        return None
+    hashes = np.fromiter((int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "little")
+                          for t in set(tokens)), dtype=np.uint64)
+    # Every permutation is the mix seeded with its own value -> shape (NUM_PERM, n_shingles)
+    permuted = _mix64(_SEEDS[:, None] ^ hashes[None, :])
+    return permuted.min(axis=1)
+
+def lsh_buckets(signature: np.ndarray) -> List[int]:
+    """One signed 64-bit bucket id per band (band index is mixed into the hash)"""
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(band.to_bytes(2, "little") + chunk.tobytes(), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+def estimated_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    return float(np.mean(sig_a == sig_b))
+
+def same_company(a: str, b: str) -> bool:
+    """Normalized company names share most of their words"""
+    words_a, words_b = set(a.split()), set(b.split())
+    if not words_a or not words_b:
+        return False
+    return len(words_a & words_b) / min(len(words_a), len(words_b)) >= 0.5
+
+class NearDuplicateIndex:
+    """Persistent near-duplicate index over discovered jobs"""
+
+    def __init__(self, threshold: float = 0.8, database=db):
+        self.threshold = threshold
+        self.db = database
+        self.duplicates_found = 0
+
+    def _signature(self, job: Dict) -> Tuple[Optional[np.ndarray], List[int]]:
+        # Without a company, same-title postings of different employers would collide
+        if not normalized_fields(job)[1]:
+            return None, []
+        signature = minhash_signature(shingles(job))
+        return signature, (lsh_buckets(signature) if signature is not None else [])
+
+    def find_duplicate(self, job: Dict) -> Optional[str]:
+        """Return the key of a remembered near-duplicate of ``job``, or None"""
+        signature, buckets = self._signature(job)
+        return self._find(job, signature, buckets, {})
+
+    def _is_match(self, job: Dict, company: str, signature: np.ndarray,
+                  key: str, other_company: str, other: np.ndarray) -> bool:
+        # Title/location alone can be near-identical across employers, so the
+        # company has to agree on its own as well
+        return (key != job.get("link")
+                and same_company(company, other_company)
+                and estimated_similarity(signature, other) >= self.threshold)
+
+    def _find(self, job: Dict, signature: Optional[np.ndarray], buckets: List[int],
+              pending: Dict[int, list]) -> Optional[str]:
+        """``pending`` holds in-memory buckets of jobs accepted but not persisted yet"""
+        if signature is None:
+            return None
+        company = normalized_fields(job)[1]
+
+        for bucket in buckets:
+            for key, other_company, other in pending.get(bucket, []):
+                if self._is_match(job, company, signature, key, other_company, other):
+                    return key
+
+        for key, _role, other_company, blob in self.db.find_minhash_candidates(buckets):
+            other = np.frombuffer(blob, dtype=np.uint64)
+            if self._is_match(job, company, signature, key, normalized_fields({"company": other_company})[1], other):
+                return key
+        return None
+
+    def filter_new(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Drop jobs that are near-duplicates of each other or of anything
+        remembered earlier (this run or previous runs). The first occurrence is kept.
+        """
+        unique = []
+        pending: Dict[int, List[Tuple[str, str, np.ndarray]]] = {}
+        for job in jobs:
+            signature, buckets = self._signature(job)
+            duplicate_of = self._find(job, signature, buckets, pending)
+            if duplicate_of:
+                self.duplicates_found += 1
+                print(f"⏭️  Skipping near-duplicate: {job.get('role')} @ {job.get('company')} (same as {duplicate_of})")
+                continue
+            if signature is not None:
+                entry = (job.get("link"), normalized_fields(job)[1], signature)
+                for bucket in buckets:
+                    pending.setdefault(bucket, []).append(entry)
+            unique.append(job)
+
+        if len(unique) != len(jobs):
+            print(f"Filtered {len(jobs) - len(unique)} near-duplicate jobs, {len(unique)} remaining")
+        return unique
+
+    def remember(self, job: Dict) -> bool:
+        """Persist ``job`` so later sites and runs treat its reposts as duplicates"""
+        signature, buckets = self._signature(job)
+        if signature is None or not job.get("link"):
+            return False
+        return self.db.add_minhash(job["link"], job.get("role"), job.get("company"),
+                                   signature.tobytes(), buckets)
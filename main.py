@@ -6,106 +6,40 @@ Orchestrator CLI. Use Playwright to search and attempt quick-applies across site
 import argparse
 from playwright.sync_api import sync_playwright
 from config import config
-from scrapers import linkedin, indeed
-from apply import LinkedInApply, get_new_jobs_only
+from sites import available_sites, get_enabled_sites, parse_site_list
+from apply.utils.job_filtering import get_new_jobs_only
+from scrapers.job_filter import get_job_filter
+from ranking import JobRanker
+from dedup import NearDuplicateIndex
+from answer_memory import answer_memory
+from answer_engine import answer_engine
+from bootstrap import Bootstrap
+from cover_notes import cover_notes
 from database import db
 import os
 from tqdm import tqdm
 import time
 import random
 
-# Site configuration mapping
-SITE_CONFIGS = {
-    "LinkedIn": {
-        "scraper": linkedin.search_jobs,
-        "applier_class": LinkedInApply,
-        "login_url": "https://www.linkedin.com/feed/",
-        "login_check": None,  # Will be defined in function
-        "apply_fn_name": "attempt_apply"
-    },
-    "Indeed": {
-        "scraper": indeed.search_jobs,
-        "applier_class": None,  # Not implemented in refactored version yet
-        "login_url": "https://www.indeed.com/",
-        "login_check": None,
-        "apply_fn_name": "attempt_apply"
-    }
-}
-
-def is_linkedin_logged_in(page):
-    """Check if user is logged in to LinkedIn"""
-    try:
-        # Check for common logged-in indicators
-        logged_in_indicators = [
-            "button:has-text('Start a post')",
-            "div.feed-identity-module",
-            "a[href*='/mynetwork/']",
-            "img.global-nav__me-photo",
-            "nav.global-nav"
-        ]
-        
-        for selector in logged_in_indicators:
-            if page.query_selector(selector) is not None:
-                return True
-        
-        # Additional check: Look for profile dropdown
-        try:
-            has_profile_menu = page.evaluate("""
-                () => {
-                    const menus = Array.from(document.querySelectorAll('div[data-control-name*="identity"]'));
-                    const profilePics = Array.from(document.querySelectorAll('img[alt*="Profile"]'));
-                    return menus.length > 0 || profilePics.length > 0;
-                }
-            """)
-            return has_profile_menu
-        except:
-            return False
-            
-    except:
-        return False
-
-def is_indeed_logged_in(page):
-    """Check if user is logged in to Indeed"""
-    try:
-        # Check for common logged-in indicators
-        logged_in_indicators = [
-            "a[href*='/account']",
-            "button:has-text('Account')",
-            "span.gnav-AccountMenu-userName",
-            "div.gnav-account-menu"
-        ]
-        
-        for selector in logged_in_indicators:
-            if page.query_selector(selector) is not None:
-                return True
-        
-        # Check URL for account pages
-        current_url = page.url
-        if '/account' in current_url or '/myjobs' in current_url:
-            return True
-            
-        return False
-    except:
-        return False
-
-def check_and_wait_for_login(page, site_name, site_config, headless=False):
+def check_and_wait_for_login(page, site, headless=False):
     """
     Check if user is logged in. If not, navigate to login page and wait.
     
     Args:
         page: Playwright page object
-        site_name: Name of the site (for display)
-        site_config: Configuration dict for the site
+        site: SitePlugin for the site
         headless: Whether browser is running in headless mode
     """
+    site_name = site.name
     print(f"\n{'='*60}")
     print(f"Checking {site_name} login status")
     print('='*60)
     
-    login_url = site_config["login_url"]
-    login_check_fn = site_config["login_check"]
+    login_url = site.login_url
     
     try:
+        login_check_fn = site.login_check
+        
         print(f"Navigating to {login_url}...")
         page.goto(login_url, timeout=45000, wait_until="domcontentloaded")
         time.sleep(3)
@@ -200,8 +134,8 @@ def setup_stealth_browser_context(playwright, user_data_dir, headless=False):
     # Additional stealth measures
     page = browser.new_page()
     
-    # Add stealth scripts to hide automation
-    page.add_init_script("""
+    # Add stealth scripts to hide automation (context-wide, so login probe tabs get them too)
+    browser.add_init_script("""
         // Override navigator properties
         Object.defineProperty(navigator, 'webdriver', {
             get: () => false,
@@ -233,14 +167,21 @@ def setup_stealth_browser_context(playwright, user_data_dir, headless=False):
     
     return browser, page
 
-def run_job_search_and_apply(max_per_site=5, headless=None):
+def run_job_search_and_apply(max_per_site=5, headless=None, sites=None):
     """
     Main routine:
     - Launch Playwright (persistent context per config.USER_DATA_DIR)
-    - For each site: check login, search, then for each job check DB and attempt quick-apply
+    - For each enabled site: check login, search, then for each job check DB and attempt quick-apply
     """
     headless = config.HEADLESS if headless is None else headless
     
+    # Only the enabled site plugins are imported
+    site_keys = sites if sites is not None else parse_site_list(config.SITES)
+    enabled_sites = get_enabled_sites(site_keys)
+    if not enabled_sites:
+        print(f"No valid sites enabled. Available sites: {', '.join(available_sites())}")
+        return
+    
     if headless:
         print("\n⚠  WARNING: Running in headless mode.")
         print("⚠  Some sites may have additional anti-bot measures in headless mode.")
@@ -249,22 +190,39 @@ def run_job_search_and_apply(max_per_site=5, headless=None):
     # Create user data directory if it doesn't exist
     os.makedirs(config.USER_DATA_DIR, exist_ok=True)
     
-    # Initialize site configs
-    SITE_CONFIGS["LinkedIn"]["login_check"] = is_linkedin_logged_in
-    SITE_CONFIGS["Indeed"]["login_check"] = is_indeed_logged_in
+    # Model warm-up, ranking profile and DB indexes load while the browser starts
+    bootstrap = Bootstrap(config)
+    bootstrap.start_background()
+    
+    # Same posting on several sites -> apply once
+    near_dups = NearDuplicateIndex(threshold=config.DEDUP_THRESHOLD)
     
     with sync_playwright() as p:
         # Setup browser with stealth
-        browser, page = setup_stealth_browser_context(p, config.USER_DATA_DIR, headless)
+        browser, page = bootstrap.run("browser launch", setup_stealth_browser_context, p, config.USER_DATA_DIR, headless)
+        
+        # All login pages at once, in their own tabs
+        probed_logins = bootstrap.probe_logins(browser, enabled_sites)
+        
+        # Profile vector inputs (resume text is extracted once per run)
+        ranker = bootstrap.result("ranker profile") or JobRanker.from_config(config)
+        bootstrap.report()
         
         logged_in_sites = {}
         site_appliers = {}
         
         # Initialize appliers for each site
-        for site_name, site_config in SITE_CONFIGS.items():
-            if site_config["applier_class"]:
+        for site in enabled_sites:
+            site_name = site.name
+            try:
+                applier_class = site.applier_class
+            except Exception as e:
+                print(f"✗ Failed to load {site_name} applier: {e}")
+                applier_class = None
+                site_appliers[site_name] = None
+            if applier_class:
                 try:
-                    applier = site_config["applier_class"](config)
+                    applier = applier_class(config)
                     site_appliers[site_name] = applier
                     print(f"✓ Initialized {site_name} applier")
                 except Exception as e:
@@ -272,13 +230,18 @@ def run_job_search_and_apply(max_per_site=5, headless=None):
                     site_appliers[site_name] = None
         
         # Process each site
-        for site_name, site_config in SITE_CONFIGS.items():
+        for site in enabled_sites:
+            site_name = site.name
             print(f"\n{'='*60}")
             print(f"PROCESSING: {site_name}")
             print('='*60)
             
-            # Check login status
-            logged_in = check_and_wait_for_login(page, site_name, site_config, headless)
+            # Check login status (manual login flow only if the start-up probe found none)
+            if probed_logins.get(site_name):
+                print(f"✓ Already logged in to {site_name}")
+                logged_in = True
+            else:
+                logged_in = check_and_wait_for_login(page, site, headless)
             logged_in_sites[site_name] = logged_in
             
             if not logged_in:
@@ -288,12 +251,17 @@ def run_job_search_and_apply(max_per_site=5, headless=None):
             # Perform job search
             print(f"\nSearching for jobs on {site_name}...")
             try:
-                jobs = site_config["scraper"](
+                site_limit = max_per_site
+                if site.max_per_run is not None:
+                    site_limit = min(site_limit, site.max_per_run)
+                # Scrape a larger pool so ranking has something to choose from; the scraper
+                # yields new jobs page by page, their links already canonical
+                jobs = list(site.scraper(
                     page, 
                     config.JOB_KEYWORDS or "software engineer", 
                     config.LOCATION or "India", 
-                    max_results=max_per_site
-                )
+                    max_results=site_limit * max(config.RANK_POOL_FACTOR, 1)
+                ))
                 print(f"✓ Found {len(jobs)} jobs on {site_name}")
             except Exception as e:
                 print(f"✗ Error searching {site_name}: {e}")
@@ -308,10 +276,28 @@ def run_job_search_and_apply(max_per_site=5, headless=None):
             new_jobs = get_new_jobs_only(jobs)
             print(f"Filtered to {len(new_jobs)} new jobs (skipped {len(jobs) - len(new_jobs)} already applied)")
             
+            # Drop reposts of jobs already applied to on any site
+            new_jobs = near_dups.filter_new(new_jobs)
+            
             if not new_jobs:
                 print(f"No new jobs to apply on {site_name}, moving to next site...")
                 continue
             
+            # Spend the per-site budget on the most relevant jobs
+            try:
+                new_jobs = ranker.rank(new_jobs, top_n=site_limit)
+                print(f"Ranked jobs by relevance, keeping top {len(new_jobs)}:")
+                for job in new_jobs:
+                    print(f"  {job['relevance']:.3f}  {job.get('role', 'N/A')} @ {job.get('company', 'N/A')}")
+            except Exception as e:
+                print(f"⚠ Ranking failed, using scrape order: {e}")
+                new_jobs = new_jobs[:site_limit]
+            
+            # Cover notes for these jobs are written while the first ones are applied to
+            # (jobs of a site without an applier are only recorded, so they need none)
+            if site_appliers.get(site_name):
+                cover_notes.queue(new_jobs)
+            
             # Apply to each job
             print(f"\nStarting application process for {len(new_jobs)} jobs...")
             
@@ -329,12 +315,13 @@ def run_job_search_and_apply(max_per_site=5, headless=None):
                 applier = site_appliers.get(site_name)
                 
                 if applier is None:
-                    print(f"Auto-apply not implemented for {site_name}, marking as skipped.")
+                    # Not "skipped": a found job is offered again and takes its real status once the site can apply
+                    print(f"Auto-apply not implemented for {site_name}, recording as found.")
                     db.add_job(
                         link, 
                         job.get("company", "Unknown"), 
                         job.get("role", "Unknown"), 
-                        status="skipped",
+                        status="found",
                         notes="No applier available"
                     )
                     continue
@@ -346,6 +333,7 @@ def run_job_search_and_apply(max_per_site=5, headless=None):
                     
                     if success:
                         print(f"✓ Successfully applied!")
+                        near_dups.remember(job)
                     else:
                         print(f"✗ Failed to apply or application skipped")
                         db.add_job(
@@ -370,18 +358,20 @@ def run_job_search_and_apply(max_per_site=5, headless=None):
                 
                 # Add delay between applications (human-like behavior)
                 if idx < len(new_jobs):
-                    delay = random.uniform(5, 10)
+                    delay = random.uniform(*site.apply_delay)
                     print(f"\nWaiting {delay:.1f} seconds before next application...")
                     time.sleep(delay)
         
+        cover_notes.shutdown()
+        
         # Close browser
         print("\nClosing browser...")
         browser.close()
         
         # Print session summary
-        print_summary(logged_in_sites)
+        print_summary(logged_in_sites, near_dups.duplicates_found)
 
-def print_summary(logged_in_sites):
+def print_summary(logged_in_sites, duplicates_found=0):
     """Print session summary"""
     print("\n" + "="*60)
     print("SESSION SUMMARY")
@@ -405,6 +395,16 @@ def print_summary(logged_in_sites):
     except:
         print("  Could not retrieve statistics.")
     
+    if duplicates_found:
+        print(f"\nCross-site duplicates skipped: {duplicates_found}")
+    
+    print(f"\nAnswer memory: {answer_memory.stats()}")
+    print(f"Answers by tier: {answer_engine.stats()}")
+    print(f"Cover notes: {cover_notes.stats()}")
+    
+    # Scrape-time filter hits
+    get_job_filter().print_summary()
+    
     print("="*60)
 
 def show_stats():
@@ -465,6 +465,7 @@ def main():
 Examples:
   %(prog)s apply --max 10 --no-headless   # Apply to up to 10 jobs per site with browser visible
   %(prog)s apply --headless               # Run in background (headless mode)
+  %(prog)s apply --sites linkedin,indeed  # Only run the listed sites
   %(prog)s stats                          # Show application statistics
   %(prog)s clear                          # Clear all application records
         """
@@ -480,6 +481,9 @@ Examples:
                              help="Run browser in headless mode (no visible window)")
     apply_parser.add_argument("--no-headless", action="store_true", 
                              help="Run browser with visible window")
+    apply_parser.add_argument("--sites", type=str, default=None,
+                             help=f"Comma separated sites to run (default: {config.SITES}; "
+                                  f"available: {', '.join(available_sites())})")
     
     # Stats command
     stats_parser = subparsers.add_parser("stats", help="Show application statistics")
@@ -514,7 +518,11 @@ Examples:
         print(f"Config: {args.max} jobs per site | Headless: {headless_mode if headless_mode is not None else 'config default'}")
         print("="*60 + "\n")
         
-        run_job_search_and_apply(max_per_site=args.max, headless=headless_mode)
+        run_job_search_and_apply(
+            max_per_site=args.max,
+            headless=headless_mode,
+            sites=parse_site_list(args.sites) if args.sites else None
+        )
         
     elif args.command == "stats":
         show_stats()
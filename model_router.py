@@ -0,0 +1,132 @@
+"""
+model_router.py
+Latency-aware routing of AI form questions across Ollama models.
+
+Classification-type questions (radio, select, checkbox, number, short
+text) go to the fast pool; free-text textareas prefer the large pool.
+Every call's latency and outcome is recorded per model. Within a pool,
+the router picks the model with the lowest rolling p50 whose p95 still
+fits the field's deadline, skipping models that keep failing. Models
+without enough samples yet are tried first so every model gets measured.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+LARGE_FIELD_TYPES = ("textarea",)
+
+class ModelStats:
+    """Rolling latency window and success counts of one model"""
+
+    def __init__(self, window: int = 50):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.available = True
+
+    def record(self, seconds: float, ok: bool):
+        self.outcomes.append(bool(ok))
+        if ok:
+            self.latencies.append(seconds)
+
+    @property
+    def samples(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def success_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 1.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        return float(np.percentile(np.fromiter(self.latencies, dtype=float), q))
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(95)
+
+class ModelRouter:
+    """Chooses a model per question from rolling p50/p95 and success stats"""
+
+    def __init__(self, fast_models: Iterable[str], large_models: Iterable[str] = (), deadline: float = 10.0,
+                 min_samples: int = 3, min_success: float = 0.5, window: int = 50):
+        self.fast_models: List[str] = [m for m in fast_models if m]
+        self.large_models: List[str] = [m for m in large_models if m]
+        self.deadline = deadline
+        self.min_samples = min_samples
+        self.min_success = min_success
+        self.stats: Dict[str, ModelStats] = {
+            model: ModelStats(window) for model in dict.fromkeys(self.fast_models + self.large_models)
+        }
+
+    @property
+    def models(self) -> List[str]:
+        return list(self.stats)
+
+    def set_available(self, names: Iterable[str]):
+        """Mark models Ollama does not have (per /api/tags) as unavailable"""
+        names = list(names)
+        for model, stats in self.stats.items():
+            stats.available = any(model == name or name.startswith(model + ":") for name in names)
+
+    def healthy(self, model: str) -> bool:
+        """Not failing too often (judged only after a few calls)"""
+        stats = self.stats[model]
+        return len(stats.outcomes) < self.min_samples or stats.success_rate >= self.min_success
+
+    def _pick(self, pool: List[str], deadline: float) -> Optional[str]:
+        candidates = [m for m in pool if self.stats[m].available]
+        if not candidates:
+            return None
+
+        # Measure every model a few times before trusting its percentiles
+        for model in candidates:
+            if self.stats[model].samples < self.min_samples and self.healthy(model):
+                return model
+
+        healthy = [m for m in candidates if self.healthy(m)] or candidates
+        fitting = [m for m in healthy if self.stats[m].p95 is not None and self.stats[m].p95 <= deadline]
+        if fitting:
+            return min(fitting, key=lambda m: self.stats[m].p50)
+        return None
+
+    def choose(self, field_type: str, deadline: Optional[float] = None) -> Optional[str]:
+        """
+        Model for a question of ``field_type`` that should answer within
+        ``deadline`` seconds (default: the configured per-field deadline).
+        Textareas prefer the large pool and fall back to the fast one.
+        Returns None when no model is available.
+        """
+        deadline = self.deadline if deadline is None else min(deadline, self.deadline)
+        pools = [self.large_models, self.fast_models] if field_type in LARGE_FIELD_TYPES else [self.fast_models]
+        for pool in pools:
+            model = self._pick(pool, deadline)
+            if model:
+                return model
+
+        # Nothing fits the deadline: take the fastest healthy model of any pool
+        candidates = [m for m in self.stats if self.stats[m].available]
+        if not candidates:
+            return None
+        healthy = [m for m in candidates if self.healthy(m)] or candidates
+        return min(healthy, key=lambda m: self.stats[m].p50 if self.stats[m].p50 is not None else 0.0)
+
+    def record(self, model: str, seconds: float, ok: bool):
+        if model in self.stats:
+            self.stats[model].record(seconds, ok)
+
+    def summary(self) -> str:
+        lines = []
+        for model, stats in self.stats.items():
+            if not stats.outcomes:
+                continue
+            lines.append(f"{model}: p50 {stats.p50 * 1000 if stats.p50 is not None else 0:.0f} ms, "
+                         f"p95 {stats.p95 * 1000 if stats.p95 is not None else 0:.0f} ms, "
+                         f"{stats.success_rate * 100:.0f}% ok over {len(stats.outcomes)} calls")
+        return "; ".join(lines) or "no model calls"
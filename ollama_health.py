@@ -0,0 +1,130 @@
+"""
+ollama_health.py
+Cached health state and circuit breaker for the Ollama backend.
+
+``available()`` answers from a cached /api/tags check that is only
+repeated after a TTL, so callers no longer pay a blocking request each
+time. Every model call reports its outcome: consecutive transport
+failures or calls slower than ``slow_after`` open the circuit, and while
+it is open AI work is refused at once so the form falls back to the
+non-AI answer tiers. After ``cooldown`` seconds the circuit goes
+half-open and a single probe (a health check or one request) decides
+whether it closes again or stays open for another cooldown.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+class OllamaHealth:
+    """TTL-cached availability plus a closed/open/half-open circuit breaker"""
+
+    def __init__(self, check: Callable[[], bool], ttl: float = 30.0, failure_threshold: int = 3,
+                 slow_after: float = 10.0, cooldown: float = 60.0):
+        self.check = check
+        self.ttl = ttl
+        self.failure_threshold = failure_threshold
+        self.slow_after = slow_after
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.status: Optional[bool] = None  # Last health check result
+        self.checked_at = 0.0
+        self.opened_at = 0.0
+        self.failures = 0  # Consecutive
+        self.trial_running = False
+        self.times_opened = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    # Transitions (call with the lock held)
+
+    def _open(self, reason: str):
+        if self.state != OPEN:
+            self.times_opened += 1
+            print(f"🔌 Ollama circuit open ({reason}); AI answers skipped for {self.cooldown:.0f} s")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.trial_running = False
+
+    def _close(self):
+        if self.state != CLOSED:
+            print("✓ Ollama circuit closed; AI answers back on")
+        self.state = CLOSED
+        self.failures = 0
+        self.trial_running = False
+
+    def _cooled_down(self) -> bool:
+        return time.monotonic() - self.opened_at >= self.cooldown
+
+    # Health check
+
+    def available(self, force: bool = False) -> bool:
+        """
+        Whether Ollama can be used. Answers from the cached check within the
+        TTL and without any request while the circuit is open; once the
+        cooldown is over the health check is the half-open probe.
+        """
+        with self._lock:
+            if self.state == OPEN and not self._cooled_down():
+                return False
+            fresh = time.monotonic() - self.checked_at < self.ttl
+            if self.state == CLOSED and self.status is not None and fresh and not force:
+                return self.status
+
+        try:
+            ok = bool(self.check())
+        except Exception:
+            ok = False
+
+        with self._lock:
+            self.status = ok
+            self.checked_at = time.monotonic()
+            if ok:
+                self._close()
+            else:
+                self._open("health check failed")
+        return ok
+
+    # Request gate
+
+    def allow(self) -> bool:
+        """May a model request go out now? Every True must be followed by ``record``"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._cooled_down():
+                self.state = HALF_OPEN
+                print("🔌 Ollama circuit half-open; probing with one request")
+            if self.state == HALF_OPEN and not self.trial_running:
+                self.trial_running = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, seconds: float, ok: bool, slow_after: Optional[float] = None):
+        """
+        Outcome of an allowed request. Transport failures and calls slower
+        than ``slow_after`` (default: the breaker's) count as failures.
+        """
+        limit = self.slow_after if slow_after is None else slow_after
+        slow = ok and seconds > limit
+        with self._lock:
+            if ok and not slow:
+                self._close()
+                return
+            self.failures += 1
+            reason = f"call took {seconds:.1f} s" if slow else f"{self.failures} consecutive failures"
+            if self.state == HALF_OPEN:
+                self._open(f"probe failed, {reason}")
+            elif self.failures >= self.failure_threshold:
+                self._open(reason)
+
+    def summary(self) -> str:
+        text = f"circuit {self.state}"
+        if self.times_opened:
+            text += f", opened {self.times_opened}x, {self.rejected} requests skipped"
+        return text
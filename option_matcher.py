@@ -0,0 +1,154 @@
+"""
+option_matcher.py
+Pick the option of a select, radio group or typeahead that best fits an answer.
+
+The whole option list is scored in Python in one go:
+
+- exact text (after normalization) wins outright
+- synonyms count as equal ("true" is "yes", "immediate" is "0 days")
+- numeric answers are matched against ranges parsed from the options
+  ("1-3 years", "0-15 days", "5+ LPA", "less than 1 year", "1 month")
+- everything else falls back to token-set similarity
+
+so callers select the winner directly instead of trying labels one by
+one and catching the failures.
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+INF = float("inf")
+
+# Whole answers that mean the same thing; the first entry is the canonical form
+SYNONYMS = [
+    ("yes", "true", "y", "yeah", "i do", "i am", "i have", "authorized"),
+    ("no", "false", "n", "nope", "i do not", "i am not", "i have not"),
+    ("bachelors", "be", "b e", "graduate"),
+    ("masters", "me", "m e"),
+]
+_CANONICAL = {phrase: group[0] for group in SYNONYMS for phrase in group}
+
+# Phrases replaced wherever they occur in an answer or option ("Bachelor's Degree", "Bangalore, India")
+PHRASE_SYNONYMS = [
+    ("0 days", "immediate joiner", "immediately", "immediate", "no notice period", "serving notice"),
+    ("bachelors", "bachelor s", "bachelor", "b tech", "btech", "b.tech", "bsc", "b sc", "b.sc", "undergraduate"),
+    ("masters", "master s", "master", "m tech", "mtech", "m.tech", "msc", "m sc", "m.sc", "post graduate",
+     "postgraduate"),
+    ("bengaluru", "bangalore"),
+    ("mumbai", "bombay"),
+    ("gurugram", "gurgaon"),
+    ("chennai", "madras"),
+    ("kolkata", "calcutta"),
+]
+_PHRASES = sorted(((phrase, group[0]) for group in PHRASE_SYNONYMS for phrase in group[1:]),
+                  key=lambda item: -len(item[0]))
+_PHRASE_RE = re.compile(r"(?<![a-z0-9])(" + "|".join(re.escape(p) for p, _ in _PHRASES) + r")(?![a-z0-9])")
+_PHRASE_MAP = dict(_PHRASES)
+
+# Unit words -> (unit, factor to the base unit); notice periods are compared in days
+UNITS = {
+    "year": ("years", 1), "years": ("years", 1), "yr": ("years", 1), "yrs": ("years", 1),
+    "month": ("days", 30), "months": ("days", 30),
+    "week": ("days", 7), "weeks": ("days", 7),
+    "day": ("days", 1), "days": ("days", 1),
+    "lpa": ("lpa", 1), "lakh": ("lpa", 1), "lakhs": ("lpa", 1), "lac": ("lpa", 1), "lacs": ("lpa", 1),
+}
+
+_NUMBER = r"(\d+(?:\.\d+)?)"
+_UNIT = r"\s*(years?|yrs?|months?|weeks?|days?|lpa|lakhs?|lacs?)?"
+
+def normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9.+<>-]+", " ", str(text or "").lower()).split())
+
+def canonical(text: str) -> str:
+    text = _PHRASE_RE.sub(lambda m: _PHRASE_MAP[m.group(1)], normalize(text))
+    return _CANONICAL.get(text, text)
+
+def _unit(word: Optional[str]) -> Tuple[Optional[str], float]:
+    return UNITS.get(word, (None, 1)) if word else (None, 1)
+
+def parse_range(text: str) -> Optional[Tuple[float, float, Optional[str]]]:
+    """
+    (low, high, unit) of a numeric option or answer, in the unit's base
+    (months/weeks become days), or None if it has no number
+    """
+    text = canonical(text)
+    patterns = (
+        (rf"{_NUMBER}\s*(?:-|to)\s*{_NUMBER}{_UNIT}", lambda a, b: (a, b)),
+        (rf"(?:less than|under|below|up to|upto|within|<)\s*{_NUMBER}{_UNIT}", lambda a: (0.0, a)),
+        (rf"(?:more than|over|above|at least|>)\s*{_NUMBER}{_UNIT}", lambda a: (a, INF)),
+        (rf"{_NUMBER}\s*(?:\+|or more|and above){_UNIT}", lambda a: (a, INF)),
+        (rf"{_NUMBER}\s*\+?{_UNIT}", lambda a: (a, a)),
+    )
+    for pattern, bounds in patterns:
+        match = re.search(pattern, text)
+        if not match:
+            continue
+        *numbers, unit_word = match.groups()
+        unit, factor = _unit(unit_word)
+        low, high = bounds(*(float(n) for n in numbers))
+        return low * factor, high * factor, unit
+    return None
+
+def token_set_ratio(a: str, b: str) -> float:
+    """Similarity of two strings as token sets (word order and repeats do not matter), 0..1"""
+    tokens_a, tokens_b = set(normalize(a).split()), set(normalize(b).split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    common = " ".join(sorted(tokens_a & tokens_b))
+    rest_a = " ".join(sorted(tokens_a - tokens_b))
+    rest_b = " ".join(sorted(tokens_b - tokens_a))
+    full_a = f"{common} {rest_a}".strip()
+    full_b = f"{common} {rest_b}".strip()
+    ratios = [SequenceMatcher(None, full_a, full_b).ratio()]
+    if common:
+        ratios.append(SequenceMatcher(None, common, full_a).ratio())
+        ratios.append(SequenceMatcher(None, common, full_b).ratio())
+    return max(ratios)
+
+def score_option(answer: str, option: str) -> float:
+    """How well ``option`` represents ``answer``, 0..1"""
+    if normalize(answer) == normalize(option):
+        return 1.0
+    if canonical(answer) == canonical(option):
+        return 0.95
+
+    wanted, offered = parse_range(answer), parse_range(option)
+    if wanted and offered:
+        (value, _, wanted_unit), (low, high, offered_unit) = wanted, offered
+        if wanted_unit and offered_unit and wanted_unit != offered_unit:
+            return 0.0
+        if low <= value <= high:
+            # Narrower ranges are more specific ("2 years" over "1-3 years" over "1+ years")
+            width = high - low
+            return 0.9 - min(width / (width + 10), 1.0) * 0.1 if width != INF else 0.8
+        return 0.0
+    if wanted or offered:
+        # A number against a word ("2" vs "Yes") is never a match
+        if canonical(option) in ("yes", "no") or canonical(answer) in ("yes", "no"):
+            return 0.0
+
+    return token_set_ratio(canonical(answer), canonical(option)) * 0.85
+
+def best_option(answers: Union[str, Iterable[str]], options: Sequence[str],
+                min_score: float = 0.6) -> Optional[Tuple[int, float]]:
+    """
+    (index, score) of the option that best fits the answers (the first
+    answer is preferred on ties), or None if nothing reaches ``min_score``
+    """
+    answers = [answers] if isinstance(answers, str) else [str(a) for a in answers if a is not None]
+    best: Optional[Tuple[int, float]] = None
+    for rank, answer in enumerate(answers):
+        for index, option in enumerate(options):
+            if not normalize(option):
+                continue
+            score = score_option(answer, option) - rank * 1e-3
+            if score >= min_score and (best is None or score > best[1]):
+                best = (index, score)
+    return best
+
+def pick(answers: Union[str, Iterable[str]], options: Sequence[str], min_score: float = 0.6) -> Optional[str]:
+    """The best fitting option itself, or None"""
+    found = best_option(answers, options, min_score)
+    return options[found[0]] if found else None
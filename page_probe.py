@@ -0,0 +1,170 @@
+"""
+page_probe.py
+Lightweight page-state probe.
+
+Instead of serializing the whole DOM with ``page.content()`` and searching
+it in Python, ``probe_page`` runs one ``page.evaluate`` that inspects the
+page in place and returns a compact ``PageState``: challenge/blocked flag,
+job card count, modal presence, success text, visible error count, the
+current step/progress and which of the requested phrases are present.
+"""
+
+from playwright.sync_api import Page
+from typing import Dict, List, Optional
+
+# Cloudflare/anti-bot text shown on interstitial pages
+BLOCKED_PHRASES = [
+    "just a moment",
+    "checking your browser",
+    "verify you are human",
+]
+
+SUCCESS_PHRASES = [
+    "application sent",
+    "application submitted",
+    "your application was sent",
+    "successfully submitted",
+    "application complete",
+]
+
+MODAL_SELECTORS = [
+    "div.jobs-easy-apply-modal",
+    "div[role='dialog']",
+    "div.artdeco-modal",
+]
+
+ERROR_SELECTORS = [
+    "div.artdeco-inline-feedback--error",
+    "div.icl-Alert--error",
+    "div.error-message",
+    "span.error",
+    "[role='alert'][aria-live='assertive']",
+]
+
+_PROBE_JS = """
+({cardSelectors, modalSelectors, errorSelectors, successPhrases, blockedPhrases, phrases}) => {
+    const visible = (el) => !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+    const body = document.body;
+    const text = ((body && body.innerText) || '').toLowerCase();
+    const title = (document.title || '').toLowerCase();
+
+    let cardCount = 0;
+    for (const sel of cardSelectors) {
+        const n = document.querySelectorAll(sel).length;
+        if (n) { cardCount = n; break; }
+    }
+
+    let modal = null;
+    for (const sel of modalSelectors) {
+        const el = document.querySelector(sel);
+        if (visible(el)) { modal = el; break; }
+    }
+
+    let errorCount = 0;
+    if (errorSelectors.length) {
+        document.querySelectorAll(errorSelectors.join(',')).forEach(el => {
+            if (visible(el) && (el.innerText || '').trim()) errorCount++;
+        });
+    }
+
+    const challenge = !!document.querySelector(
+        'iframe[src*="challenge-platform"], script[src*="challenge-platform"], ' +
+        '#challenge-form, #challenge-running, #cf-browser-verification, .cf-browser-verification'
+    );
+    const blocked = challenge || blockedPhrases.some(p => title.includes(p) || text.includes(p));
+
+    let progress = null;
+    let step = '';
+    const scope = modal || document;
+    const bar = scope.querySelector('progress[value], [role="progressbar"][aria-valuenow]');
+    if (bar) {
+        const value = parseFloat(bar.getAttribute('value') || bar.getAttribute('aria-valuenow'));
+        const max = parseFloat(bar.getAttribute('max') || bar.getAttribute('aria-valuemax') || '100');
+        if (!isNaN(value) && max) progress = Math.round(value * 100 / max);
+    }
+    if (modal) {
+        const heading = modal.querySelector('h3, h2');
+        step = heading ? (heading.innerText || '').trim() : '';
+    }
+
+    return {
+        url: location.href,
+        blocked: blocked,
+        card_count: cardCount,
+        modal_present: !!modal,
+        success_found: successPhrases.some(p => text.includes(p)),
+        error_count: errorCount,
+        step: step,
+        progress: progress,
+        phrases: phrases.filter(p => text.includes(p))
+    };
+}
+"""
+
+class PageState:
+    """Compact snapshot of what the probe found on the page"""
+
+    __slots__ = ("ok", "url", "blocked", "card_count", "modal_present", "success_found",
+                 "error_count", "step", "progress", "phrases")
+
+    def __init__(self, ok: bool = True, url: str = "", blocked: bool = False, card_count: int = 0,
+                 modal_present: bool = False, success_found: bool = False,
+                 error_count: int = 0, step: str = "", progress: Optional[int] = None,
+                 phrases: Optional[List[str]] = None):
+        self.ok = ok
+        self.url = url
+        self.blocked = blocked
+        self.card_count = card_count
+        self.modal_present = modal_present
+        self.success_found = success_found
+        self.error_count = error_count
+        self.step = step
+        self.progress = progress
+        self.phrases = phrases or []
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PageState":
+        return cls(**{key: data.get(key) for key in cls.__slots__ if key in data})
+
+    def has_phrase(self, phrase: str) -> bool:
+        return phrase.lower() in self.phrases
+
+    def __repr__(self):
+        return (f"PageState(blocked={self.blocked}, cards={self.card_count}, "
+                f"modal={self.modal_present}, success={self.success_found}, "
+                f"errors={self.error_count}, progress={self.progress}, phrases={self.phrases})")
+
+def probe_page(page: Page, phrases: Optional[List[str]] = None,
+               card_selectors: Optional[List[str]] = None,
+               modal_selectors: Optional[List[str]] = None,
+               success_phrases: Optional[List[str]] = None,
+               error_selectors: Optional[List[str]] = None,
+               blocked_phrases: Optional[List[str]] = None) -> PageState:
+    """
+    Probe the page state in a single ``evaluate``.
+
+    Args:
+        page: Playwright page
+        phrases: Extra lowercase phrases to look for in the visible text
+        card_selectors: Job card selectors; the first that matches gives ``card_count``
+        modal_selectors: Selectors whose first visible match counts as the modal
+        success_phrases: Phrases that mark a completed application
+        error_selectors: Selectors for visible validation/error messages
+        blocked_phrases: Phrases that mark an anti-bot interstitial
+
+    Returns:
+        PageState (``ok`` is False if the page could not be evaluated, e.g. mid-navigation)
+    """
+    try:
+        data = page.evaluate(_PROBE_JS, {
+            "cardSelectors": card_selectors or [],
+            "modalSelectors": MODAL_SELECTORS if modal_selectors is None else modal_selectors,
+            "errorSelectors": ERROR_SELECTORS if error_selectors is None else error_selectors,
+            "successPhrases": [p.lower() for p in (success_phrases or SUCCESS_PHRASES)],
+            "blockedPhrases": [p.lower() for p in (blocked_phrases or BLOCKED_PHRASES)],
+            "phrases": [p.lower() for p in (phrases or [])],
+        })
+        return PageState.from_dict(data)
+    except Exception as e:
+        print(f"⚠ Page probe failed: {str(e)[:80]}")
+        return PageState(ok=False, url=getattr(page, "url", ""))
@@ -0,0 +1,162 @@
+"""
+question_rules.py
+Compiled screening-question classifier shared by the LinkedIn and Indeed fillers.
+
+Rules live in ``question_rules.json`` (pattern list -> rule name, category,
+answer key, priority, allowed field types). Every pattern of every rule is
+compiled into one Aho-Corasick automaton over word tokens, so a label is
+classified in a single pass over its words no matter how many rules exist,
+and matches always sit on word boundaries. The highest priority rule
+allowed for the field type wins (longer match, then file order break ties).
+"""
+
+import json
+import os
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_rules.json")
+
+FIELD_TYPES = ("text", "number", "select", "radio", "checkbox", "textarea")
+
+# "node.js" -> ["node", ".js"], "asp.net" -> ["asp", ".net"], "c#" -> ["c#"]
+_TOKEN_RE = re.compile(r"\.?[a-z0-9+#]+")
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+def field_kind(tag: str, input_type: str = "") -> str:
+    """Map a tag/type pair to the field types used by the rules"""
+    tag = (tag or "").lower()
+    input_type = (input_type or "").lower()
+    if tag in ("select", "textarea"):
+        return tag
+    if input_type in ("radio", "checkbox", "number"):
+        return input_type
+    return "text"
+
+class QuestionRule:
+    """One row of the rules table"""
+
+    __slots__ = ("name", "category", "answer", "priority", "field_types", "order")
+
+    def __init__(self, name: str, category: str, answer: Optional[str] = None, priority: int = 0,
+                 field_types: Optional[Iterable[str]] = None, order: int = 0):
+        self.name = name
+        self.category = category
+        self.answer = answer
+        self.priority = priority
+        self.field_types = frozenset(field_types) if field_types else None
+        self.order = order
+
+    def allows(self, field_type: Optional[str]) -> bool:
+        return field_type is None or self.field_types is None or field_type in self.field_types
+
+    def __repr__(self):
+        return f"QuestionRule({self.name}, {self.category}, priority={self.priority})"
+
+class _Automaton:
+    """Aho-Corasick automaton whose alphabet is word tokens"""
+
+    def __init__(self, patterns: Iterable[Tuple[List[str], int, int]]):
+        # Node 0 is the root; goto[node] maps a token to the next node
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[Tuple[int, int]]] = [[]]  # (match length in chars, payload)
+
+        for tokens, length, payload in patterns:
+            node = 0
+            for token in tokens:
+                nxt = self.goto[node].get(token)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][token] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append((length, payload))
+
+        # Breadth-first fail links; outputs of the fail target are merged in
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, nxt in self.goto[node].items():
+                queue.append(nxt)
+                fallback = self.fail[node]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(token, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter_matches(self, tokens: List[str]):
+        """Yield (match length, payload) for every pattern occurrence"""
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        for token in tokens:
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if out[node]:
+                yield from out[node]
+
+class QuestionClassifier:
+    """Classifies field labels with the compiled rules table"""
+
+    def __init__(self, rules: List[QuestionRule], patterns: List[Tuple[List[str], int, int]]):
+        self.rules = rules
+        self.automaton = _Automaton(patterns)
+
+    @classmethod
+    def from_file(cls, path: str = RULES_PATH) -> "QuestionClassifier":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls.from_rows(data.get("rules", []))
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict]) -> "QuestionClassifier":
+        rules, patterns = [], []
+        for order, row in enumerate(rows):
+            rule = QuestionRule(row["name"], row.get("category", row["name"]), row.get("answer"),
+                                int(row.get("priority", 0)), row.get("field_types"), order)
+            rules.append(rule)
+            for pattern in row.get("patterns", []):
+                tokens = tokenize(pattern)
+                if tokens:
+                    patterns.append((tokens, len(pattern), order))
+        return cls(rules, patterns)
+
+    def matches(self, text: str, field_type: Optional[str] = None) -> List[Tuple[QuestionRule, int]]:
+        """All (rule, match length) hits allowed for ``field_type``, in text order"""
+        rules = self.rules
+        return [(rules[order], length) for length, order in self.automaton.iter_matches(tokenize(text))
+                if rules[order].allows(field_type)]
+
+    def classify(self, text: str, field_type: Optional[str] = None) -> Optional[QuestionRule]:
+        """Best rule for a label/context, or None when nothing matches"""
+        rules = self.rules
+        best = None
+        best_key = None
+        for length, order in self.automaton.iter_matches(tokenize(text)):
+            rule = rules[order]
+            if not rule.allows(field_type):
+                continue
+            key = (rule.priority, length, -order)
+            if best_key is None or key > best_key:
+                best, best_key = rule, key
+        return best
+
+    def category(self, text: str, field_type: Optional[str] = None, default: str = "unknown") -> str:
+        rule = self.classify(text, field_type)
+        return rule.category if rule else default
+
+_classifier: Optional[QuestionClassifier] = None
+
+def get_classifier() -> QuestionClassifier:
+    """Process-wide classifier compiled from the rules file on first use"""
+    global _classifier
+    if _classifier is None:
+        _classifier = QuestionClassifier.from_file()
+    return _classifier
@@ -0,0 +1,123 @@
+"""
+ranking.py
+Relevance ranking of scraped jobs against the resume and config.SKILLS.
+
+Jobs are vectorized with sparse TF-IDF and scored in one batch against a
+profile query built from SKILLS, JOB_KEYWORDS and the resume text. The
+scrapers only collect job cards, so in practice a job is ranked on its
+title; a ``description``, where one is present, is added with the title
+weighted above it. The apply loop then spends its daily
+budget on the best matches instead of on whatever was scraped first.
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tfidf import CsrMatrix, SparseTfidf
+
+# Relative weight of each profile part in the query vector
+SKILLS_WEIGHT = 2.0
+KEYWORDS_WEIGHT = 1.5
+RESUME_WEIGHT = 1.0
+
+_resume_cache: Dict[str, str] = {}
+
+def extract_resume_text(path: str) -> str:
+    """
+    Extract text from the resume once per file version.
+    PDF support needs ``pypdf`` (or ``PyPDF2``); plain-text resumes are read directly.
+    """
+    if not path:
+        return ""
+    if not os.path.exists(path):
+        print(f"⚠ Resume {path} not found; ranking uses SKILLS and JOB_KEYWORDS only")
+        return ""
+
+    cache_key = f"{os.path.abspath(path)}:{os.path.getmtime(path)}"
+    if cache_key in _resume_cache:
+        return _resume_cache[cache_key]
+
+    text = ""
+    try:
+        if path.lower().endswith(".pdf"):
+            try:
+                from pypdf import PdfReader
+            except ImportError:
+                try:
+                    from PyPDF2 import PdfReader
+                except ImportError:
+                    print("⚠ Install pypdf to use the resume for ranking; using SKILLS only")
+                    PdfReader = None
+            if PdfReader:
+                reader = PdfReader(path)
+                text = "\n".join(page.extract_text() or "" for page in reader.pages)
+        else:
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                text = f.read()
+    except Exception as e:
+        print(f"⚠ Could not read resume for ranking: {e}")
+
+    if not text.strip():
+        print(f"⚠ No text extracted from resume {path}; ranking uses SKILLS and JOB_KEYWORDS only")
+    _resume_cache[cache_key] = text
+    return text
+
+def job_text(job: Dict) -> str:
+    """
+    Text used to vectorize a job: the title, which is all the scrapers
+    collect; with a description the title is repeated to outweigh it
+    """
+    role = job.get("role") or ""
+    description = job.get("description") or ""
+    return f"{role} {role} {description}" if description else role
+
+class JobRanker:
+    """Scores jobs against a fixed profile"""
+
+    def __init__(self, skills: str = "", keywords: str = "", resume_text: str = ""):
+        self.profile_parts = [
+            (skills.replace(",", " "), SKILLS_WEIGHT),
+            (keywords.replace(",", " "), KEYWORDS_WEIGHT),
+            (resume_text, RESUME_WEIGHT),
+        ]
+
+    @classmethod
+    def from_config(cls, config) -> "JobRanker":
+        return cls(
+            skills=getattr(config, "SKILLS", ""),
+            keywords=getattr(config, "JOB_KEYWORDS", ""),
+            resume_text=extract_resume_text(getattr(config, "RESUME_PATH", "")),
+        )
+
+    def vectorize(self, jobs: List[Dict]) -> Tuple[CsrMatrix, np.ndarray]:
+        """TF-IDF matrix of the jobs plus the profile query in the same space"""
+        vectorizer = SparseTfidf()
+        matrix = vectorizer.fit_transform(job_text(job) for job in jobs)
+        return matrix, vectorizer.query_vector(self.profile_parts)
+
+    def score(self, jobs: List[Dict]) -> np.ndarray:
+        """Cosine similarity of every job to the profile, in one batch"""
+        if not jobs:
+            return np.zeros(0)
+        matrix, query = self.vectorize(jobs)
+        return matrix.dot(query)
+
+    def rank(self, jobs: List[Dict], top_n: Optional[int] = None) -> List[Dict]:
+        """
+        Return jobs sorted by relevance (best first), each annotated with a
+        ``relevance`` score. Ties keep scrape order.
+        """
+        if not jobs:
+            return []
+        scores = self.score(jobs)
+        order = np.argsort(-scores, kind="stable")
+        if top_n is not None:
+            order = order[:top_n]
+        ranked = []
+        for i in order:
+            job = jobs[i]
+            job["relevance"] = round(float(scores[i]), 4)
+            ranked.append(job)
+        return ranked
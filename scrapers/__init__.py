@@ -4,12 +4,12 @@ Expose scraper modules so callers can use the module attributes
 (e.g. ``linkedin.search_jobs``) rather than binding the function
 directly to the package name. This keeps the API consistent with
 how ``main.py`` expects to access ``search_jobs``.
+
+Modules are imported lazily on first attribute access so that a run
+only loads the scrapers of the sites it has enabled.
 """
 
-from . import linkedin
-from . import indeed
-from . import naukri
-from . import glassdoor
+import importlib
 
 __all__ = [
     "linkedin",
@@ -17,3 +17,10 @@ __all__ = [
     "naukri",
     "glassdoor",
 ]
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,166 @@
+"""
+extraction.py
+Batched job-card extraction shared by all site scrapers.
+
+A results page is read with a single ``page.evaluate`` call that returns
+plain records for every card, instead of several ``query_selector`` /
+``inner_text`` round trips per card. Scrapers then canonicalize links and
+dedup the records in Python.
+"""
+
+from playwright.sync_api import Page
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import urllib.parse
+from database import db
+from .job_filter import get_job_filter
+
+_EXTRACT_CARDS_JS = """
+({cardSelectors, fields, idAttribute}) => {
+    let cards = [];
+    let used = null;
+    for (const sel of cardSelectors) {
+        const found = document.querySelectorAll(sel);
+        if (found.length) {
+            cards = Array.from(found);
+            used = sel;
+            break;
+        }
+    }
+
+    const text = (el) => el ? (el.innerText || el.textContent || '').trim() : '';
+    const first = (card, selectors) => {
+        for (const sel of selectors || []) {
+            const el = card.querySelector(sel);
+            if (el) return el;
+        }
+        return null;
+    };
+
+    return {
+        selector: used,
+        cards: cards.map(card => {
+            const linkEl = card.matches('a[href]') ? card : first(card, fields.link);
+            let jobId = null;
+            if (idAttribute) {
+                jobId = card.getAttribute(idAttribute)
+                    || (linkEl && linkEl.getAttribute(idAttribute))
+                    || null;
+            }
+            const lines = (card.innerText || '')
+                .split('\\n')
+                .map(s => s.trim())
+                .filter(Boolean)
+                .slice(0, 4);
+            return {
+                role: text(first(card, fields.role)),
+                company: text(first(card, fields.company)),
+                location: text(first(card, fields.location)),
+                link: linkEl ? linkEl.getAttribute('href') : null,
+                job_id: jobId,
+                lines: lines
+            };
+        })
+    };
+}
+"""
+
+
+def extract_cards(page: Page, card_selectors: List[str], fields: Dict[str, List[str]],
+                  id_attribute: Optional[str] = None) -> Tuple[Optional[str], List[Dict]]:
+    """
+    Extract every job card on the current page in one round trip.
+
+    Args:
+        page: Playwright page showing a results list
+        card_selectors: Card selectors tried in order; the first one that matches wins
+        fields: Mapping of ``role``/``company``/``location``/``link`` to selector lists
+        id_attribute: Optional attribute holding the site's job id (e.g. ``data-jk``)
+
+    Returns:
+        (selector that matched, list of raw card records)
+    """
+    try:
+        result = page.evaluate(_EXTRACT_CARDS_JS, {
+            "cardSelectors": card_selectors,
+            "fields": fields,
+            "idAttribute": id_attribute,
+        })
+    except Exception as e:
+        print(f"Error extracting job cards: {e}")
+        return None, []
+
+    return result.get("selector"), result.get("cards") or []
+
+
+def canonicalize_url(link: Optional[str], base_url: str, keep_params: Iterable[str] = ()) -> Optional[str]:
+    """
+    Normalize a job link: make it absolute, lowercase the host and drop
+    tracking query parameters and fragments. Only ``keep_params`` survive.
+    """
+    if not link:
+        return None
+
+    absolute = urllib.parse.urljoin(base_url.rstrip("/") + "/", link.strip())
+    parts = urllib.parse.urlsplit(absolute)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+
+    keep = set(keep_params)
+    query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query) if k in keep]
+    return urllib.parse.urlunsplit((
+        parts.scheme,
+        parts.netloc.lower(),
+        parts.path,
+        urllib.parse.urlencode(query),
+        "",
+    ))
+
+
+def known_job_links() -> Set[str]:
+    """Links already recorded as applied, used to seed per-run dedup"""
+    return set(db.get_applied_job_links())
+
+
+def iter_new_jobs(records: List[Dict], canonicalize: Callable[[Optional[str]], Optional[str]],
+                  seen: Set[str], default_location: str = "") -> Iterator[Dict]:
+    """
+    Turn raw card records into job dicts, skipping links in ``seen``.
+
+    ``seen`` is updated in place so callers can share it across result
+    pages (and seed it with ``known_job_links()`` to dedup against the DB).
+    Cards rejected by the configured title/company/location filter are
+    dropped here and never reach the apply loop.
+    """
+    job_filter = get_job_filter()
+    
+    for record in records:
+        link = canonicalize(record.get("link"))
+        if not link or link in seen:
+            continue
+
+        role_text = (record.get("role") or "").strip()
+        company_text = (record.get("company") or "").strip()
+        location_text = (record.get("location") or "").strip()
+
+        # Fallback: first card lines are usually role, company, location
+        lines = record.get("lines") or []
+        if not role_text and len(lines) >= 1:
+            role_text = lines[0]
+        if not company_text and len(lines) >= 2:
+            company_text = lines[1]
+        if not location_text and len(lines) >= 3:
+            location_text = lines[2]
+
+        if not role_text:
+            continue
+
+        seen.add(link)
+        job = {
+            "role": role_text,
+            "company": company_text,
+            "location": location_text or default_location,
+            "link": link
+        }
+        if not job_filter.accept(job):
+            continue
+        yield job
@@ -6,45 +6,116 @@ Glassdoor has rate-limits and anti-bot measures. Use carefully.
 """
 
 from playwright.sync_api import Page
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 import time
 import urllib.parse
+from .extraction import extract_cards, canonicalize_url, known_job_links, iter_new_jobs
 
-def search_jobs(page: Page, role: str, location: str, max_results: int = 10) -> List[Dict]:
-    jobs = []
-    q = urllib.parse.quote_plus(role)
-    l = urllib.parse.quote_plus(location)
-    url = f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={q}&locT=C&locId=&locKeyword={l}"
-    page.goto(url)
-    time.sleep(2)
-
-    # Scroll to load results
-    for _ in range(3):
-        page.mouse.wheel(0, 800)
-        time.sleep(0.8)
-
-    cards = page.query_selector_all("li.react-job-listing")
-    if not cards:
-        cards = page.query_selector_all(".jl")  # fallback
-    for i, card in enumerate(cards):
-        if i >= max_results:
-            break
+BASE_URL = "https://www.glassdoor.com"
+
+CARD_SELECTORS = [
+    "li[data-test='jobListing']",
+    "li.react-job-listing",
+    ".jl",
+]
+
+CARD_FIELDS = {
+    "role": ["a[data-test='job-title']", ".jobLink", "a[class*='JobCard_jobTitle']"],
+    "company": [
+        "[class*='EmployerProfile_compactEmployerName']",
+        ".jobEmpolyerName",
+        ".jobInfoItem .empLoc",
+    ],
+    "location": ["[data-test='emp-location']", ".location", ".loc"],
+    "link": ["a[data-test='job-title']", "a.jobLink", "a[href*='job-listing']", "a"],
+}
+
+LOAD_MORE_SELECTORS = [
+    "button[data-test='load-more']",
+    "button:has-text('Show more jobs')",
+    "button[data-test='pagination-next']",
+    "a[data-test='pagination-next']",
+]
+
+def canonicalize_link(link: Optional[str]) -> Optional[str]:
+    """Glassdoor listing links carry the job id in ``jl``; drop everything else"""
+    return canonicalize_url(link, BASE_URL, keep_params=("jl",))
+
+def is_logged_in(page: Page) -> bool:
+    """Check if user is logged in to Glassdoor"""
+    try:
+        logged_in_indicators = [
+            "button[data-test='user-profile-button']",
+            "[data-test='profile-container']",
+            "a[href*='/member/profile']",
+            "div.member-home",
+        ]
+        
+        for selector in logged_in_indicators:
+            if page.query_selector(selector) is not None:
+                return True
+        
+        return '/member/' in page.url and 'login' not in page.url
+    except:
+        return False
+
+def _load_more(page: Page) -> bool:
+    """Click "Show more jobs" / next page. Returns True if more results were requested."""
+    for selector in LOAD_MORE_SELECTORS:
         try:
-            title_el = card.query_selector(".jobLink")
-            company_el = card.query_selector(".jobEmpolyerName") or card.query_selector(".jobInfoItem .empLoc")
-            link_el = card.query_selector("a")
-            link = link_el.get_attribute("href") if link_el else None
-            if link and link.startswith("/"):
-                link = "https://www.glassdoor.com" + link
-            role_text = title_el.inner_text().strip() if title_el else ""
-            company_text = company_el.inner_text().strip() if company_el else ""
-            location_text = ""  # Glassdoor often includes location in other element
-            jobs.append({
-                "role": role_text,
-                "company": company_text,
-                "location": location_text,
-                "link": link
-            })
+            button = page.query_selector(selector)
+            if button and button.is_visible() and button.is_enabled():
+                button.click()
+                time.sleep(2)
+                return True
         except Exception:
             continue
+    return False
+
+def iter_jobs(page: Page, role: str, location: str, max_results: int = 10,
+              max_pages: int = 5) -> Iterator[Dict]:
+    """Yield new Glassdoor jobs batch by batch, deduped against the database"""
+    q = urllib.parse.quote_plus(role)
+    l = urllib.parse.quote_plus(location)
+    url = f"{BASE_URL}/Job/jobs.htm?sc.keyword={q}&locT=C&locId=&locKeyword={l}"
+    print(f"Navigating to: {url}")
+
+    try:
+        page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        time.sleep(2)
+    except Exception as e:
+        print(f"Error loading Glassdoor search: {e}")
+        return
+
+    seen = known_job_links()
+    found = 0
+
+    for page_num in range(1, max_pages + 1):
+        # Scroll to load results
+        for _ in range(3):
+            page.mouse.wheel(0, 800)
+            time.sleep(0.8)
+
+        # "Load more" appends to the same list, so earlier cards are
+        # extracted again and dropped by the shared ``seen`` set.
+        selector, records = extract_cards(page, CARD_SELECTORS, CARD_FIELDS)
+        if not records:
+            print(f"No job cards found on Glassdoor page {page_num}")
+            return
+        print(f"Found {len(records)} cards on page {page_num} using selector: {selector}")
+
+        for job in iter_new_jobs(records, canonicalize_link, seen):
+            found += 1
+            print(f"  [{found}] {job['role']} @ {job['company']}")
+            yield job
+            if found >= max_results:
+                return
+
+        if not _load_more(page):
+            print("No more Glassdoor results")
+            return
+
+def search_jobs(page: Page, role: str, location: str, max_results: int = 10) -> List[Dict]:
+    jobs = list(iter_jobs(page, role, location, max_results))
+    print(f"Successfully parsed {len(jobs)} new Glassdoor jobs")
     return jobs
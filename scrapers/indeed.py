@@ -1,7 +1,51 @@
 from playwright.sync_api import Page
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 import time
+import re
 import urllib.parse
+from .extraction import extract_cards, known_job_links, canonicalize_url, iter_new_jobs
+from page_probe import probe_page
+
+BASE_URL = "https://www.indeed.com"
+
+CARD_SELECTORS = [
+    "div.job_seen_beacon",  # Most common current selector
+    "td.resultContent",  # Table-based layout
+    "div.cardOutline",
+    "a.jcs-JobTitle",
+    "div[data-jk]",  # Jobs with data-jk attribute
+    "li.css-5lfssm",  # Alternative list item
+    "div.slider_container > div",
+]
+
+CARD_FIELDS = {
+    "role": [
+        "h2.jobTitle span",
+        "h2 span[title]",
+        "a.jcs-JobTitle span",
+        "h2.jobTitle",
+        "a[data-jk]",
+        "h2",
+    ],
+    "company": [
+        "span[data-testid='company-name']",
+        "span.companyName",
+        "div.company_location > span:first-child",
+        "[data-testid='company-name']",
+    ],
+    "location": [
+        "div[data-testid='text-location']",
+        "div.companyLocation",
+        "span.companyLocation",
+        ".css-1p0sjhy",
+    ],
+    "link": [
+        "a.jcs-JobTitle",
+        "h2.jobTitle a",
+        "a[data-jk]",
+        "a[id^='job_']",
+    ],
+}
 
 def wait_for_cloudflare_if_needed(page: Page, timeout: int = 60) -> bool:
     """
@@ -9,35 +53,14 @@ def wait_for_cloudflare_if_needed(page: Page, timeout: int = 60) -> bool:
     Returns True if verification was needed and completed, False otherwise.
     """
     try:
-        # Check if job results are already visible (we're past Cloudflare)
-        job_selectors = [
-            "div.job_seen_beacon",
-            "td.resultContent",
-            "div.cardOutline",
-            "a.jcs-JobTitle",
-            "div[data-jk]",
-        ]
-        
-        for selector in job_selectors:
-            if page.query_selector(selector):
-                # Job content is visible, no Cloudflare blocking
-                return False
-        
-        # Check for Cloudflare challenge indicators
-        content = page.content().lower()
+        # One probe answers both "are job results visible?" and "are we blocked?"
+        state = probe_page(page, card_selectors=CARD_SELECTORS[:5], modal_selectors=[], error_selectors=[])
         
-        # Specific Cloudflare BLOCKING indicators (not just the word "cloudflare")
-        cloudflare_blocking = [
-            "just a moment",
-            "checking your browser",
-            "verify you are human",
-            "challenge-platform",
-            "cf-browser-verification"
-        ]
-        
-        is_blocked = any(indicator in content for indicator in cloudflare_blocking)
+        if state.card_count:
+            # Job content is visible, no Cloudflare blocking
+            return False
         
-        if is_blocked:
+        if state.blocked:
             print("\n⚠️  Cloudflare verification detected!")
             print("Please complete the verification in the browser window...")
             print("Waiting for you to solve it (checking every 3 seconds)...")
@@ -48,11 +71,11 @@ def wait_for_cloudflare_if_needed(page: Page, timeout: int = 60) -> bool:
                 time.sleep(3)
                 
                 # Check if job content is now visible (verification passed)
-                for selector in job_selectors:
-                    if page.query_selector(selector):
-                        print("✓ Cloudflare verification passed! Job results visible.")
-                        time.sleep(2)  # Extra wait for page to stabilize
-                        return True
+                state = probe_page(page, card_selectors=CARD_SELECTORS[:5], modal_selectors=[], error_selectors=[])
+                if state.card_count:
+                    print("✓ Cloudflare verification passed! Job results visible.")
+                    time.sleep(2)  # Extra wait for page to stabilize
+                    return True
                 
                 if i % 5 == 0 and i > 0:  # Every 15 seconds
                     print(f"Still waiting... ({i*3}s elapsed)")
@@ -66,9 +89,48 @@ def wait_for_cloudflare_if_needed(page: Page, timeout: int = 60) -> bool:
         print(f"Error checking for Cloudflare: {e}")
         return False
 
+def canonicalize_link(link: Optional[str], base_url: str = BASE_URL) -> Optional[str]:
+    """Indeed links (``/viewjob``, ``/rc/clk``, ``/pagead``) all collapse to ``/viewjob?jk=``"""
+    link = canonicalize_url(link, base_url, keep_params=("jk",))
+    if not link:
+        return None
+    parts = urllib.parse.urlsplit(link)
+    job_key = urllib.parse.parse_qs(parts.query).get("jk")
+    if job_key:
+        return f"{parts.scheme}://{parts.netloc}/viewjob?jk={job_key[0]}"
+    return link
 
-def search_jobs(page: Page, role: str, location: str, max_results: int = 10) -> List[Dict]:
-    jobs = []
+def is_logged_in(page: Page) -> bool:
+    """Check if user is logged in to Indeed"""
+    try:
+        # Check for common logged-in indicators
+        logged_in_indicators = [
+            "a[href*='/account']",
+            "button:has-text('Account')",
+            "span.gnav-AccountMenu-userName",
+            "div.gnav-account-menu"
+        ]
+        
+        for selector in logged_in_indicators:
+            if page.query_selector(selector) is not None:
+                return True
+        
+        # Check URL for account pages
+        current_url = page.url
+        if '/account' in current_url or '/myjobs' in current_url:
+            return True
+            
+        return False
+    except:
+        return False
+
+def _clean_role(role_text: str) -> str:
+    """Remove the "new" badge Indeed prepends/appends to fresh postings"""
+    return re.sub(r"^(new)\b\s*|\s*\b(new)$", "", role_text.strip(), flags=re.IGNORECASE).strip()
+
+def iter_jobs(page: Page, role: str, location: str, max_results: int = 10,
+              max_pages: int = 5) -> Iterator[Dict]:
+    """Yield new Indeed jobs page by page, deduped against the database"""
     q = urllib.parse.quote_plus(role)
     l = urllib.parse.quote_plus(location)
     
@@ -76,139 +138,80 @@ def search_jobs(page: Page, role: str, location: str, max_results: int = 10) ->
     if "india" in location.lower():
         base_url = "https://in.indeed.com"
     else:
-        base_url = "https://www.indeed.com"
-    
-    url = f"{base_url}/jobs?q={q}&l={l}"
-    
-    print(f"Navigating to: {url}")
+        base_url = BASE_URL
     
-    try:
-        page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        time.sleep(4)
-        
-        # Check for Cloudflare ONCE at the beginning
-        wait_for_cloudflare_if_needed(page, timeout=60)
-        
-        # Now proceed with normal scraping
-        # Scroll to load more content
-        for _ in range(3):
-            page.evaluate("window.scrollBy(0, 1000)")
-            time.sleep(1.5)
-        
-        # Try multiple selectors
-        selectors_to_try = [
-            "div.job_seen_beacon",  # Most common current selector
-            "td.resultContent",  # Table-based layout
-            "div.cardOutline",
-            "a.jcs-JobTitle",
-            "div[data-jk]",  # Jobs with data-jk attribute
-            "li.css-5lfssm",  # Alternative list item
-            "div.slider_container > div",
-        ]
+    seen = known_job_links()
+    found = 0
+
+    for page_num in range(max_pages):
+        url = f"{base_url}/jobs?q={q}&l={l}"
+        if page_num:
+            url += f"&start={page_num * 10}"
         
-        cards = []
-        for selector in selectors_to_try:
-            cards = page.query_selector_all(selector)
-            if cards:
-                print(f"Found {len(cards)} job cards using selector: {selector}")
-                break
+        print(f"Navigating to: {url}")
         
-        if not cards:
-            print("No job cards found. Saving debug info...")
-            page.screenshot(path="indeed_debug.png")
-            with open("indeed_debug.html", "w", encoding="utf-8") as f:
-                f.write(page.content())
-            print("Saved indeed_debug.png and indeed_debug.html")
+        try:
+            page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            time.sleep(4)
             
-            # Check if we hit a CAPTCHA/Cloudflare again
-            captcha_text = page.content().lower()
-            if any(term in captcha_text for term in ["captcha", "robot", "cloudflare", "verify you are human"]):
-                print("⚠️  Still blocked by Cloudflare/CAPTCHA!")
-                print("Solutions:")
-                print("  1. The verification may need to be solved again")
-                print("  2. Use a different IP/VPN")
-                print("  3. Try again in a few minutes")
+            # Check for Cloudflare on every results page
+            wait_for_cloudflare_if_needed(page, timeout=60)
             
-            return jobs
+            # Scroll to load more content
+            for _ in range(3):
+                page.evaluate("window.scrollBy(0, 1000)")
+                time.sleep(1.5)
+        except Exception as e:
+            print(f"Error during Indeed search: {e}")
+            return
         
-        for i, card in enumerate(cards):
-            if i >= max_results:
-                break
-            try:
-                # Multiple title selectors
-                title_el = (
-                    card.query_selector("h2.jobTitle span") or
-                    card.query_selector("h2 span[title]") or
-                    card.query_selector("a.jcs-JobTitle span") or
-                    card.query_selector("h2.jobTitle") or
-                    card.query_selector("a[data-jk]") or
-                    card.query_selector("h2")
-                )
-                
-                # Multiple company selectors
-                company_el = (
-                    card.query_selector("span[data-testid='company-name']") or
-                    card.query_selector("span.companyName") or
-                    card.query_selector("div.company_location > span:first-child") or
-                    card.query_selector("[data-testid='company-name']")
-                )
-                
-                # Multiple location selectors
-                loc_el = (
-                    card.query_selector("div[data-testid='text-location']") or
-                    card.query_selector("div.companyLocation") or
-                    card.query_selector("span.companyLocation") or
-                    card.query_selector(".css-1p0sjhy")
-                )
-                
-                # Get link
-                link = None
-                
-                # Method 1: Check data-jk attribute (job key)
-                job_key = card.get_attribute("data-jk")
-                if job_key:
-                    link = f"{base_url}/viewjob?jk={job_key}"
-                else:
-                    # Method 2: Find link element
-                    link_el = (
-                        card.query_selector("a.jcs-JobTitle") or
-                        card.query_selector("h2.jobTitle a") or
-                        card.query_selector("a[data-jk]") or
-                        card.query_selector("a[id^='job_']")
-                    )
-                    
-                    if link_el:
-                        link = link_el.get_attribute("href")
-                        if link and link.startswith("/"):
-                            link = base_url + link
-                        elif link and not link.startswith("http"):
-                            link = base_url + "/" + link
-                
-                # Extract text
-                role_text = title_el.inner_text().strip() if title_el else ""
-                company_text = company_el.inner_text().strip() if company_el else ""
-                location_text = loc_el.inner_text().strip() if loc_el else location
-                
-                # Clean up role text (remove "new" badges, etc.)
-                if role_text:
-                    role_text = role_text.replace("new", "").strip()
-                
-                if role_text and link:
-                    jobs.append({
-                        "role": role_text,
-                        "company": company_text,
-                        "location": location_text,
-                        "link": link
-                    })
-                    print(f"  [{i+1}] {role_text} @ {company_text}")
-                
-            except Exception as e:
-                print(f"Error parsing job card {i}: {e}")
-                continue
+        selector, records = extract_cards(page, CARD_SELECTORS, CARD_FIELDS, id_attribute="data-jk")
+        
+        if not records:
+            if page_num == 0:
+                _save_debug_info(page)
+            else:
+                print(f"No job cards found on Indeed page {page_num + 1}")
+            return
         
-        print(f"Successfully parsed {len(jobs)} Indeed jobs")
+        print(f"Found {len(records)} job cards using selector: {selector}")
         
+        for record in records:
+            if record.get("job_id"):
+                record["link"] = f"/viewjob?jk={record['job_id']}"
+            record["role"] = _clean_role(record.get("role") or "")
+        
+        canonicalize = lambda link: canonicalize_link(link, base_url)
+        for job in iter_new_jobs(records, canonicalize, seen, default_location=location):
+            found += 1
+            print(f"  [{found}] {job['role']} @ {job['company']}")
+            yield job
+            if found >= max_results:
+                return
+
+def _save_debug_info(page: Page):
+    """Dump the results page when no cards were found, and explain likely causes"""
+    print("No job cards found. Saving debug info...")
+    try:
+        page.screenshot(path="indeed_debug.png")
+        content = page.content()
+        with open("indeed_debug.html", "w", encoding="utf-8") as f:
+            f.write(content)
+        print("Saved indeed_debug.png and indeed_debug.html")
     except Exception as e:
-        print(f"Error during Indeed search: {e}")
+        print(f"Could not save debug info: {e}")
+        return
     
-    return jobs
\ No newline at end of file
+    # Check if we hit a CAPTCHA/Cloudflare again
+    captcha_text = content.lower()
+    if any(term in captcha_text for term in ["captcha", "robot", "cloudflare", "verify you are human"]):
+        print("⚠️  Still blocked by Cloudflare/CAPTCHA!")
+        print("Solutions:")
+        print("  1. The verification may need to be solved again")
+        print("  2. Use a different IP/VPN")
+        print("  3. Try again in a few minutes")
+
+def search_jobs(page: Page, role: str, location: str, max_results: int = 10) -> List[Dict]:
+    jobs = list(iter_jobs(page, role, location, max_results))
+    print(f"Successfully parsed {len(jobs)} Indeed jobs")
+    return jobs
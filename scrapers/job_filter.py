@@ -0,0 +1,149 @@
+"""
+job_filter.py
+Scrape-time title/company/location filter.
+
+Rules come from config as comma separated patterns:
+
+    TITLE_INCLUDE=developer,engineer
+    TITLE_EXCLUDE=senior staff,principal,sales,re:\\bmanager\\b
+    COMPANY_BLOCKLIST=Acme Corp,Foo*
+    LOCATION_INCLUDE=india,remote
+    LOCATION_EXCLUDE=usa
+
+A plain pattern is a case-insensitive whole-word phrase, ``*`` is a word
+wildcard and a ``re:`` prefix gives a raw regular expression. All rules for
+a field are compiled once into two alternations (excludes, includes) with
+one named group per rule, so each card costs at most two regex scans per
+field and every hit can be attributed to the rule that caused it.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+FIELDS = ("title", "company", "location")
+
+def _pattern_to_regex(pattern: str) -> str:
+    """Translate one DSL pattern to a regex fragment"""
+    pattern = pattern.strip()
+    if pattern.lower().startswith("re:"):
+        return pattern[3:]
+    words = [re.escape(word).replace(r"\*", r"\w*") for word in pattern.split()]
+    return r"\b" + r"\s+".join(words) + r"\b"
+
+def split_patterns(value: Optional[str]) -> List[str]:
+    """Split a comma separated config value into patterns"""
+    if not value:
+        return []
+    return [p.strip() for p in value.split(",") if p.strip()]
+
+class _FieldMatcher:
+    """Include and exclude rules of one field, each kind compiled into a single regex"""
+
+    def __init__(self, field: str, include: Iterable[str], exclude: Iterable[str]):
+        self.field = field
+        self.labels: Dict[str, str] = {}
+        # Separate scans: in one alternation an include match could consume the text of an
+        # overlapping exclude ("python developer" hiding "developer advocate")
+        self.exclude = self._compile("exclude", exclude)
+        self.include = self._compile("include", include)
+
+    @property
+    def has_rules(self) -> bool:
+        return self.exclude is not None or self.include is not None
+
+    def _compile(self, kind: str, patterns: Iterable[str]) -> Optional["re.Pattern"]:
+        parts = []
+        for pattern in patterns:
+            group = f"r{len(self.labels)}"
+            part = f"(?P<{group}>{_pattern_to_regex(pattern)})"
+            try:
+                re.compile(part)
+            except re.error as e:
+                # A bad pattern from the environment must not stop the scrape
+                print(f"⚠ Ignoring invalid {self.field} {kind} pattern {pattern!r}: {e}")
+                continue
+            self.labels[group] = f"{self.field}_{kind}:{pattern}"
+            parts.append(part)
+        return re.compile("|".join(parts), re.IGNORECASE) if parts else None
+
+    def check(self, text: str) -> Optional[str]:
+        """Return the label of the rule rejecting ``text``, or None if it passes"""
+        text = text or ""
+        # Any exclude match rejects, even when an include matches too
+        if self.exclude is not None:
+            match = self.exclude.search(text)
+            if match:
+                return self.labels[match.lastgroup]
+
+        if self.include is not None and not self.include.search(text):
+            return f"{self.field}_include:<no match>"
+        return None
+
+class JobFilter:
+    """Accepts or rejects scraped job cards and counts hits per rule"""
+
+    def __init__(self, title_include: Iterable[str] = (), title_exclude: Iterable[str] = (),
+                 company_blocklist: Iterable[str] = (), location_include: Iterable[str] = (),
+                 location_exclude: Iterable[str] = ()):
+        self.matchers = [
+            ("role", _FieldMatcher("title", title_include, title_exclude)),
+            ("company", _FieldMatcher("company", (), company_blocklist)),
+            ("location", _FieldMatcher("location", location_include, location_exclude)),
+        ]
+        self.matchers = [(key, m) for key, m in self.matchers if m.has_rules]
+        self.hits = Counter()
+        self.checked = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_config(cls, config) -> "JobFilter":
+        return cls(
+            title_include=split_patterns(getattr(config, "TITLE_INCLUDE", "")),
+            title_exclude=split_patterns(getattr(config, "TITLE_EXCLUDE", "")),
+            company_blocklist=split_patterns(getattr(config, "COMPANY_BLOCKLIST", "")),
+            location_include=split_patterns(getattr(config, "LOCATION_INCLUDE", "")),
+            location_exclude=split_patterns(getattr(config, "LOCATION_EXCLUDE", "")),
+        )
+
+    @property
+    def active(self) -> bool:
+        return bool(self.matchers)
+
+    def rejection_reason(self, job: Dict) -> Optional[str]:
+        """Return the rule label that rejects ``job``, or None if it is accepted"""
+        for key, matcher in self.matchers:
+            label = matcher.check(job.get(key, ""))
+            if label:
+                return label
+        return None
+
+    def accept(self, job: Dict) -> bool:
+        """Check a job and update the counters"""
+        if not self.matchers:
+            return True
+
+        self.checked += 1
+        label = self.rejection_reason(job)
+        if label:
+            self.rejected += 1
+            self.hits[label] += 1
+            return False
+        return True
+
+    def print_summary(self):
+        if not self.active:
+            return
+        print(f"\nScrape Filter: rejected {self.rejected}/{self.checked} jobs")
+        for label, count in self.hits.most_common():
+            print(f"  {label}: {count}")
+
+_job_filter: Optional[JobFilter] = None
+
+def get_job_filter() -> JobFilter:
+    """Process-wide filter built from config on first use"""
+    global _job_filter
+    if _job_filter is None:
+        from config import config
+        _job_filter = JobFilter.from_config(config)
+    return _job_filter
@@ -1,14 +1,84 @@
 from playwright.sync_api import Page
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 import time
-from database import db
+from .extraction import extract_cards, canonicalize_url, known_job_links, iter_new_jobs
+
+BASE_URL = "https://www.linkedin.com"
+
+CARD_SELECTORS = [
+    "li.jobs-search-results__list-item",
+    "div[data-job-id]",
+]
+
+CARD_FIELDS = {
+    "role": [
+        "h3.base-search-card__title",
+        "h3",
+        ".job-card-list__title",
+        ".job-card-container__title",
+    ],
+    "company": [
+        "h4.base-search-card__subtitle",
+        "h4",
+        ".job-card-container__company-name",
+        ".result-card__subtitle-link",
+    ],
+    "location": [
+        "span.job-search-card__location",
+        "span.job-result-card__location",
+        ".job-card-container__metadata-item",
+        ".job-card-list__location",
+    ],
+    "link": [
+        "a.base-card__full-link",
+        "a[href*='/jobs/view/']",
+        "a[data-control-name='job_card_click']",
+        "a",
+    ],
+}
+
+def canonicalize_link(link: Optional[str]) -> Optional[str]:
+    """LinkedIn job links are identified by path; strip tracking parameters"""
+    return canonicalize_url(link, BASE_URL)
+
+def is_logged_in(page: Page) -> bool:
+    """Check if user is logged in to LinkedIn"""
+    try:
+        # Check for common logged-in indicators
+        logged_in_indicators = [
+            "button:has-text('Start a post')",
+            "div.feed-identity-module",
+            "a[href*='/mynetwork/']",
+            "img.global-nav__me-photo",
+            "nav.global-nav"
+        ]
+        
+        for selector in logged_in_indicators:
+            if page.query_selector(selector) is not None:
+                return True
+        
+        # Additional check: Look for profile dropdown
+        try:
+            has_profile_menu = page.evaluate("""
+                () => {
+                    const menus = Array.from(document.querySelectorAll('div[data-control-name*="identity"]'));
+                    const profilePics = Array.from(document.querySelectorAll('img[alt*="Profile"]'));
+                    return menus.length > 0 || profilePics.length > 0;
+                }
+            """)
+            return has_profile_menu
+        except:
+            return False
+            
+    except:
+        return False
 
-def search_jobs(page: Page, role: str, location: str, max_results: int = 10) -> List[Dict]:
-    jobs = []
-    
+def iter_jobs(page: Page, role: str, location: str, max_results: int = 10,
+              max_pages: int = 3) -> Iterator[Dict]:
+    """Yield new LinkedIn jobs page by page, deduped against the database"""
     # Get already applied jobs from database to filter them out
-    applied_jobs = db.get_applied_job_links()
-    print(f"Found {len(applied_jobs)} already applied jobs in database")
+    seen = known_job_links()
+    print(f"Found {len(seen)} already applied jobs in database")
     
     query = role.replace(" ", "%20")
     # Force India as the search location
@@ -19,14 +89,14 @@ def search_jobs(page: Page, role: str, location: str, max_results: int = 10) ->
 
     print(f"Navigating to: {url}")
 
+    found = 0
     try:
         page.goto(url, wait_until="domcontentloaded", timeout=45000)
         time.sleep(4)
 
         current_page = 1
-        max_pages = 3  # Limit pages to avoid infinite scrolling
         
-        while len(jobs) < max_results and current_page <= max_pages:
+        while found < max_results and current_page <= max_pages:
             print(f"\n--- Searching Page {current_page} ---")
             
             # Scroll to load lazy elements
@@ -34,121 +104,41 @@ def search_jobs(page: Page, role: str, location: str, max_results: int = 10) ->
                 page.evaluate("window.scrollBy(0, 1200)")
                 time.sleep(1)
 
-            # NEW LinkedIn 2025 job card selectors
-            job_cards = page.query_selector_all("li.jobs-search-results__list-item")
-
-            if not job_cards:
-                job_cards = page.query_selector_all("div[data-job-id]")
+            # NEW LinkedIn 2025 job card selectors, read in one round trip
+            selector, records = extract_cards(page, CARD_SELECTORS, CARD_FIELDS)
 
-            if not job_cards:
+            if not records:
                 print("⚠ No job cards detected on this page.")
                 break
 
-            print(f"Found {len(job_cards)} cards on page {current_page}")
+            print(f"Found {len(records)} cards on page {current_page}")
 
             jobs_found_on_page = 0
-            for i, card in enumerate(job_cards):
-                try:
-                    # Stop if we have enough new jobs
-                    if len(jobs) >= max_results:
-                        break
-                        
-                    # Best-effort: try specific elements first, then fallback to splitting card text
-                    link_el = (
-                        card.query_selector("a.base-card__full-link") or
-                        card.query_selector("a[href*='/jobs/view/']") or
-                        card.query_selector("a[data-control-name='job_card_click']") or
-                        card.query_selector("a")
-                    )
-
-                    link = None
-                    if link_el:
-                        link = link_el.get_attribute("href")
-                        if link and link.startswith("/"):
-                            link = "https://www.linkedin.com" + link
-                        if link and "?" in link:
-                            link = link.split("?")[0]
-
-                    # Skip if no link found
-                    if not link:
-                        continue
-                        
-                    # Skip if already applied to this job
-                    if link in applied_jobs:
-                        print(f"⏭️  Skipping already applied job: {link}")
-                        continue
-
-                    # Try explicit title/company/location selectors
-                    title_el = (
-                        card.query_selector("h3.base-search-card__title") or
-                        card.query_selector("h3") or
-                        card.query_selector(".job-card-list__title") or
-                        card.query_selector(".job-card-container__title")
-                    )
-
-                    company_el = (
-                        card.query_selector("h4.base-search-card__subtitle") or
-                        card.query_selector("h4") or
-                        card.query_selector(".job-card-container__company-name") or
-                        card.query_selector(".result-card__subtitle-link")
-                    )
-
-                    loc_el = (
-                        card.query_selector("span.job-search-card__location") or
-                        card.query_selector("span.job-result-card__location") or
-                        card.query_selector(".job-card-container__metadata-item") or
-                        card.query_selector(".job-card-list__location")
-                    )
-
-                    role_text = title_el.inner_text().strip() if title_el and title_el.inner_text() else ""
-                    company_text = company_el.inner_text().strip() if company_el and company_el.inner_text() else ""
-                    location_text = loc_el.inner_text().strip() if loc_el and loc_el.inner_text() else location
-
-                    # Fallback: use full card text lines if specific selectors didn't produce values
-                    if (not role_text or not company_text) and card.inner_text():
-                        parts = [s.strip() for s in card.inner_text().splitlines() if s.strip()]
-                        # Heuristics: first non-empty line likely role, second likely company
-                        if not role_text and len(parts) >= 1:
-                            role_text = parts[0]
-                        if not company_text and len(parts) >= 2:
-                            company_text = parts[1]
-                        if (not location_text or location_text == location) and len(parts) >= 3:
-                            # sometimes location is third line
-                            location_text = parts[2]
-
-                    if role_text and link:
-                        jobs.append({
-                            "role": role_text,
-                            "company": company_text,
-                            "location": location_text,
-                            "link": link
-                        })
-                        jobs_found_on_page += 1
-                        print(f"  [{len(jobs)}] {role_text} @ {company_text}")
-
-                except Exception as e:
-                    print(f"Error parsing job card {i}: {e}")
-                    continue
+            for job in iter_new_jobs(records, canonicalize_link, seen, default_location=location):
+                found += 1
+                jobs_found_on_page += 1
+                print(f"  [{found}] {job['role']} @ {job['company']}")
+                yield job
+                # Stop if we have enough new jobs
+                if found >= max_results:
+                    return
 
             print(f"Found {jobs_found_on_page} new jobs on page {current_page}")
             
-            # Check if we need more jobs and there's a next page
-            if len(jobs) < max_results:
-                if go_to_next_page(page):
-                    current_page += 1
-                    time.sleep(3)  # Wait for next page to load
-                else:
-                    print("No more pages available or cannot navigate to next page")
-                    break
+            # There's still room for more jobs; try the next page
+            if go_to_next_page(page):
+                current_page += 1
+                time.sleep(3)  # Wait for next page to load
             else:
+                print("No more pages available or cannot navigate to next page")
                 break
 
-        print(f"\n✅ Successfully parsed {len(jobs)} new LinkedIn jobs across {current_page} pages")
-        print(f"⏭️  Filtered out {len(applied_jobs)} already applied jobs")
-
     except Exception as e:
         print(f"Error during LinkedIn search: {e}")
 
+def search_jobs(page: Page, role: str, location: str, max_results: int = 10) -> List[Dict]:
+    jobs = list(iter_jobs(page, role, location, max_results))
+    print(f"\n✅ Successfully parsed {len(jobs)} new LinkedIn jobs")
     return jobs
 
 def go_to_next_page(page: Page) -> bool:
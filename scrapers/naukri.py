@@ -4,17 +4,59 @@ Search Naukri job listings (India).
 """
 
 from playwright.sync_api import Page
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 import time
-import urllib.parse
+import re
+from .extraction import extract_cards, canonicalize_url, known_job_links, iter_new_jobs
 
-def search_jobs(page: Page, role: str, location: str, max_results: int = 10) -> List[Dict]:
-    jobs = []
-    q = urllib.parse.quote_plus(role)
-    l = urllib.parse.quote_plus(location)
-    url = f"https://www.naukri.com/{q}-jobs-in-{l}"
-    page.goto(url)
-    time.sleep(2)
+BASE_URL = "https://www.naukri.com"
+
+CARD_SELECTORS = [
+    "div.srp-jobtuple-wrapper",
+    "article.jobTuple",
+    "div.cust-job-tuple",
+    ".jobTuple",
+]
+
+CARD_FIELDS = {
+    "role": ["a.title", ".title"],
+    "company": ["a.comp-name", ".companyInfo .subTitle", ".comp-name"],
+    "location": ["span.locWdth", ".location .ellipsis", ".loc-wrap .ellipsis", ".location"],
+    "link": ["a.title", "a[href*='job-listings']"],
+}
+
+def canonicalize_link(link: Optional[str]) -> Optional[str]:
+    """Naukri job ids live in the path; every query parameter is tracking"""
+    return canonicalize_url(link, BASE_URL)
+
+def is_logged_in(page: Page) -> bool:
+    """Check if user is logged in to Naukri"""
+    try:
+        logged_in_indicators = [
+            "div.nI-gNb-drawer__icon",
+            "a[href*='/mnjuser/profile']",
+            "img.nI-gNb-icon-img",
+            "div.nI-gNb-info",
+        ]
+        
+        for selector in logged_in_indicators:
+            if page.query_selector(selector) is not None:
+                return True
+        
+        return '/mnjuser/' in page.url and '/login' not in page.url
+    except:
+        return False
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+def _page_url(role: str, location: str, page_num: int) -> str:
+    url = f"{BASE_URL}/{_slug(role)}-jobs-in-{_slug(location)}"
+    if page_num > 1:
+        url += f"-{page_num}"
+    return url
+
+def _close_popups(page: Page):
     # Naukri opens many popups; try to close common ones
     try:
         close_btn = page.query_selector("button[aria-label='close']") or page.query_selector(".close")
@@ -23,24 +65,38 @@ def search_jobs(page: Page, role: str, location: str, max_results: int = 10) ->
     except Exception:
         pass
 
-    cards = page.query_selector_all(".jobTuple")
-    for i, card in enumerate(cards):
-        if i >= max_results:
-            break
+def iter_jobs(page: Page, role: str, location: str, max_results: int = 10,
+              max_pages: int = 5) -> Iterator[Dict]:
+    """Yield new Naukri jobs page by page, deduped against the database"""
+    seen = known_job_links()
+    found = 0
+
+    for page_num in range(1, max_pages + 1):
+        url = _page_url(role, location, page_num)
+        print(f"Navigating to: {url}")
         try:
-            title_el = card.query_selector("a.title")
-            company_el = card.query_selector(".companyInfo .subTitle")
-            link = title_el.get_attribute("href") if title_el else None
-            loc_el = card.query_selector(".jobTuple .location .ellipsis")
-            role_text = title_el.inner_text().strip() if title_el else ""
-            company_text = company_el.inner_text().strip() if company_el else ""
-            location_text = loc_el.inner_text().strip() if loc_el else ""
-            jobs.append({
-                "role": role_text,
-                "company": company_text,
-                "location": location_text,
-                "link": link
-            })
-        except Exception:
-            continue
+            page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            time.sleep(2)
+        except Exception as e:
+            print(f"Error loading Naukri page {page_num}: {e}")
+            return
+
+        _close_popups(page)
+
+        selector, records = extract_cards(page, CARD_SELECTORS, CARD_FIELDS)
+        if not records:
+            print(f"No job cards found on Naukri page {page_num}")
+            return
+        print(f"Found {len(records)} cards on page {page_num} using selector: {selector}")
+
+        for job in iter_new_jobs(records, canonicalize_link, seen, default_location=location):
+            found += 1
+            print(f"  [{found}] {job['role']} @ {job['company']}")
+            yield job
+            if found >= max_results:
+                return
+
+def search_jobs(page: Page, role: str, location: str, max_results: int = 10) -> List[Dict]:
+    jobs = list(iter_jobs(page, role, location, max_results))
+    print(f"Successfully parsed {len(jobs)} new Naukri jobs")
     return jobs
@@ -0,0 +1,169 @@
+"""
+sites.py
+Site plugin registry.
+
+Every job site is described by a ``SitePlugin`` whose components (scraper,
+applier class, login probe, URL canonicalizer) are given as
+``"module:attribute"`` references, the same form as Python entry points.
+Nothing is imported until a plugin's component is first used, so only the
+sites enabled for a run pay the import cost.
+
+Third-party sites can be added without editing this file by exposing a
+``SitePlugin`` under the ``job_bot.sites`` entry point group.
+"""
+
+import importlib
+from importlib import metadata
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+ENTRY_POINT_GROUP = "job_bot.sites"
+
+Reference = Union[str, Callable, type, None]
+
+def resolve_reference(ref: Reference):
+    """Import and return the object named by a ``"module:attr"`` reference"""
+    if ref is None or not isinstance(ref, str):
+        return ref
+    module_name, _, attr_path = ref.partition(":")
+    obj = importlib.import_module(module_name)
+    for attr in filter(None, attr_path.split(".")):
+        obj = getattr(obj, attr)
+    return obj
+
+class SitePlugin:
+    """Everything the pipeline needs to search and apply on one site"""
+
+    def __init__(self, name: str, login_url: str, scraper: Reference,
+                 login_check: Reference, canonicalize: Reference = None,
+                 applier: Reference = None, apply_delay: Tuple[float, float] = (5.0, 10.0),
+                 max_per_run: Optional[int] = None):
+        """
+        Args:
+            name: Display name (e.g. "LinkedIn")
+            login_url: Page used to probe the login state
+            scraper: ``iter_jobs(page, role, location, max_results)``, yielding new jobs page by page
+            login_check: ``is_logged_in(page) -> bool``
+            canonicalize: ``canonicalize_link(link) -> str`` (optional)
+            applier: Applier class taking ``config``; None if auto-apply is not implemented
+            apply_delay: (min, max) seconds to wait between applications
+            max_per_run: Hard cap on jobs processed per run, on top of ``--max``
+        """
+        self.name = name
+        self.login_url = login_url
+        self.apply_delay = apply_delay
+        self.max_per_run = max_per_run
+        self._refs = {
+            "scraper": scraper,
+            "login_check": login_check,
+            "canonicalize": canonicalize,
+            "applier": applier,
+        }
+        self._loaded = {}
+
+    def _get(self, component: str):
+        if component not in self._loaded:
+            self._loaded[component] = resolve_reference(self._refs[component])
+        return self._loaded[component]
+
+    @property
+    def scraper(self) -> Callable:
+        return self._get("scraper")
+
+    @property
+    def login_check(self) -> Callable:
+        return self._get("login_check")
+
+    @property
+    def applier_class(self) -> Optional[type]:
+        return self._get("applier")
+
+    def canonicalize(self, link: Optional[str]) -> Optional[str]:
+        """Canonicalize a job link, or return it unchanged if the site has no canonicalizer"""
+        canonicalize_fn = self._get("canonicalize")
+        return canonicalize_fn(link) if canonicalize_fn and link else link
+
+    def __repr__(self):
+        return f"SitePlugin({self.name!r})"
+
+BUILTIN_SITES: Dict[str, SitePlugin] = {
+    "linkedin": SitePlugin(
+        "LinkedIn",
+        login_url="https://www.linkedin.com/feed/",
+        scraper="scrapers.linkedin:iter_jobs",
+        login_check="scrapers.linkedin:is_logged_in",
+        canonicalize="scrapers.linkedin:canonicalize_link",
+        applier="apply.linkedin_apply:LinkedInApply",
+    ),
+    "indeed": SitePlugin(
+        "Indeed",
+        login_url="https://www.indeed.com/",
+        scraper="scrapers.indeed:iter_jobs",
+        login_check="scrapers.indeed:is_logged_in",
+        canonicalize="scrapers.indeed:canonicalize_link",
+        applier=None,  # Not implemented in refactored version yet
+    ),
+    "naukri": SitePlugin(
+        "Naukri",
+        login_url="https://www.naukri.com/mnjuser/homepage",
+        scraper="scrapers.naukri:iter_jobs",
+        login_check="scrapers.naukri:is_logged_in",
+        canonicalize="scrapers.naukri:canonicalize_link",
+        applier=None,  # Naukri apply flow not implemented yet
+    ),
+    "glassdoor": SitePlugin(
+        "Glassdoor",
+        login_url="https://www.glassdoor.com/member/home/index.htm",
+        scraper="scrapers.glassdoor:iter_jobs",
+        login_check="scrapers.glassdoor:is_logged_in",
+        canonicalize="scrapers.glassdoor:canonicalize_link",
+        applier=None,  # Glassdoor apply flow not implemented yet
+        apply_delay=(8.0, 15.0),  # Glassdoor rate-limits aggressively
+    ),
+}
+
+def _entry_points() -> Dict[str, "metadata.EntryPoint"]:
+    """Installed plugin entry points, keyed by lowercase site key (not loaded)"""
+    try:
+        return {ep.name.lower(): ep for ep in metadata.entry_points(group=ENTRY_POINT_GROUP)}
+    except Exception as e:
+        print(f"⚠ Could not read site plugin entry points: {e}")
+        return {}
+
+def available_sites() -> List[str]:
+    """Keys of all known sites, built-in first"""
+    extra = [key for key in _entry_points() if key not in BUILTIN_SITES]
+    return list(BUILTIN_SITES) + sorted(extra)
+
+def get_site(key: str) -> SitePlugin:
+    """Return the plugin registered under ``key``. Raises KeyError if unknown."""
+    key = key.strip().lower()
+    if key in BUILTIN_SITES:
+        return BUILTIN_SITES[key]
+
+    entry_point = _entry_points().get(key)
+    if entry_point is None:
+        raise KeyError(key)
+
+    plugin = entry_point.load()
+    if callable(plugin) and not isinstance(plugin, SitePlugin):
+        plugin = plugin()
+    if not isinstance(plugin, SitePlugin):
+        raise TypeError(f"Entry point {entry_point.name!r} did not provide a SitePlugin")
+    return plugin
+
+def parse_site_list(value: Optional[str]) -> List[str]:
+    """Split a ``linkedin,indeed`` style list into normalized site keys"""
+    if not value:
+        return []
+    return [key.strip().lower() for key in value.split(",") if key.strip()]
+
+def get_enabled_sites(keys: List[str]) -> List[SitePlugin]:
+    """Resolve site keys to plugins, skipping (and reporting) unknown ones"""
+    plugins = []
+    for key in keys:
+        try:
+            plugins.append(get_site(key))
+        except (KeyError, TypeError, ImportError) as e:
+            print(f"⚠ Unknown or broken site '{key}': {e}")
+            print(f"  Available sites: {', '.join(available_sites())}")
+    return plugins
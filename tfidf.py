@@ -0,0 +1,137 @@
+"""
+tfidf.py
+Small sparse TF-IDF vectorizer on top of NumPy.
+
+Documents are stored as a CSR matrix (``indptr``/``indices``/``data``) with
+l2-normalized rows, so cosine similarity against a dense query vector is a
+single gather + ``np.bincount`` over the non-zeros. Building the matrix is
+vectorized too: term ids of the whole corpus are counted with one
+``np.unique`` call. Only tokenization runs per document in Python.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it of on or our the to we with
+you your will this that who job jobs role work team
+""".split())
+
+@lru_cache(maxsize=65536)
+def _normalize_word(token: str) -> str:
+    token = token.rstrip(".").replace(".", "")
+    if token.endswith("js") and len(token) > 4:
+        token = token[:-2]
+    return "" if token in STOPWORDS else token
+
+def word_tokens(text: str) -> List[str]:
+    """Lowercase word tokens; ``node.js``/``nodejs``/``node`` collapse to ``node``"""
+    return [t for t in map(_normalize_word, _WORD_RE.findall((text or "").lower())) if t]
+
+def char_ngrams(text: str, n_range: Tuple[int, int] = (3, 5)) -> List[str]:
+    """Character n-grams of the whitespace-normalized text, padded at word edges"""
+    text = " " + " ".join(re.findall(r"[a-z0-9]+", (text or "").lower())) + " "
+    grams = []
+    for n in range(n_range[0], n_range[1] + 1):
+        grams.extend(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+class CsrMatrix:
+    """Minimal CSR container (rows are documents, columns are vocabulary ids)"""
+
+    __slots__ = ("indptr", "indices", "data", "shape")
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, shape: Tuple[int, int]):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    def row_ids(self) -> np.ndarray:
+        """Row index of every stored value"""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def dot(self, vector: np.ndarray) -> np.ndarray:
+        """Matrix-vector product, i.e. one similarity score per row"""
+        if self.data.size == 0:
+            return np.zeros(self.shape[0])
+        return np.bincount(self.row_ids(), weights=self.data * vector[self.indices],
+                           minlength=self.shape[0])
+
+class SparseTfidf:
+    """TF-IDF with sublinear term frequency and l2-normalized rows"""
+
+    def __init__(self, analyzer: Callable[[str], List[str]] = word_tokens):
+        self.analyzer = analyzer
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+
+    def _term_ids(self, texts: Iterable[str], grow: bool) -> Tuple[np.ndarray, np.ndarray, int]:
+        vocab = self.vocabulary
+        analyzer = self.analyzer
+        terms: List[str] = []
+        lengths: List[int] = []
+        for text in texts:
+            tokens = analyzer(text)
+            if not grow:
+                tokens = [t for t in tokens if t in vocab]
+            terms.extend(tokens)
+            lengths.append(len(tokens))
+        if grow:
+            # Only unique new terms are visited in Python; the id lookup is map()
+            for term in dict.fromkeys(terms):
+                if term not in vocab:
+                    vocab[term] = len(vocab)
+        ids = np.fromiter(map(vocab.__getitem__, terms), dtype=np.int64, count=len(terms))
+        return ids, np.asarray(lengths, dtype=np.int64), len(lengths)
+
+    def _build(self, ids: np.ndarray, lengths: np.ndarray, n_docs: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Count (doc, term) pairs; returns rows, cols and raw counts"""
+        n_terms = max(len(self.vocabulary), 1)
+        rows = np.repeat(np.arange(n_docs, dtype=np.int64), lengths)
+        keys, counts = np.unique(rows * n_terms + ids, return_counts=True)
+        return keys // n_terms, keys % n_terms, counts
+
+    def _to_csr(self, rows: np.ndarray, cols: np.ndarray, counts: np.ndarray, n_docs: int) -> CsrMatrix:
+        data = (1.0 + np.log(counts)) * self.idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=n_docs))
+        norms[norms == 0] = 1.0
+        data = data / norms[rows]
+        indptr = np.zeros(n_docs + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_docs), out=indptr[1:])
+        return CsrMatrix(indptr, cols, data, (n_docs, len(self.vocabulary)))
+
+    def fit_transform(self, texts: Iterable[str]) -> CsrMatrix:
+        """Learn vocabulary and idf from ``texts`` and return their matrix"""
+        self.vocabulary = {}
+        ids, lengths, n_docs = self._term_ids(texts, grow=True)
+        rows, cols, counts = self._build(ids, lengths, n_docs)
+        df = np.bincount(cols, minlength=len(self.vocabulary))
+        self.idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+        return self._to_csr(rows, cols, counts, n_docs)
+
+    def transform(self, texts: Iterable[str]) -> CsrMatrix:
+        """Vectorize ``texts`` with the fitted vocabulary (unknown terms are ignored)"""
+        ids, lengths, n_docs = self._term_ids(texts, grow=False)
+        rows, cols, counts = self._build(ids, lengths, n_docs)
+        return self._to_csr(rows, cols, counts, n_docs)
+
+    def query_vector(self, weighted_texts: Iterable[Tuple[str, float]]) -> np.ndarray:
+        """Dense, l2-normalized query built from (text, weight) parts"""
+        vector = np.zeros(len(self.vocabulary))
+        for text, weight in weighted_texts:
+            counts: Dict[int, int] = {}
+            for term in self.analyzer(text):
+                term_id = self.vocabulary.get(term)
+                if term_id is not None:
+                    counts[term_id] = counts.get(term_id, 0) + 1
+            for term_id, count in counts.items():
+                vector[term_id] += weight * (1.0 + math.log(count)) * self.idf[term_id]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector